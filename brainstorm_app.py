@@ -1,23 +1,52 @@
 #!/usr/bin/env python3
 """
 AI Brainstorm Panel - LLM ↔ LLM Auto-Conversation
-G2G-style peer-to-peer communication between two AI chatbots
+G2G-style peer-to-peer communication between two or more AI chatbots
 Supports: ChatGPT, DeepSeek, Gemini, Claude
 """
 
 import sys
 import os
+import re
+import csv
 import json
+import html
+import time
+import queue
+import argparse
+import tempfile
+import random
+import sqlite3
+import hashlib
+import threading
+from collections import deque, OrderedDict
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFrame, QSplitter, QTextEdit, QComboBox,
-    QFileDialog, QMessageBox
+    QFileDialog, QMessageBox, QStackedWidget, QTabWidget, QInputDialog,
+    QDialog, QLineEdit, QTextBrowser
 )
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
-from PyQt6.QtCore import Qt, QUrl, QTimer, pyqtSignal, QObject
-from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtWebChannel import QWebChannel
+from PyQt6.QtCore import Qt, QUrl, QTimer, pyqtSignal, pyqtSlot, QObject, QFile, QIODevice, QMarginsF
+from PyQt6.QtGui import QColor, QPalette, QPageLayout, QPageSize, QDesktopServices
+
+STARTUP_T0 = time.perf_counter()  # Reference point for --profile-startup (after the Qt imports)
+
+# QtWebEngine takes a noticeable part of startup to import, so the window comes up
+# first and import_webengine() fills these in afterwards
+QWebEngineView = QWebEngineProfile = QWebEnginePage = QWebEngineScript = None
+
+
+def import_webengine():
+    """Import QtWebEngine on first use. Before QApplication exists, or with
+    AA_ShareOpenGLContexts set on it, as Qt requires."""
+    global QWebEngineView, QWebEngineProfile, QWebEnginePage, QWebEngineScript
+    if QWebEngineView is None:
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+        from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage, QWebEngineScript
 
 
 # Get the directory where this script is located
@@ -27,460 +56,3139 @@ EXAMPLES_FILE = os.path.join(SCRIPT_DIR, "examples.json")
 
 # Persistent storage directory
 STORAGE_DIR = os.path.expanduser("~/.brainstorm_panel")
+SETTINGS_FILE = os.path.join(STORAGE_DIR, "settings.json")
+STABILITY_FILE = os.path.join(STORAGE_DIR, "stability.json")
+JOURNAL_DIR = os.path.join(STORAGE_DIR, "journal")
+CHECKPOINT_DIR = os.path.join(STORAGE_DIR, "checkpoints")
+SEARCH_DB = os.path.join(STORAGE_DIR, "search.db")
+METRICS_DIR = os.path.join(STORAGE_DIR, "metrics")
+ADAPTERS_DIR = os.path.join(STORAGE_DIR, "adapters")
 
-# Available chatbot configurations
-AVAILABLE_CHATBOTS = {
-    "ChatGPT": {
-        "name": "ChatGPT",
-        "url": "https://chat.openai.com",
-        "color": "#10a37f",
-        "icon": "◉",
-        "input_selector": "#prompt-textarea",
-        "send_selector": "button[data-testid='send-button']",
-        "response_selector": "[data-message-author-role='assistant']",
+# Tunable settings (override any key in ~/.brainstorm_panel/settings.json)
+DEFAULT_SETTINGS = {
+    # "observer": the page pushes a 'settled' signal (polling stays as fallback)
+    # "poll": text-stability polling only
+    "detection_mode": "observer",
+    "observer_quiet_ms": 800,  # No DOM changes for this long = response settled
+    # Adaptive polling: fast while text grows, backs off while the page is idle
+    "poll_start_delay_ms": 1000,
+    "poll_min_ms": 400,
+    "poll_max_ms": 3000,
+    "poll_backoff": 1.5,
+    # Stability window learned per model from its gaps between text growth
+    "stability_default_ms": 6000,  # Used until a model has enough samples
+    "stability_min_ms": 1500,
+    "stability_max_ms": 15000,
+    "stability_margin": 1.5,  # Window = p95 gap * margin
+    "stability_min_samples": 10,
+    "stability_history": 200,  # Gaps kept per model
+    "journal_flush_ms": 250,  # Turn journal writes are batched over this window
+    "export_formats": ["html"],  # Any of "html", "md", "jsonl"
+    "export_pdf": True,  # Also render the HTML export to PDF
+    "metrics_port": 9464,  # Local Prometheus /metrics endpoint, 0 to disable
+    "metrics_window": 500,  # Recent turns used for latency percentiles
+    "metrics_keep_days": 7,  # Daily turn CSVs kept under STORAGE_DIR/metrics
+    "chatbots": [],  # Extra/overridden adapters, see adapter_from_spec
+    "webengine_start_delay_ms": 50,  # After the window shows, before QtWebEngine is imported
+    "panel_load_stagger_ms": 1500,  # Next panel starts when the previous one loaded, or after this
+    # Loaded pages no panel shows, kept so switching chatbots doesn't reload the site
+    "max_active_sessions": 2,  # Tab sessions polling and sending at once, the visible one first; 0 = all
+    "page_pool_size": 2,
+    "page_pool_memory_mb": 1500,  # Renderer memory cap for the pooled pages
+    "page_pool_preload": True,  # Warm the chatbots no panel shows once the panels are ready
+    # Panels not taking part in the current turn are frozen, long-idle ones discarded
+    "lifecycle_check_ms": 2000,
+    "lifecycle_freeze_after_s": 10,
+    "lifecycle_discard_after_s": 600,
+    "lifecycle_memory_mb": 4000,  # Renderer memory budget for panels + pool, 0 = no budget
+    # Optional local shortening of forwarded responses over budget_chars (see ContextCompactor)
+    "compaction": {
+        "enabled": False,
+        "budget_chars": 6000,
+        "min_repeat_words": 8,  # Shorter sentences are never treated as repetition
+        "history_sentences": 2000,
     },
-    "DeepSeek": {
-        "name": "DeepSeek", 
-        "url": "https://chat.deepseek.com",
-        "color": "#3b82f6",
-        "icon": "◆",
-        "input_selector": "textarea, #chat-input, [contenteditable='true']",
-        "send_selector": "button[type='submit'], button:has(svg), div[role='button']",
-        "response_selector": ".ds-markdown, .message-content, [class*='answer'], [class*='response']",
+    # Per-session limits, 0 = unlimited; wind_down asks every party for a closing summary first
+    "budget": {
+        "max_rounds": 0,  # Each party answers once per round
+        "max_seconds": 0,
+        "max_chars": 0,  # Characters sent plus received
+        "wind_down": True,
     },
-    "Gemini": {
-        "name": "Gemini",
-        "url": "https://gemini.google.com/app",
-        "color": "#8e44ad",
-        "icon": "✦",
-        "input_selector": "rich-textarea .ql-editor, .text-input-field textarea, [contenteditable='true']",
-        "send_selector": "button[aria-label='Send message'], button.send-button, button[mat-icon-button]",
-        "response_selector": ".model-response-text, .response-content, message-content[class*='model']",
+    # Stop (or steer, action "branch") a conversation that repeats itself or settles into agreement
+    "convergence": {
+        "enabled": True,
+        "window": 6,  # Completed responses compared against
+        "shingle_words": 4,
+        "num_hashes": 64,
+        "loop_threshold": 0.6,  # Similarity to the same party's earlier response = going in circles
+        "agree_threshold": 0.4,  # Similarity to the previous party's response...
+        "patience": 3,  # ...this many turns in a row = converged
+        "action": "stop",  # "stop" or "branch"
+        "max_branches": 1,  # Branch this often, then stop
     },
-    "Claude": {
-        "name": "Claude",
-        "url": "https://claude.ai/new",
-        "color": "#d97706",
-        "icon": "◈",
-        "input_selector": "[contenteditable='true'].ProseMirror, div[contenteditable='true'], fieldset textarea",
-        "send_selector": "button[aria-label='Send Message'], button[type='submit']:not(:disabled)",
-        "response_selector": "[data-is-streaming], .font-claude-message, [class*='claude-message']",
+    "extract_batch_chars": 100000,  # Conversation text read from a page per script call when exporting
+    "inject_chunk_chars": 2000,  # Text inserted into the site's input per task
+    "stage_chunk_chars": 32768,  # Larger messages reach the page in several script calls
+    "http_cache": "disk",  # "disk", "memory" or "none"
+    "http_cache_mb": 0,  # Maximum HTTP cache size, 0 lets Qt decide
+    # Optional request blocking (see RequestFilter); "sites" adds rules per page host
+    "request_filter": {
+        "enabled": False,
+        "block_types": ["ping", "media", "font"],
+        "block_hosts": [
+            "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+            "segment.io", "segment.com", "sentry.io", "datadoghq.com", "browser-intake-datadoghq.com",
+            "intercom.io", "intercomcdn.com", "hotjar.com", "mixpanel.com", "amplitude.com",
+            "featuregates.org", "statsigapi.net", "clarity.ms",
+        ],
+        "block_url_patterns": ["/ces/v1/", "/v1/rgstr"],
+        "allow_hosts": [],
+        "sites": {},
     },
 }
 
+
+def load_settings():
+    """Load settings from the storage dir on top of the defaults"""
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        if os.path.exists(SETTINGS_FILE):
+            with open(SETTINGS_FILE, 'r') as f:
+                for key, value in json.load(f).items():
+                    # Nested groups (e.g. request_filter) can be overridden key by key
+                    if isinstance(settings.get(key), dict) and isinstance(value, dict):
+                        value = dict(settings[key], **value)
+                    settings[key] = value
+    except Exception as e:
+        print(f"Error loading settings: {e}")
+    return settings
+
+
+SETTINGS = load_settings()
+
+class ChatbotAdapter:
+    """Everything site-specific about one chatbot: selectors, done signal and send strategy
+    
+    Subclass and decorate with @register_adapter. `done_js` is the body of a
+    JavaScript function(node) run on the last response: return true once the
+    site marks it finished, false while it is still streaming, null when the
+    site gives no signal (the bridge then falls back to text stability).
+    """
+    name = ""
+    url = ""
+    color = "#888888"
+    icon = "●"
+    input_selector = ""
+    send_selector = ""
+    response_selector = ""
+    send_strategy = "click"  # "click" the send button (Enter as fallback) or press "enter"
+    send_delay_ms = 500  # Let the site's editor state catch up with the inserted text
+    max_prompt_chars = 30000  # Longer messages are sent in acknowledged parts
+    done_js = ""
+    done_attributes = ()  # Attributes done_js reads; the observer watches them for changes
+    
+    @classmethod
+    def config(cls):
+        """The plain config dict the panels, bridge and exporters work with"""
+        return {
+            "name": cls.name,
+            "url": cls.url,
+            "color": cls.color,
+            "icon": cls.icon,
+            "input_selector": cls.input_selector,
+            "send_selector": cls.send_selector,
+            "response_selector": cls.response_selector,
+            "send_strategy": cls.send_strategy,
+            "send_delay_ms": cls.send_delay_ms,
+            "max_prompt_chars": cls.max_prompt_chars,
+            "done_js": cls.done_js,
+            "done_attributes": list(cls.done_attributes),
+        }
+
+
+# Adapter registry: name -> adapter class, plus the config view the rest of the app uses
+CHATBOT_ADAPTERS = {}
+AVAILABLE_CHATBOTS = {}
+
+
+def register_adapter(cls):
+    """Class decorator adding (or replacing) a chatbot adapter"""
+    CHATBOT_ADAPTERS[cls.name] = cls
+    AVAILABLE_CHATBOTS[cls.name] = cls.config()
+    return cls
+
+
+@register_adapter
+class ChatGPTAdapter(ChatbotAdapter):
+    name = "ChatGPT"
+    url = "https://chat.openai.com"
+    color = "#10a37f"
+    icon = "◉"
+    input_selector = "#prompt-textarea"
+    send_selector = "button[data-testid='send-button']"
+    response_selector = "[data-message-author-role='assistant']"
+    # The stop button shows while streaming; the copy button is added to a turn once it
+    # has finished. Neither (e.g. a renamed selector) gives no signal rather than "streaming"
+    done_js = """
+        if (document.querySelector('button[data-testid="stop-button"]')) return false;
+        const turn = node.closest('article, [data-testid^="conversation-turn"]');
+        if (turn && turn.querySelector('button[data-testid="copy-turn-action-button"]')) return true;
+        return null;
+    """
+
+
+@register_adapter
+class DeepSeekAdapter(ChatbotAdapter):
+    name = "DeepSeek"
+    url = "https://chat.deepseek.com"
+    color = "#3b82f6"
+    icon = "◆"
+    input_selector = "textarea, #chat-input, [contenteditable='true']"
+    send_selector = "button[type='submit'], button:has(svg), div[role='button']"
+    response_selector = ".ds-markdown, .message-content, [class*='answer'], [class*='response']"
+    send_strategy = "enter"  # Its send control is an unlabelled div; Enter is more reliable
+
+
+@register_adapter
+class GeminiAdapter(ChatbotAdapter):
+    name = "Gemini"
+    url = "https://gemini.google.com/app"
+    color = "#8e44ad"
+    icon = "✦"
+    input_selector = "rich-textarea .ql-editor, .text-input-field textarea, [contenteditable='true']"
+    send_selector = "button[aria-label='Send message'], button.send-button, button[mat-icon-button]"
+    response_selector = ".model-response-text, .response-content, message-content[class*='model']"
+
+
+@register_adapter
+class ClaudeAdapter(ChatbotAdapter):
+    name = "Claude"
+    url = "https://claude.ai/new"
+    color = "#d97706"
+    icon = "◈"
+    input_selector = "[contenteditable='true'].ProseMirror, div[contenteditable='true'], fieldset textarea"
+    send_selector = "button[aria-label='Send Message'], button[type='submit']:not(:disabled)"
+    response_selector = "[data-is-streaming], .font-claude-message, [class*='claude-message']"
+    # The message wrapper flips data-is-streaming from "true" to "false" when done
+    done_js = """
+        const wrapper = node.closest('[data-is-streaming]');
+        return wrapper ? wrapper.getAttribute('data-is-streaming') === 'false' : null;
+    """
+    done_attributes = ("data-is-streaming",)
+
+
+def adapter_from_spec(spec):
+    """Build an adapter class from a settings.json entry, e.g.
+    {"name": "Mistral", "base": "ChatGPT", "url": "https://chat.mistral.ai", ...}
+    Unset keys are inherited from `base` (or the generic defaults).
+    """
+    base = CHATBOT_ADAPTERS.get(spec.get("base"), ChatbotAdapter)
+    attrs = {key: value for key, value in spec.items() if key != "base" and hasattr(ChatbotAdapter, key)}
+    return type(f"{spec['name']}Adapter", (base,), attrs)
+
+
+def load_adapter_plugins():
+    """Register adapters from settings.json ("chatbots" list) and *.py files in ADAPTERS_DIR
+    
+    Plugin files get ChatbotAdapter, register_adapter and CHATBOT_ADAPTERS as globals.
+    """
+    for spec in SETTINGS['chatbots']:
+        try:
+            register_adapter(adapter_from_spec(spec))
+        except Exception as e:
+            print(f"✗ Invalid chatbot entry in settings: {e}")
+            
+    if not os.path.isdir(ADAPTERS_DIR):
+        return
+    for filename in sorted(os.listdir(ADAPTERS_DIR)):
+        if not filename.endswith(".py"):
+            continue
+        path = os.path.join(ADAPTERS_DIR, filename)
+        namespace = {
+            "__name__": f"brainstorm_adapter_{filename[:-3]}",
+            "__file__": path,
+            "ChatbotAdapter": ChatbotAdapter,
+            "register_adapter": register_adapter,
+            "CHATBOT_ADAPTERS": CHATBOT_ADAPTERS,
+        }
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                exec(compile(f.read(), path, 'exec'), namespace)
+            print(f"✓ Loaded chatbot adapters from {filename}")
+        except Exception as e:
+            print(f"✗ Error loading adapter plugin {filename}: {e}")
+
+
+load_adapter_plugins()
+
 # Default chatbot selection (will be updated by UI)
 CHATBOTS = [
     AVAILABLE_CHATBOTS["ChatGPT"],
     AVAILABLE_CHATBOTS["DeepSeek"],
 ]
 
+# How many panels one conversation can have
+MIN_PANELS = 2
+MAX_PANELS = 6
+
 # Template for forwarding messages (G2G style)
 FORWARD_TEMPLATE = """The response from the opposite party:
 
 {message}"""
 
+# Used when a message carries several parties' responses (more than two panels)
+PARTY_FORWARD_TEMPLATE = """The response from {name}:
 
-class ChatBridge(QObject):
-    """Handles G2G-style communication between the two chatbot panels"""
-    message_received = pyqtSignal(int, str)
-    status_update = pyqtSignal(str)
-    
-    def __init__(self):
-        super().__init__()
-        self.is_running = False
-        self.panels = []
-        self.last_response_count = [0, 0]
-        self.last_response_text = ["", ""]
-        self.check_timer = QTimer()
-        self.check_timer.timeout.connect(self.check_for_responses)
-        self.waiting_for_panel = -1  # Which panel we're waiting for (-1 = none)
-        self.right_panel_initial_prompt = ""  # Store right panel prompt for later
-        self.last_text_check = ""  # For stability check
-        self.stable_count = 0  # Count how many times text is stable
-        self.get_chatbots = None  # Function to get current chatbot configs
-        self.expecting_new_response = False  # True after we send a message
-        self.sent_message_time = 0  # Timestamp when we sent
-        
-    def set_panels(self, panels):
-        self.panels = panels
-    
-    def set_chatbot_getter(self, getter):
-        """Set the function to get current chatbot configurations"""
-        self.get_chatbots = getter
+{message}"""
+
+# Appended to the next message when the conversation loops or converges (convergence action "branch")
+BRANCH_TEMPLATE = """{message}
+
+(This conversation seems to be {state}. Challenge the weakest point made so far, or bring in a perspective nobody has raised yet.)"""
+
+# Closing request sent to each party (after any pending message) once the session budget runs out
+WIND_DOWN_TEMPLATE = """{message}
+
+This discussion has reached its limit. Summarise your final position in a few sentences: where you agree, where you still disagree, and why."""
+
+# Messages longer than a site's max_prompt_chars are sent in parts
+MULTIPART_FIRST_TEMPLATE = """This message is long, so it comes in {total} parts. Reply only with "OK" until you have received part {total}/{total}, then answer the whole message.
+
+[Part 1/{total}]
+
+{message}"""
+
+MULTIPART_NEXT_TEMPLATE = """[Part {part}/{total}]
+
+{message}"""
+
+MULTIPART_LAST_TEMPLATE = """[Part {part}/{total}]
+
+{message}
+
+That was the last part. Please answer the whole message now."""
+
+# Room left in each part for the framing above
+MULTIPART_OVERHEAD = 300
+
+
+def split_message(message, max_chars):
+    """Split a message into framed parts of at most max_chars, breaking at paragraphs,
+    lines or sentences where possible; a message that fits is returned as is"""
+    if not max_chars or len(message) <= max_chars:
+        return [message]
+    limit = max(max_chars - MULTIPART_OVERHEAD, 1)
+    chunks = []
+    rest = message
+    while len(rest) > limit:
+        cut = -1
+        for separator in ("\n\n", "\n", ". ", " "):
+            cut = rest.rfind(separator, limit // 2, limit)
+            if cut > 0:
+                cut += len(separator)
+                break
+        if cut <= 0:
+            cut = limit
+        chunks.append(rest[:cut])
+        rest = rest[cut:]
+    chunks.append(rest)
     
-    def get_current_chatbots(self):
-        """Get the current chatbot configurations"""
-        if self.get_chatbots:
-            return self.get_chatbots()
-        return CHATBOTS
-        
-    def start(self, initial_prompts):
-        """Start the conversation - send to left panel first, wait for response"""
-        self.is_running = True
-        self.last_response_count = [0, 0]
-        self.last_response_text = ["", ""]
-        self.stable_count = 0
-        self.last_text_check = ""
-        
-        chatbots = self.get_current_chatbots()
-        left_name = chatbots[0]['name']
-        
-        # Store right panel prompt for later (will be sent after left panel responds)
-        prompt1, prompt2 = initial_prompts
-        self.right_panel_initial_prompt = prompt2
-        
-        # Only send to left panel first
-        if prompt1.strip():
-            print(f"[Start] Sending initial prompt to {left_name} only...")
-            self.send_message(0, prompt1)
-            
-        # Wait for left panel to respond
-        self.waiting_for_panel = 0
-        self.expecting_new_response = True
-        self.status_update.emit(f"⏳ Waiting for {left_name} to respond...")
-        
-        # Start checking for responses after a delay (check every 2.5 seconds)
-        QTimer.singleShot(5000, lambda: self.check_timer.start(2500))
-        
-    def stop(self):
-        """Stop the conversation loop"""
-        self.is_running = False
-        self.check_timer.stop()
-        self.waiting_for_panel = -1
-        self.expecting_new_response = False
-        self.status_update.emit("Stopped")
-        
-    def check_for_responses(self):
-        """Check the panel we're waiting for"""
-        if not self.is_running or self.waiting_for_panel < 0:
-            return
-            
-        self.check_panel_response(self.waiting_for_panel)
-            
-    def check_panel_response(self, index):
-        """Check if a panel has a new complete response"""
-        if index >= len(self.panels):
-            return
-            
-        panel = self.panels[index]
-        chatbots = self.get_current_chatbots()
-        config = chatbots[index]
-        name = config['name']
-        
-        # JavaScript to get the last response and check if streaming
-        js_code = f"""
-        (function() {{
-            // Try multiple response selectors
-            const selectors = "{config['response_selector']}".split(', ');
-            let responses = [];
-            for (const sel of selectors) {{
-                try {{
-                    const found = document.querySelectorAll(sel);
-                    if (found.length > 0) {{
-                        responses = found;
-                        console.log('Found responses with selector:', sel, found.length);
-                        break;
-                    }}
-                }} catch(e) {{}}
-            }}
-            
-            if (responses.length === 0) {{
-                console.log('No responses found');
-                return JSON.stringify({{count: 0, text: '', streaming: false, hasCompletionIndicators: false, debug: 'no responses'}});
-            }}
-            
-            const lastResponse = responses[responses.length - 1];
-            const text = lastResponse.innerText || lastResponse.textContent || '';
-            
-            // Check if still streaming (multiple indicators)
-            const streamingSelectors = [
-                '.result-streaming',
-                '[class*="streaming"]',
-                '[class*="typing"]', 
-                '[class*="loading"]',
-                '[class*="cursor"]',
-                '.animate-pulse',
-                '[data-state="streaming"]',
-                '[data-is-streaming="true"]'
-            ];
-            let isStreaming = false;
-            for (const sel of streamingSelectors) {{
-                if (document.querySelector(sel)) {{
-                    isStreaming = true;
-                    console.log('Streaming detected via:', sel);
-                    break;
-                }}
-            }}
-            
-            // Check for Stop button (indicates still generating)
-            const buttons = document.querySelectorAll('button');
-            for (const btn of buttons) {{
-                const btnText = (btn.innerText || '').toLowerCase();
-                const ariaLabel = (btn.getAttribute('aria-label') || '').toLowerCase();
-                if (btnText.includes('stop') || ariaLabel.includes('stop')) {{
-                    isStreaming = true;
-                    console.log('Streaming detected: Stop button visible');
-                    break;
-                }}
-            }}
-            
-            // Check for completion indicators (buttons that appear when response is done)
-            let hasCompletionIndicators = false;
-            const lastResponseContainer = lastResponse.closest('[data-message-id]') || lastResponse.parentElement?.parentElement;
-            if (lastResponseContainer) {{
-                // ChatGPT: Look for copy button, thumbs up/down, regenerate button
-                const completionSelectors = [
-                    'button[aria-label*="Copy"]',
-                    'button[aria-label*="copy"]',
-                    'button[data-testid="copy-turn-action-button"]',
-                    'button[aria-label*="Good response"]',
-                    'button[aria-label*="Bad response"]',
-                    'button[aria-label*="Read aloud"]'
-                ];
-                for (const sel of completionSelectors) {{
-                    if (lastResponseContainer.querySelector(sel) || document.querySelector(sel)) {{
-                        hasCompletionIndicators = true;
-                        console.log('Completion indicator found:', sel);
-                        break;
-                    }}
-                }}
-            }}
-            
-            // Also check globally for these indicators near the last message
-            if (!hasCompletionIndicators) {{
-                // If we find action buttons at the bottom of chat, response is likely complete
-                const actionButtons = document.querySelectorAll('[data-testid="copy-turn-action-button"], button[aria-label*="Copy"]');
-                if (actionButtons.length > 0) {{
-                    hasCompletionIndicators = true;
-                }}
-            }}
-            
-            console.log('Response check:', {{count: responses.length, textLen: text.length, streaming: isStreaming, hasCompletionIndicators: hasCompletionIndicators}});
-            
-            return JSON.stringify({{
-                count: responses.length,
-                text: text.trim().substring(0, 8000),
-                streaming: isStreaming,
-                hasCompletionIndicators: hasCompletionIndicators
-            }});
-        }})();
-        """
-        
-        panel.browser.page().runJavaScript(js_code, lambda result: self.handle_response_check(index, result))
-        
-    def handle_response_check(self, panel_index, result):
-        """Handle the result of checking for a response"""
-        if not self.is_running or not result:
-            return
-            
-        try:
-            import json
-            data = json.loads(result)
-            
-            count = data.get('count', 0)
-            text = data.get('text', '')
-            is_streaming = data.get('streaming', False)
-            has_completion_indicators = data.get('hasCompletionIndicators', False)
-            chatbots = self.get_current_chatbots()
-            name = chatbots[panel_index]['name']
-            
-            # Simple text stability approach - ignore unreliable streaming detection
-            if count > 0 and text:
-                # When expecting a new response, wait for text to change from recorded
-                if self.expecting_new_response:
-                    text_changed = text != self.last_response_text[panel_index]
-                    if text_changed:
-                        print(f"[{name}] New response detected! Starting stability tracking...")
-                        self.expecting_new_response = False
-                        self.stable_count = 0
-                        self.last_text_check = text
-                    else:
-                        print(f"[{name}] Waiting for new response... (current len: {len(text)})")
-                        self.status_update.emit(f"⏳ Waiting for {name} to start responding...")
-                        return
-                
-                # Track text stability (ignore streaming detection - too unreliable)
-                if text == self.last_text_check:
-                    self.stable_count += 1
-                else:
-                    self.stable_count = 0
-                    self.last_text_check = text
-                
-                # Wait for 5 stable checks (~12.5 seconds) to be sure response is complete
-                stability_threshold = 5
-                is_complete = self.stable_count >= stability_threshold
-                    
-                print(f"[{name}] Responses: {count}, Stable: {self.stable_count}/{stability_threshold}, Len: {len(text)}")
-                
-                # Update status
-                if self.stable_count > 0 and not is_complete:
-                    self.status_update.emit(f"⏳ {name} responding... verifying ({self.stable_count}/{stability_threshold})")
-                else:
-                    self.status_update.emit(f"⏳ {name} is generating... ({len(text)} chars)")
-                
-                # Forward when stable
-                if is_complete:
-                    
-                    print(f"[{name}] ✓ RESPONSE COMPLETE! Forwarding...")
-                    
-                    self.last_response_count[panel_index] = count
-                    self.last_response_text[panel_index] = text
-                    self.stable_count = 0
-                    self.last_text_check = ""
-                    
-                    # Notify UI
-                    self.message_received.emit(panel_index, text[:80] + "..." if len(text) > 80 else text)
-                    
-                    # Forward to the other panel
-                    other_index = 1 - panel_index
-                    other_name = chatbots[other_index]['name']
-                    
-                    # For the first left panel response, send right panel's initial prompt + left panel's response
-                    if panel_index == 0 and self.right_panel_initial_prompt:
-                        message_to_send = self.right_panel_initial_prompt + "\n\nThe first round from the opposite party:\n\n" + text
-                        self.right_panel_initial_prompt = ""  # Clear it
-                    else:
-                        message_to_send = FORWARD_TEMPLATE.format(message=text)
-                    
-                    print(f"[{name}] Sending to {other_name}...")
-                    self.send_message(other_index, message_to_send)
-                    
-                    # Now wait for the other panel - reset counters for fresh detection
-                    self.waiting_for_panel = other_index
-                    self.stable_count = 0
-                    self.last_text_check = ""
-                    self.expecting_new_response = True
-                    self.status_update.emit(f"⏳ Waiting for {other_name} to respond...")
-            else:
-                print(f"[{name}] No responses yet...")
-                    
-        except Exception as e:
-            print(f"Error parsing response: {e}")
-            self.status_update.emit(f"Error: {str(e)[:30]}")
-            
-    def send_message(self, panel_index, message):
-        """Send a message to a specific panel"""
-        if panel_index >= len(self.panels):
-            return
-            
-        panel = self.panels[panel_index]
-        chatbots = self.get_current_chatbots()
-        config = chatbots[panel_index]
-        name = config['name']
-        
-        self.status_update.emit(f"📤 Sending to {name}...")
-        
-        # Escape for JavaScript
-        escaped = message.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-        escaped = escaped.replace('\n', '\\n').replace('\r', '').replace("'", "\\'")
-        
-        js_code = f"""
-        (function() {{
-            // Try multiple input selectors
-            const inputSelectors = "{config['input_selector']}".split(', ');
-            let input = null;
-            for (const sel of inputSelectors) {{
-                input = document.querySelector(sel);
-                if (input) break;
-            }}
-            
-            if (!input) {{
-                console.log('No input found with selectors:', inputSelectors);
-                return 'no input';
-            }}
-            
-            console.log('Found input:', input);
-            
-            const text = `{escaped}`;
-            
-            // Focus and clear
-            input.focus();
-            input.select && input.select();
-            
-            // Method 1: Use execCommand insertText (works with React)
-            document.execCommand('selectAll', false, null);
-            document.execCommand('insertText', false, text);
-            
+    total = len(chunks)
+    parts = [MULTIPART_FIRST_TEMPLATE.format(total=total, message=chunks[0])]
+    for i, chunk in enumerate(chunks[1:], start=2):
+        template = MULTIPART_LAST_TEMPLATE if i == total else MULTIPART_NEXT_TEMPLATE
+        parts.append(template.format(part=i, total=total, message=chunk))
+    return parts
+
+# Connects the isolated world to Python through QWebChannel (runs after qwebchannel.js)
+CHANNEL_BOOTSTRAP_JS = """
+(function() {
+    if (typeof qt === 'undefined' || !qt.webChannelTransport) return;
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        window.__argueNotifier = channel.objects.argueNotifier;
+    });
+})();
+"""
+
+# Page-side script library, injected once per page load into an isolated world.
+# Python only calls small named entry points (__argue.probe(), __argue.send(...));
+# the site config arrives once per page through the argue_config script.
+ARGUE_LIBRARY_JS = """
+(function() {
+    if (window.__argue) return;
+
+    let config = null;
+
+    function configure(siteConfig) {
+        config = siteConfig;
+        for (const role in selectorCache) delete selectorCache[role];
+        return true;
+    }
+
+    function querySelectorList(selectors) {
+        for (const sel of selectors) {
+            try {
+                const found = document.querySelectorAll(sel);
+                if (found.length > 0) return found;
+            } catch(e) {}
+        }
+        return [];
+    }
+
+    // Winning selector per role ('response', 'input', 'send'), re-validated with a
+    // single query and re-probed through the whole list only on a miss. A winner
+    // that is not the first choice is re-probed every REPROBE_EVERY lookups so that
+    // a more specific selector that starts matching later takes over.
+    const REPROBE_EVERY = 20;
+    const selectorCache = {};
+
+    function cachedLookup(role, selectors, query, accept) {
+        const entry = selectorCache[role] || (selectorCache[role] =
+            {selector: null, index: -1, lookups: 0, hits: 0, misses: 0, reprobes: 0, empty: 0});
+        entry.lookups++;
+        const reprobe = entry.index > 0 && entry.lookups % REPROBE_EVERY === 0;
+        if (entry.selector !== null && !reprobe) {
+            const result = query(entry.selector);
+            if (accept(result)) {
+                entry.hits++;
+                return result;
+            }
+        }
+        if (reprobe) entry.reprobes++; else entry.misses++;
+        for (let i = 0; i < selectors.length; i++) {
+            try {
+                const result = query(selectors[i]);
+                if (accept(result)) {
+                    entry.selector = selectors[i];
+                    entry.index = i;
+                    return result;
+                }
+            } catch(e) {}
+        }
+        entry.selector = null;
+        entry.index = -1;
+        entry.empty++;
+        return null;
+    }
+
+    function queryAllCached(role, selectors) {
+        return cachedLookup(role, selectors, sel => document.querySelectorAll(sel),
+                            found => found.length > 0) || [];
+    }
+
+    function queryFirstCached(role, selectors, usable) {
+        return cachedLookup(role, selectors, sel => document.querySelector(sel),
+                            el => !!el && (!usable || usable(el)));
+    }
+
+    // Hit/miss counts per role; 'empty' lookups matched none of the configured selectors
+    function selectorStats() {
+        return JSON.stringify(selectorCache);
+    }
+
+    function findLastResponse() {
+        const responses = queryAllCached('response', config.responseSelectors);
+        return {node: responses.length ? responses[responses.length - 1] : null, count: responses.length};
+    }
+
+    function textOf(node) {
+        return node ? (node.innerText || node.textContent || '').trim() : '';
+    }
+
+    // The site adapter's own done signal: true = finished, false = streaming, null = unknown
+    function siteDone(node) {
+        if (!node || !config.doneSignal) return null;
+        try {
+            const done = config.doneSignal(node);
+            return typeof done === 'boolean' ? done : null;
+        } catch(e) {
+            return null;
+        }
+    }
+
+    // FNV-1a over the response text, resumed from the previous poll while the
+    // text only grows, so a streaming answer is hashed roughly once in total
+    const hashState = {text: '', hash: 0x811c9dc5};
+
+    function rollingHash(text) {
+        let h = 0x811c9dc5;
+        let from = 0;
+        if (hashState.text && text.startsWith(hashState.text)) {
+            h = hashState.hash;
+            from = hashState.text.length;
+        }
+        for (let i = from; i < text.length; i++) {
+            h ^= text.charCodeAt(i);
+            h = Math.imul(h, 0x01000193);
+        }
+        hashState.text = text;
+        hashState.hash = h;
+        return (h >>> 0).toString(16);
+    }
+
+    // Length + hash of the last response and the site's done signal (no text)
+    function probe() {
+        const last = findLastResponse();
+        if (!last.node) {
+            return JSON.stringify({count: 0, length: 0, hash: '', done: null, debug: 'no responses'});
+        }
+        const text = textOf(last.node);
+        return JSON.stringify({
+            count: last.count,
+            length: text.length,
+            hash: rollingHash(text),
+            done: siteDone(last.node)
+        });
+    }
+
+    // Full, untruncated text of the last response
+    function lastText() {
+        return textOf(findLastResponse().node);
+    }
+
+    function pressEnter(input) {
+        input.dispatchEvent(new KeyboardEvent('keydown', {
+            key: 'Enter', code: 'Enter', keyCode: 13, which: 13,
+            bubbles: true, cancelable: true
+        }));
+    }
+
+    function caretToEnd(input) {
+        input.focus();
+        if (input.value !== undefined) {
+            input.setSelectionRange(input.value.length, input.value.length);
+        } else {
+            const range = document.createRange();
+            range.selectNodeContents(input);
+            range.collapse(false);
+            const selection = window.getSelection();
+            selection.removeAllRanges();
+            selection.addRange(range);
+        }
+    }
+
+    // Messages too big for one script call arrive as stage() pieces, then sendStaged()
+    const outbox = {};
+
+    function stage(id, piece) {
+        (outbox[id] = outbox[id] || []).push(piece);
+        return outbox[id].length;
+    }
+
+    function sendStaged(id) {
+        const text = (outbox[id] || []).join('');
+        delete outbox[id];
+        return send(text);
+    }
+
+    function send(text) {
+        const input = queryFirstCached('input', config.inputSelectors);
+        if (!input) {
+            console.log('No input found with selectors:', config.inputSelectors);
+            return 'no input';
+        }
+
+        // Focus and clear
+        input.focus();
+        input.select && input.select();
+        document.execCommand('selectAll', false, null);
+
+        // Method 1: execCommand insertText (works with React), a chunk per task so a long
+        // message doesn't block the renderer; the first chunk replaces the selection
+        const chunkChars = config.insertChunkChars || 2000;
+        let offset = 0;
+        function insertNext() {
+            if (offset >= text.length) {
+                finish();
+                return;
+            }
+            let end = Math.min(offset + chunkChars, text.length);
+            const last = text.charCodeAt(end - 1);
+            if (end < text.length && last >= 0xD800 && last <= 0xDBFF) end--;  // Keep surrogate pairs whole
+            if (offset > 0 && document.activeElement !== input) caretToEnd(input);
+            document.execCommand('insertText', false, text.slice(offset, end));
+            offset = end;
+            setTimeout(insertNext, 0);
+        }
+
+        function finish() {
             // Method 2: If that didn't work, try DataTransfer (paste simulation)
-            if (!input.value && !input.innerText) {{
+            if (!input.value && !input.innerText) {
                 const dt = new DataTransfer();
                 dt.setData('text/plain', text);
-                const pasteEvent = new ClipboardEvent('paste', {{
-                    clipboardData: dt,
-                    bubbles: true,
-                    cancelable: true
-                }});
-                input.dispatchEvent(pasteEvent);
-            }}
-            
+                input.dispatchEvent(new ClipboardEvent('paste', {clipboardData: dt, bubbles: true, cancelable: true}));
+            }
+
             // Method 3: Direct value set with React fiber hack
-            if (!input.value && !input.innerText) {{
+            if (!input.value && !input.innerText) {
                 const nativeSetter = Object.getOwnPropertyDescriptor(
                     input.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype,
                     'value'
                 )?.set;
-                if (nativeSetter) {{
+                if (nativeSetter) {
                     nativeSetter.call(input, text);
-                    input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                }}
-            }}
-            
+                    input.dispatchEvent(new Event('input', {bubbles: true}));
+                }
+            }
+
             // Trigger events to update React state
-            input.dispatchEvent(new Event('input', {{bubbles: true, cancelable: true}}));
-            input.dispatchEvent(new Event('change', {{bubbles: true}}));
-            
+            input.dispatchEvent(new Event('input', {bubbles: true, cancelable: true}));
+            input.dispatchEvent(new Event('change', {bubbles: true}));
+
             // Wait then send
-            setTimeout(() => {{
-                const panelName = "{name}";
-                
-                // For DeepSeek, use Enter key directly (more reliable)
-                if (panelName === "DeepSeek") {{
-                    console.log('DeepSeek: Using Enter key to send');
-                    // Simulate Ctrl+Enter or just Enter
-                    input.dispatchEvent(new KeyboardEvent('keydown', {{
-                        key: 'Enter', code: 'Enter', keyCode: 13, which: 13,
-                        bubbles: true, cancelable: true
-                    }}));
+            setTimeout(() => {
+                if (config.sendStrategy === 'enter') {
+                    pressEnter(input);
                     return;
-                }}
-                
-                // For ChatGPT, try the specific send button
-                const sendSelectors = "{config['send_selector']}".split(', ');
-                let sendBtn = null;
-                for (const sel of sendSelectors) {{
-                    try {{
-                        sendBtn = document.querySelector(sel);
-                        if (sendBtn && !sendBtn.disabled) break;
-                    }} catch(e) {{}}
-                }}
-                
-                if (sendBtn && !sendBtn.disabled) {{
-                    console.log('Clicking send:', sendBtn);
+                }
+                const sendBtn = queryFirstCached('send', config.sendSelectors, btn => !btn.disabled);
+                if (sendBtn) {
                     sendBtn.click();
-                }} else {{
-                    // Fallback: Enter key
-                    console.log('Fallback: Enter key');
-                    input.dispatchEvent(new KeyboardEvent('keydown', {{
-                        key: 'Enter', code: 'Enter', keyCode: 13, bubbles: true
-                    }}));
-                }}
-            }}, 500);
-            
-            return 'sent';
-        }})();
-        """
-        
-        panel.browser.page().runJavaScript(js_code, lambda r: print(f"Send to {name}: {r}"))
+                } else {
+                    pressEnter(input);  // Fallback: Enter key
+                }
+            }, config.sendDelayMs);
+        }
 
+        insertNext();
+        return 'sending';
+    }
 
-class BrowserPanel(QFrame):
-    """A panel containing a browser view"""
+    // Generic conversation extraction that works across sites, in batches:
+    // extractStart() collects the message elements, extractNext() reads the next batch
+    const MESSAGE_SELECTORS = [
+        // ChatGPT
+        '[data-message-author-role]',
+        // Claude
+        '.font-claude-message, .font-user-message, [class*="message"]',
+        // Gemini
+        '.model-response-text, .user-query-text, message-content',
+        // DeepSeek
+        '.ds-markdown, .user-message, [class*="message"]',
+        // Generic
+        '[class*="chat"] [class*="message"]',
+        '[role="article"]',
+        '.message, .chat-message'
+    ];
+
+    function roleOf(el) {
+        const roleAttr = el.getAttribute('data-message-author-role');
+        if (roleAttr) return roleAttr;
+        const className = String(el.className);
+        if (className.includes('user') || className.includes('human')) return 'user';
+        if (className.includes('assistant') || className.includes('model') || className.includes('claude')) return 'assistant';
+        return null;
+    }
+
+    // Broad selectors like [class*="message"] match both the message element and parts
+    // nested inside it, and sometimes the list around the messages. Matches come in
+    // document order, so one pass with a stack nests them into a forest; each outermost
+    // match is then kept whole (its own text included) unless it holds both user and
+    // assistant messages - that is a container, and its children are the messages.
+    function messageElements() {
+        const roots = [];
+        const open = [];
+        querySelectorList(MESSAGE_SELECTORS).forEach(el => {
+            while (open.length && !open[open.length - 1].el.contains(el)) open.pop();
+            const node = {el, role: roleOf(el), children: [], roles: new Set()};
+            (open.length ? open[open.length - 1].children : roots).push(node);
+            open.push(node);
+        });
+        function collectRoles(node) {
+            if (node.role) node.roles.add(node.role);
+            node.children.forEach(child => collectRoles(child).forEach(role => node.roles.add(role)));
+            return node.roles;
+        }
+        const items = [];
+        function flatten(node, inherited) {
+            if (node.roles.has('user') && node.roles.has('assistant')) {
+                node.children.forEach(child => flatten(child, node.role || inherited));
+            } else {
+                items.push({el: node.el, role: node.role || node.roles.values().next().value || inherited || 'message'});
+            }
+        }
+        roots.forEach(node => { collectRoles(node); flatten(node, null); });
+        return items;
+    }
+
+    const extraction = {items: [], next: 0};
+
+    function extractStart() {
+        extraction.items = messageElements();
+        extraction.next = 0;
+
+        // If no structured messages found, take the main content as one message
+        if (extraction.items.length === 0) {
+            const mainContent = document.querySelector('main, [role="main"], .chat-container, #chat');
+            if (mainContent) extraction.items = [{el: mainContent, role: 'content'}];
+        }
+        return JSON.stringify({total: extraction.items.length});
+    }
+
+    // Full text of the next messages, about maxChars per batch (at least one message)
+    function extractNext(maxChars) {
+        const messages = [];
+        let chars = 0;
+        while (extraction.next < extraction.items.length && (messages.length === 0 || chars < maxChars)) {
+            const item = extraction.items[extraction.next++];
+            const text = (item.el.innerText || item.el.textContent || '').trim();
+            if (text.length > 10) {
+                messages.push({role: item.role, text: text});
+                chars += text.length;
+            }
+        }
+        const done = extraction.next >= extraction.items.length;
+        const result = JSON.stringify({messages: messages, next: extraction.next, total: extraction.items.length, done: done});
+        if (done) extraction.items = [];  // Don't hold on to the page's nodes
+        return result;
+    }
+
+    // --- Completion observer: pushes "settled" over QWebChannel after a quiet period ---
+
+    function isStreaming() {
+        if (document.querySelector('[data-is-streaming="true"], .result-streaming, [data-state="streaming"]')) {
+            return true;
+        }
+        for (const btn of document.querySelectorAll('button')) {
+            const ariaLabel = (btn.getAttribute('aria-label') || '').toLowerCase();
+            if (ariaLabel.includes('stop')) return true;
+        }
+        return false;
+    }
+
+    const state = {
+        armed: false, quietMs: 800,
+        baselineCount: 0, baselineText: '', lastText: null,
+        checkTimer: null, settleTimer: null
+    };
+
+    function restartSettleTimer() {
+        clearTimeout(state.settleTimer);
+        state.settleTimer = setTimeout(settle, state.quietMs);
+    }
+
+    // Throttled: mutations only mark the tree dirty, the text is read at most every 100 ms
+    function check() {
+        state.checkTimer = null;
+        if (!state.armed) return;
+        const last = findLastResponse();
+        const text = textOf(last.node);
+        if (!text) return;
+        if (last.count <= state.baselineCount && text === state.baselineText) return;
+        if (text !== state.lastText) {
+            state.lastText = text;
+            restartSettleTimer();
+        }
+        // A site done signal ends the turn without waiting out the quiet period
+        if (siteDone(last.node) === true) {
+            clearTimeout(state.settleTimer);
+            settle();
+        }
+    }
+
+    function settle() {
+        state.settleTimer = null;
+        if (!state.armed) return;
+        const last = findLastResponse();
+        const text = textOf(last.node);
+        const done = siteDone(last.node);
+        if (text !== state.lastText || done === false || (done === null && isStreaming())) {
+            state.lastText = text;
+            restartSettleTimer();
+            return;
+        }
+        disarm();
+        if (window.__argueNotifier) {
+            window.__argueNotifier.settled(JSON.stringify({count: last.count, length: text.length, done: done}));
+        }
+    }
+
+    const observer = new MutationObserver(function() {
+        if (state.armed && !state.checkTimer) {
+            state.checkTimer = setTimeout(check, 100);
+        }
+    });
+
+    function arm(quietMs) {
+        const last = findLastResponse();
+        state.quietMs = quietMs;
+        state.baselineCount = last.count;
+        state.baselineText = textOf(last.node);
+        state.lastText = null;
+        clearTimeout(state.settleTimer);
+        state.armed = true;
+        const options = {childList: true, subtree: true, characterData: true};
+        if (config.doneAttributes && config.doneAttributes.length) {
+            options.attributes = true;
+            options.attributeFilter = config.doneAttributes;
+        }
+        observer.observe(document.body, options);
+        return true;
+    }
+
+    function disarm() {
+        state.armed = false;
+        clearTimeout(state.settleTimer);
+        observer.disconnect();
+        return true;
+    }
+
+    // Time any entry point in-page, e.g. __argue.bench('probe', 100) -> ms per call
+    function bench(fnName, iterations) {
+        const fn = window.__argue[fnName];
+        const start = performance.now();
+        for (let i = 0; i < iterations; i++) fn();
+        return (performance.now() - start) / iterations;
+    }
+
+    window.__argue = {configure, probe, text: lastText, send, stage, sendStaged, extractStart, extractNext, arm, disarm, bench, selectorStats};
+    if (window.__argueConfig) configure(window.__argueConfig);
+})();
+"""
+
+# Argument-free entry points, guarded for pages where the library is not loaded yet
+PROBE_CALL_JS = "window.__argue ? window.__argue.probe() : null"
+TEXT_CALL_JS = "window.__argue ? window.__argue.text() : null"
+EXTRACT_START_CALL_JS = "window.__argue ? window.__argue.extractStart() : null"
+DISARM_CALL_JS = "window.__argue && window.__argue.disarm()"
+SELECTOR_STATS_CALL_JS = "window.__argue ? window.__argue.selectorStats() : null"
+# Format with max_chars=...
+EXTRACT_NEXT_CALL_JS = "window.__argue ? window.__argue.extractNext({max_chars}) : null"
+
+
+def load_qwebchannel_js():
+    """Read qwebchannel.js from the Qt resource bundle"""
+    qfile = QFile(":/qtwebchannel/qwebchannel.js")
+    if not qfile.open(QIODevice.OpenModeFlag.ReadOnly):
+        print("qwebchannel.js not found - observer mode unavailable")
+        return ""
+    source = bytes(qfile.readAll()).decode('utf-8')
+    qfile.close()
+    return source
+
+
+def make_script(name, source, injection_point):
+    """Build a QWebEngineScript for the isolated world"""
+    script = QWebEngineScript()
+    script.setName(name)
+    script.setSourceCode(source)
+    script.setInjectionPoint(injection_point)
+    script.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld)
+    script.setRunsOnSubFrames(False)
+    return script
+
+
+def install_argue_library(profile):
+    """Install the page-side script library once for every page of the profile"""
+    scripts = profile.scripts()
+    if scripts.find("argue_library"):
+        return
+    scripts.insert(make_script(
+        "argue_library",
+        load_qwebchannel_js() + CHANNEL_BOOTSTRAP_JS + ARGUE_LIBRARY_JS,
+        QWebEngineScript.InjectionPoint.DocumentReady,
+    ))
+
+
+# Rough transfer size per blocked request, by resource type, for the "bytes saved" estimate
+BLOCKED_BYTES_ESTIMATE = {
+    'font': 40_000,
+    'media': 500_000,
+    'image': 30_000,
+    'script': 60_000,
+    'stylesheet': 20_000,
+    'xhr': 5_000,
+    'ping': 1_000,
+    'sub_frame': 100_000,
+}
+
+
+def resource_type_name(resource_type):
+    """QWebEngineUrlRequestInfo.ResourceType -> short rule name, e.g. ResourceTypeFontResource -> 'font'"""
+    name = resource_type.name.replace("ResourceType", "", 1)
+    name = re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+    return {'font_resource': 'font'}.get(name, name)
+
+
+def host_matches(host, domains):
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class RequestFilter:
+    """Allow/block rules for subresource requests, with counters
     
-    def __init__(self, config, profile, parent=None):
-        super().__init__(parent)
-        self.config = config
-        self.profile = profile
-        self.setup_ui()
+    Rules come from SETTINGS['request_filter']: global block_types, block_hosts,
+    block_url_patterns and allow_hosts, plus per-site overrides under "sites",
+    keyed by the host of the page making the request.
+    """
+    
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else SETTINGS['request_filter']
+        self.merged_rules = {}  # first-party host -> rules
+        self.lock = threading.Lock()  # Counters are read by the /metrics thread
+        self.blocked = {}  # (site host, reason) -> count
+        self.bytes_saved = 0
+        self.allowed = 0
+        
+    def site_rules(self, first_party_host):
+        """Global rules merged with those of the site making the request (cached per host)"""
+        if first_party_host in self.merged_rules:
+            return self.merged_rules[first_party_host]
+        merged = {key: list(self.rules.get(key, [])) for key in
+                  ('block_types', 'block_hosts', 'block_url_patterns', 'allow_hosts')}
+        for site, overrides in self.rules.get('sites', {}).items():
+            if host_matches(first_party_host, [site]):
+                for key in merged:
+                    merged[key] += overrides.get(key, [])
+        self.merged_rules[first_party_host] = merged
+        return merged
+        
+    def check(self, url, first_party_host, resource_type):
+        """Return the reason to block a request, or None to let it through"""
+        if resource_type == 'main_frame':
+            return None
+        host = urlparse(url).hostname or ""
+        rules = self.site_rules(first_party_host)
+        if host_matches(host, rules['allow_hosts']):
+            return None
+        if resource_type in rules['block_types']:
+            return f"type:{resource_type}"
+        if host_matches(host, rules['block_hosts']):
+            return "host"
+        if any(pattern in url for pattern in rules['block_url_patterns']):
+            return "pattern"
+        return None
+        
+    def record(self, first_party_host, reason, resource_type):
+        with self.lock:
+            if reason is None:
+                self.allowed += 1
+                return
+            key = (first_party_host, reason)
+            self.blocked[key] = self.blocked.get(key, 0) + 1
+            self.bytes_saved += BLOCKED_BYTES_ESTIMATE.get(resource_type, 10_000)
+            
+    def metrics_lines(self):
+        """Prometheus lines for TurnMetrics.render"""
+        with self.lock:
+            blocked = sorted(self.blocked.items())
+            bytes_saved, allowed = self.bytes_saved, self.allowed
+        lines = [
+            "# HELP brainstorm_requests_blocked_total Subresource requests blocked by the request filter.",
+            "# TYPE brainstorm_requests_blocked_total counter",
+        ]
+        for (site, reason), count in blocked:
+            lines.append(f'brainstorm_requests_blocked_total{{site="{site}",reason="{reason}"}} {count}')
+        lines += [
+            "# HELP brainstorm_requests_allowed_total Subresource requests let through.",
+            "# TYPE brainstorm_requests_allowed_total counter",
+            f"brainstorm_requests_allowed_total {allowed}",
+            "# HELP brainstorm_blocked_bytes_estimate_total Estimated bytes not downloaded thanks to blocking.",
+            "# TYPE brainstorm_blocked_bytes_estimate_total counter",
+            f"brainstorm_blocked_bytes_estimate_total {bytes_saved}",
+        ]
+        return lines
+        
+    def summary(self):
+        with self.lock:
+            total = sum(self.blocked.values())
+            return f"[Requests] {total} blocked (~{self.bytes_saved / 1_000_000:.1f} MB saved), {self.allowed} allowed"
+
+
+def make_request_interceptor(request_filter, parent=None):
+    """A QWebEngineUrlRequestInterceptor applying a RequestFilter (QtWebEngine is imported lazily)"""
+    from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor
+    
+    class RequestInterceptor(QWebEngineUrlRequestInterceptor):
+        def interceptRequest(self, info):
+            first_party_host = info.firstPartyUrl().host()
+            resource_type = resource_type_name(info.resourceType())
+            reason = request_filter.check(info.requestUrl().toString(), first_party_host, resource_type)
+            request_filter.record(first_party_host, reason, resource_type)
+            if reason is not None:
+                info.block(True)
+                
+    return RequestInterceptor(parent)
+
+
+def make_profile(name, storage_dir, parent=None, request_filter=None):
+    """Persistent browser profile (logins survive restarts) with the script library installed"""
+    os.makedirs(storage_dir, exist_ok=True)
+    profile = QWebEngineProfile(name, parent)
+    profile.setPersistentStoragePath(storage_dir)
+    profile.setCachePath(os.path.join(storage_dir, "cache"))
+    profile.setPersistentCookiesPolicy(
+        QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
+    )
+    cache_types = {
+        "disk": QWebEngineProfile.HttpCacheType.DiskHttpCache,
+        "memory": QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+        "none": QWebEngineProfile.HttpCacheType.NoCache,
+    }
+    profile.setHttpCacheType(cache_types.get(SETTINGS['http_cache'], QWebEngineProfile.HttpCacheType.DiskHttpCache))
+    profile.setHttpCacheMaximumSize(SETTINGS['http_cache_mb'] * 1024 * 1024)  # 0 = Qt decides
+    if request_filter is not None:
+        profile.setUrlRequestInterceptor(make_request_interceptor(request_filter, profile))
+    install_argue_library(profile)
+    return profile
+
+
+def site_config_js(config):
+    """JavaScript that hands a chatbot's site config to the page library"""
+    site_config = {
+        'name': config['name'],
+        'responseSelectors': config['response_selector'].split(', '),
+        'inputSelectors': config['input_selector'].split(', '),
+        'sendSelectors': config['send_selector'].split(', '),
+        'sendStrategy': config.get('send_strategy', 'click'),
+        'sendDelayMs': config.get('send_delay_ms', 500),
+        'insertChunkChars': SETTINGS['inject_chunk_chars'],
+        'doneAttributes': config.get('done_attributes', []),
+    }
+    # The done signal is emitted as source, not eval'd in the page, so site CSPs don't block it
+    done_js = config.get('done_js', '').strip()
+    done_signal = f"function(node) {{ {done_js} }}" if done_js else "null"
+    return (
+        f"window.__argueConfig = Object.assign({json.dumps(site_config)}, {{doneSignal: {done_signal}}});"
+        " window.__argue && window.__argue.configure(window.__argueConfig);"
+    )
+
+
+
+class StabilityModel:
+    """Learns each model's token-gap distribution and derives its stability window
+    (kept in memory only when `path` is None)"""
+    
+    def __init__(self, path=STABILITY_FILE):
+        self.path = path
+        self.gaps = {}  # model name -> recent gaps between text growth (ms)
+        self.load()
+        
+    def load(self):
+        try:
+            if self.path and os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                # Only keep entries for models we still know about
+                self.gaps = {name: gaps for name, gaps in data.items() if name in AVAILABLE_CHATBOTS}
+        except Exception as e:
+            print(f"Error loading stability model: {e}")
+            
+    def save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(self.gaps, f)
+        except Exception as e:
+            print(f"Error saving stability model: {e}")
+            
+    def record_gap(self, name, gap_ms):
+        """Record the time between two observed text growths of a streaming response"""
+        gaps = self.gaps.setdefault(name, [])
+        gaps.append(round(gap_ms))
+        del gaps[:-int(SETTINGS['stability_history'])]
+        
+    def window_ms(self, name):
+        """How long a response must stay unchanged before it counts as complete"""
+        gaps = sorted(self.gaps.get(name, []))
+        if len(gaps) < SETTINGS['stability_min_samples']:
+            return SETTINGS['stability_default_ms']
+        p95 = gaps[min(len(gaps) - 1, int(len(gaps) * 0.95))]
+        window = p95 * SETTINGS['stability_margin']
+        return max(SETTINGS['stability_min_ms'], min(SETTINGS['stability_max_ms'], window))
+
+
+class PollScheduler(QObject):
+    """Polls fast while the response is growing and backs off while the page is idle"""
+    tick = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.interval = SETTINGS['poll_min_ms']
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick.emit)
+        
+    def start(self, delay_ms):
+        self.interval = SETTINGS['poll_min_ms']
+        self.timer.start(int(delay_ms))
+        
+    def stop(self):
+        self.timer.stop()
+        
+    def schedule_next(self):
+        self.timer.start(int(self.interval))
+        
+    def note_activity(self):
+        """Text changed - poll at full speed"""
+        self.interval = SETTINGS['poll_min_ms']
+        
+    def note_idle(self):
+        """Nothing changed - back off towards the maximum interval"""
+        self.interval = min(SETTINGS['poll_max_ms'], self.interval * SETTINGS['poll_backoff'])
+
+
+class PanelNotifier(QObject):
+    """Receives push notifications from the page's isolated world over QWebChannel"""
+    response_settled = pyqtSignal(str)
+
+    @pyqtSlot(str)
+    def settled(self, payload):
+        self.response_settled.emit(payload)
+
+
+class TurnJournal:
+    """Append-only JSONL record of every sent and received turn, written off the Qt thread"""
+    
+    def __init__(self, directory=JOURNAL_DIR):
+        self.directory = directory
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.writer_loop, name="turn-journal", daemon=True)
+        self.thread.start()
+        
+    def start_session(self, models, topology, prompts):
+        """Open a journal file for a new conversation and return its path"""
+        session_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = os.path.join(self.directory, f"session_{session_id}.jsonl")
+        self.append(path, {
+            'kind': 'session',
+            'session': session_id,
+            'models': models,
+            'topology': topology,
+            'prompts': list(prompts),
+        })
+        return path
+        
+    def append(self, path, record):
+        """Queue a record; never blocks on disk"""
+        now = time.time()
+        record = dict(record, ts=now, time=datetime.fromtimestamp(now).isoformat(timespec='seconds'))
+        self.queue.put((path, record))
+        
+    def writer_loop(self):
+        """Write queued records in batches, one open/write/flush per file per batch"""
+        while True:
+            item = self.queue.get()
+            batch = [item]
+            time.sleep(SETTINGS['journal_flush_ms'] / 1000)  # Let a burst of records accumulate
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+                    
+            by_path = {}
+            for path, record in batch:
+                if path is not None:
+                    by_path.setdefault(path, []).append(json.dumps(record, ensure_ascii=False) + "\n")
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for path, lines in by_path.items():
+                    with open(path, 'a', encoding='utf-8') as f:
+                        f.writelines(lines)
+            except Exception as e:
+                print(f"✗ Error writing turn journal: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+                    
+    def flush(self):
+        """Block until every queued record is on disk (used before reading a journal back)"""
+        self.queue.join()
+        
+    @staticmethod
+    def iter_records(path):
+        """Lazily read the records of a journal file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+class CheckpointStore:
+    """Latest state of each running conversation, one JSON file per session
+    
+    Only the newest checkpoint of a session matters, so save() replaces any that
+    is still queued. Files are written off the Qt thread and swapped in
+    atomically, so a crash leaves the previous checkpoint intact.
+    """
+    
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = directory
+        self.pending = {}  # session id -> checkpoint, or None to delete it
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self.writer_loop, name="checkpoints", daemon=True)
+        self.thread.start()
+        
+    def path(self, session_id):
+        return os.path.join(self.directory, f"{session_id}.json")
+    
+    def save(self, session_id, checkpoint):
+        with self.lock:
+            self.pending[session_id] = checkpoint
+        self.wake.set()
+        
+    def remove(self, session_id):
+        """The conversation ended normally: nothing to resume"""
+        self.save(session_id, None)
+        
+    def writer_loop(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            for session_id, checkpoint in pending.items():
+                path = self.path(session_id)
+                try:
+                    if checkpoint is None:
+                        if os.path.exists(path):
+                            os.remove(path)
+                        continue
+                    os.makedirs(self.directory, exist_ok=True)
+                    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                        json.dump(checkpoint, f, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(path + ".tmp", path)
+                except Exception as e:
+                    print(f"✗ Error writing checkpoint {path}: {e}")
+                    
+    def load_all(self):
+        """Checkpoints on disk, newest first"""
+        checkpoints = []
+        if not os.path.isdir(self.directory):
+            return checkpoints
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                    checkpoints.append(json.load(f))
+            except Exception as e:
+                print(f"✗ Skipping checkpoint {name}: {e}")
+        return sorted(checkpoints, key=lambda checkpoint: checkpoint['saved'], reverse=True)
+
+
+class JournalMessages:
+    """Re-iterable view of one panel's messages in a journal file, read lazily"""
+    
+    def __init__(self, path, panel_index):
+        self.path = path
+        self.panel_index = panel_index
+        
+    def __iter__(self):
+        for record in TurnJournal.iter_records(self.path):
+            if record.get('kind') in ('sent', 'received') and record.get('panel') == self.panel_index:
+                yield {'role': 'user' if record['kind'] == 'sent' else 'assistant', 'text': record['text']}
+
+
+def journal_conversations(path):
+    """One conversation per panel of a journal file (the exporter's input format)"""
+    session = next(TurnJournal.iter_records(path), {})
+    conversations = []
+    for index, name in enumerate(session.get('models', [])):
+        config = AVAILABLE_CHATBOTS.get(name, {})
+        conversations.append({
+            'index': index,
+            'name': name,
+            'color': config.get('color', '#888'),
+            'messages': JournalMessages(path, index),
+            'raw': '',
+        })
+    return conversations
+
+
+class SessionIndex:
+    """SQLite FTS5 index of finished conversations, built from their journals
+    
+    Every response is one row of `turns`, with its session, model, panel and
+    round; the session's prompt, models and start time live in `sessions`.
+    Journals are indexed on a background thread with its own connection;
+    search() reads on the caller's thread (WAL lets both run at once).
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY, journal TEXT, started TEXT, models TEXT,
+            topology TEXT, prompt TEXT, rounds INTEGER
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS turns USING fts5(
+            text, session UNINDEXED, model UNINDEXED, panel UNINDEXED,
+            round UNINDEXED, time UNINDEXED, tokenize = 'porter unicode61'
+        );
+    """
+    
+    def __init__(self, path=SEARCH_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = self.connect()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.writer_loop, name="session-index", daemon=True)
+        self.thread.start()
+        
+    def connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL; an index can be rebuilt anyway
+        connection.executescript(self.SCHEMA)
+        return connection
+    
+    def add(self, journal_path, journal=None):
+        """Queue a finished conversation; `journal` is flushed first so the file is complete"""
+        if journal_path:
+            self.queue.put((journal_path, journal))
+            
+    def backfill(self, directory=JOURNAL_DIR, skip=()):
+        """Queue every journal on disk that is not indexed yet, except `skip` (still running)"""
+        if not os.path.isdir(directory):
+            return
+        indexed = {row[0] for row in self.connection.execute("SELECT journal FROM sessions")}
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if name.endswith(".jsonl") and path not in indexed and path not in skip:
+                self.add(path)
+                
+    def writer_loop(self):
+        connection = self.connect()
+        while True:
+            path, journal = self.queue.get()
+            try:
+                if journal:
+                    journal.flush()
+                self.index_journal(connection, path)
+            except Exception as e:
+                print(f"✗ Error indexing {path}: {e}")
+            finally:
+                self.queue.task_done()
+                
+    @staticmethod
+    def index_journal(connection, path):
+        """(Re)index one journal file in a single transaction"""
+        records = TurnJournal.iter_records(path)
+        session = next(records, None)
+        if not session or session.get('kind') != 'session':
+            return
+        rounds = {}  # panel -> responses so far
+        rows = []
+        for record in records:
+            if record.get('kind') != 'received':
+                continue
+            panel = record['panel']
+            rounds[panel] = rounds.get(panel, 0) + 1
+            rows.append((record['text'], session['session'], record['model'], panel, rounds[panel], record['time']))
+            
+        with connection:
+            connection.execute("DELETE FROM turns WHERE session = ?", (session['session'],))
+            connection.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session['session'], path, session['time'], ", ".join(session['models']), session['topology'],
+                 next((prompt for prompt in session['prompts'] if prompt.strip()), ""), max(rounds.values(), default=0))
+            )
+            connection.executemany("INSERT INTO turns VALUES (?, ?, ?, ?, ?, ?)", rows)
+            
+    @staticmethod
+    def match_query(text):
+        """Plain words become an AND of quoted terms, so punctuation can't break the FTS syntax"""
+        return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+    
+    def search(self, text, model=None, limit=50):
+        """Best-matching responses (bm25), each a dict with its session's metadata and a
+        snippet whose matches are wrapped in \\x02 ... \\x03"""
+        if not text.strip():
+            return []
+        sql = """
+            SELECT turns.session, turns.model, turns.round, turns.time,
+                   snippet(turns, 0, char(2), char(3), '…', 24), bm25(turns),
+                   sessions.prompt, sessions.models, sessions.journal
+            FROM turns JOIN sessions ON sessions.id = turns.session
+            WHERE turns MATCH ?{model}
+            ORDER BY bm25(turns) LIMIT ?
+        """.format(model=" AND turns.model = ?" if model else "")
+        params = [self.match_query(text)] + ([model] if model else []) + [limit]
+        keys = ('session', 'model', 'round', 'time', 'snippet', 'score', 'prompt', 'models', 'journal')
+        return [dict(zip(keys, row)) for row in self.connection.execute(sql, params)]
+    
+    def models(self):
+        names = set()
+        for (models,) in self.connection.execute("SELECT DISTINCT models FROM sessions"):
+            names.update(models.split(", "))
+        return sorted(names)
+    
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+# Document head of HTML exports (format with title=...)
+HTML_EXPORT_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>AI Brainstorm Conversation - {title}</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #1a1a2e;
+            color: #eee;
+        }}
+        h1 {{
+            text-align: center;
+            color: #fff;
+            border-bottom: 2px solid #333;
+            padding-bottom: 20px;
+        }}
+        .panels {{
+            display: flex;
+            gap: 20px;
+        }}
+        .panel {{
+            flex: 1;
+            background: #16213e;
+            border-radius: 10px;
+            padding: 20px;
+        }}
+        .panel-header {{
+            font-size: 18px;
+            font-weight: bold;
+            margin-bottom: 15px;
+            padding-bottom: 10px;
+            border-bottom: 2px solid;
+        }}
+        .message {{
+            margin: 10px 0;
+            padding: 12px;
+            border-radius: 8px;
+            background: #1a1a2e;
+        }}
+        .message.user {{
+            background: #2d4a7c;
+            border-left: 3px solid #5b8dee;
+        }}
+        .message.assistant {{
+            background: #1e3a3a;
+            border-left: 3px solid #4ecdc4;
+        }}
+        .role {{
+            font-size: 11px;
+            text-transform: uppercase;
+            color: #888;
+            margin-bottom: 5px;
+        }}
+        .text {{
+            white-space: pre-wrap;
+            line-height: 1.5;
+        }}
+        .timestamp {{
+            text-align: center;
+            color: #666;
+            margin-top: 30px;
+            font-size: 12px;
+        }}
+    </style>
+</head>
+<body>
+    <h1>🧠 AI Brainstorm Conversation</h1>
+    <div class="panels">
+"""
+
+
+def iter_html(conversations, title):
+    """Render conversations as HTML, one chunk at a time"""
+    yield HTML_EXPORT_HEAD.format(title=html.escape(title))
+    for conv in conversations:
+        color = html.escape(conv['color'], quote=True)
+        yield f"""
+        <div class="panel">
+            <div class="panel-header" style="border-color: {color}; color: {color};">
+                {html.escape(conv['name'])}
+            </div>
+"""
+        empty = True
+        for msg in conv['messages']:
+            empty = False
+            role_class = msg['role'] if msg['role'] in ['user', 'assistant'] else 'message'
+            yield f"""
+            <div class="message {role_class}">
+                <div class="role">{html.escape(msg['role'].upper())}</div>
+                <div class="text">{html.escape(msg['text'])}</div>
+            </div>
+"""
+        if empty:
+            text = html.escape(conv['raw']) if conv['raw'] else "(No conversation content extracted)"
+            yield f"""
+            <div class="message">
+                <div class="text">{text}</div>
+            </div>
+"""
+        yield """
+        </div>
+"""
+    yield f"""
+    </div>
+    <div class="timestamp">Saved: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</div>
+</body>
+</html>
+"""
+
+
+def iter_markdown(conversations, title):
+    """Render conversations as Markdown, one chunk at a time"""
+    yield f"# 🧠 AI Brainstorm Conversation - {title}\n"
+    for conv in conversations:
+        yield f"\n## {conv['name']}\n"
+        empty = True
+        for msg in conv['messages']:
+            empty = False
+            yield f"\n**{msg['role'].upper()}**\n\n{msg['text']}\n"
+        if empty:
+            yield f"\n{conv['raw'] or '(No conversation content extracted)'}\n"
+    yield f"\n---\n\nSaved: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+
+
+def iter_jsonl(conversations, title):
+    """Render conversations as JSON Lines, one message per line"""
+    for conv in conversations:
+        for msg in conv['messages']:
+            yield json.dumps({
+                'panel': conv['index'], 'model': conv['name'], 'role': msg['role'], 'text': msg['text'],
+            }, ensure_ascii=False) + "\n"
+        if conv['raw']:
+            yield json.dumps({
+                'panel': conv['index'], 'model': conv['name'], 'role': 'content', 'text': conv['raw'],
+            }, ensure_ascii=False) + "\n"
+
+
+# Export format -> (file extension, chunk renderer)
+EXPORT_FORMATS = {
+    "html": (".html", iter_html),
+    "md": (".md", iter_markdown),
+    "jsonl": (".jsonl", iter_jsonl),
+}
+
+
+def export_conversations(conversations, path, fmt, title):
+    """Stream a rendered export straight to disk; memory stays flat in transcript size"""
+    renderer = EXPORT_FORMATS[fmt][1]
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in renderer(conversations, title):
+            f.write(chunk)
+    return path
+
+
+def example_prompts(example):
+    """Initial prompts of an example, one per panel ('prompts' list or legacy two-party keys)"""
+    if example.get('prompts'):
+        return list(example['prompts'])
+    return [example.get('chatgpt', ''), example.get('deepseek', '')]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+METRICS_CSV_FIELDS = [
+    'time', 'model', 'panel', 'chars_sent', 'chars_received', 'polls', 'checks',
+    'first_change_s', 'generation_s', 'detect_s', 'forward_s', 'turn_s',
+]
+
+
+class TurnMetrics:
+    """Turn timelines built from ChatBridge.turn_event, exported as Prometheus text and a daily CSV
+    
+    A turn runs sent → first_change → check... → complete → forwarded on one panel.
+    Completed turns feed per-model counters and a window of recent latencies.
+    """
+    
+    def __init__(self, directory=METRICS_DIR):
+        self.directory = directory
+        self.lock = threading.Lock()  # observe() runs on the Qt thread, render() on the HTTP thread
+        self.timelines = {}  # (session, panel_index) -> in-flight turn
+        self.totals = {}  # model -> {'turns', 'chars', 'generation_s', 'polls'}
+        self.recent = deque(maxlen=SETTINGS['metrics_window'])  # Completed turn rows
+        self.selectors = {}  # (session, panel_index) -> (model, page selector cache counts)
+        self.collectors = []  # Functions returning extra Prometheus lines
+        self.compaction = {}  # model -> [messages compacted, chars before, chars after]
+        self.convergence = {}  # (model, verdict, action) -> count
+        self.server = None
+        
+    def observe(self, panel_index, event, details, session=None):
+        """Slot for ChatBridge.turn_event; `session` separates bridges sharing one TurnMetrics"""
+        now = time.time()
+        key = (session, panel_index)
+        with self.lock:
+            if event == 'selectors':
+                self.selectors[key] = (details.get('model', ''), details['stats'])
+                return
+            if event == 'converged':
+                reason = (details.get('model', ''), details['verdict'], details['action'])
+                self.convergence[reason] = self.convergence.get(reason, 0) + 1
+                if details['action'] == "branch":
+                    return
+            if event == 'compacted':
+                counts = self.compaction.setdefault(details.get('model', ''), [0, 0, 0])
+                counts[0] += 1
+                counts[1] += details['chars']
+                counts[2] += details['after']
+                return
+            turn = self.timelines.get(key)
+            if event == 'sent' or turn is None:
+                # Panels that start without a prompt have no 'sent'; their turn starts here
+                turn = self.timelines[key] = {
+                    'model': details.get('model', ''),
+                    'sent': now,
+                    'chars_sent': details.get('chars', 0) if event == 'sent' else 0,
+                    'checks': 0,
+                }
+            if event == 'first_change':
+                turn.setdefault('first_change', now)
+            elif event == 'check':
+                turn['checks'] += 1
+            elif event == 'complete':
+                turn['complete'] = now
+                turn['idle_ms'] = details.get('idle_ms', 0)
+                turn['via'] = details.get('via', '')
+            elif event in ('forwarded', 'converged'):
+                # A converged turn that stops the conversation is never forwarded
+                del self.timelines[key]
+                row = self.finish_turn(panel_index, turn, now, details)
+            else:
+                return
+        if event in ('forwarded', 'converged'):
+            self.write_csv(row)
+            
+    def finish_turn(self, panel_index, turn, now, details):
+        """Turn a finished timeline into a CSV row and update the counters"""
+        first_change = turn.get('first_change', turn['sent'])
+        complete = turn.get('complete', now)
+        row = {
+            'time': datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+            'model': turn['model'],
+            'panel': panel_index,
+            'chars_sent': turn['chars_sent'],
+            'chars_received': details.get('chars', 0),
+            'polls': details.get('polls', 0),
+            'checks': turn['checks'],
+            'first_change_s': round(first_change - turn['sent'], 3),
+            'generation_s': round(complete - first_change, 3),
+            'detect_s': round(turn.get('idle_ms', 0) / 1000, 3),
+            'forward_s': round(now - complete, 3),
+            'turn_s': round(now - turn['sent'], 3),
+            'ts': now,
+        }
+        totals = self.totals.setdefault(turn['model'], {'turns': 0, 'chars': 0, 'generation_s': 0.0, 'polls': 0, 'via': {}})
+        totals['via'][turn.get('via', '')] = totals['via'].get(turn.get('via', ''), 0) + 1
+        totals['turns'] += 1
+        totals['chars'] += row['chars_received']
+        totals['generation_s'] += row['generation_s']
+        totals['polls'] += row['polls']
+        self.recent.append(row)
+        return row
+        
+    def write_csv(self, row):
+        """Append to today's CSV and drop files older than metrics_keep_days"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"turns_{datetime.now().strftime('%Y%m%d')}.csv")
+            is_new = not os.path.exists(path)
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=METRICS_CSV_FIELDS, extrasaction='ignore')
+                if is_new:
+                    writer.writeheader()
+                writer.writerow(row)
+            if is_new:
+                files = sorted(name for name in os.listdir(self.directory)
+                               if name.startswith("turns_") and name.endswith(".csv"))
+                for name in files[:-SETTINGS['metrics_keep_days']]:
+                    os.remove(os.path.join(self.directory, name))
+        except Exception as e:
+            print(f"✗ Error writing turn metrics: {e}")
+            
+    def snapshot(self):
+        """Throughput and latency figures over the recent window"""
+        with self.lock:
+            rows = list(self.recent)
+            totals = {model: dict(values, via=dict(values['via'])) for model, values in self.totals.items()}
+            selectors = list(self.selectors.values())
+            compaction = {model: list(counts) for model, counts in self.compaction.items()}
+            convergence = dict(self.convergence)
+        hour_ago = time.time() - 3600
+        models = {}
+        for model, values in totals.items():
+            model_rows = [row for row in rows if row['model'] == model]
+            turn_latency = [row['turn_s'] for row in model_rows]
+            detect_latency = [row['detect_s'] for row in model_rows]
+            models[model] = dict(
+                values,
+                chars_per_second=values['chars'] / values['generation_s'] if values['generation_s'] else 0,
+                turn_p50=percentile(turn_latency, 50),
+                turn_p95=percentile(turn_latency, 95),
+                detect_p50=percentile(detect_latency, 50),
+                detect_p95=percentile(detect_latency, 95),
+                window=len(model_rows),
+            )
+        lookups = {}  # (model, role, result) -> count, summed over panels
+        for model, stats in selectors:
+            for role, entry in stats.items():
+                for result in ('hits', 'misses', 'reprobes', 'empty'):
+                    key = (model, role, result)
+                    lookups[key] = lookups.get(key, 0) + entry.get(result, 0)
+        return {
+            'turns_last_hour': sum(1 for row in rows if row['ts'] >= hour_ago),
+            'models': models,
+            'selector_lookups': lookups,
+            'compaction': compaction,
+            'convergence': convergence,
+        }
+        
+    def summary_lines(self):
+        snapshot = self.snapshot()
+        lines = [f"[Metrics] {snapshot['turns_last_hour']} turns in the last hour"]
+        for model, m in sorted(snapshot['models'].items()):
+            lines.append(
+                f"[Metrics] {model}: {m['turns']} turns "
+                f"({', '.join(f'{count} {via}' for via, count in sorted(m['via'].items()))}), "
+                f"{m['chars_per_second']:.0f} chars/s, "
+                f"turn p50/p95 {m['turn_p50']:.1f}s/{m['turn_p95']:.1f}s, "
+                f"detect p50/p95 {m['detect_p50']:.2f}s/{m['detect_p95']:.2f}s"
+            )
+        for model, (count, before, after) in sorted(snapshot['compaction'].items()):
+            lines.append(f"[Metrics] {model}: {count} responses compacted, {before} → {after} chars ({after / before:.0%})")
+        for (model, verdict, action), count in sorted(snapshot['convergence'].items()):
+            lines.append(f"[Metrics] {model}: {verdict} detected {count} time(s), action {action}")
+        lookups = snapshot['selector_lookups']
+        for model, role in sorted({(model, role) for model, role, _ in lookups}):
+            counts = {result: lookups[(model, role, result)] for result in ('hits', 'misses', 'reprobes', 'empty')}
+            lines.append(
+                f"[Metrics] {model} {role} selector: {counts['hits']} hits, {counts['misses']} misses, "
+                f"{counts['reprobes']} re-probes, {counts['empty']} unmatched"
+            )
+        return lines
+        
+    def render(self):
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        models = sorted(snapshot['models'].items())
+        lines = [
+            "# HELP brainstorm_turns_last_hour Turns completed in the last hour (within the metrics window).",
+            "# TYPE brainstorm_turns_last_hour gauge",
+            f"brainstorm_turns_last_hour {snapshot['turns_last_hour']}",
+        ]
+        
+        def family(name, kind, help_text, key):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for model, m in models:
+                lines.append(f'{name}{{model="{model}"}} {m[key]}')
+                
+        family("brainstorm_turns_total", "counter", "Completed turns.", 'turns')
+        family("brainstorm_response_chars_total", "counter", "Characters received in completed turns.", 'chars')
+        family("brainstorm_generation_seconds_total", "counter", "Time from first text change to completion.", 'generation_s')
+        family("brainstorm_polls_total", "counter", "Page probes issued while waiting for responses.", 'polls')
+        family("brainstorm_chars_per_second", "gauge", "Streaming throughput per model.", 'chars_per_second')
+        
+        lines.append("# HELP brainstorm_completions_total Completed turns by detection signal (site, observer, stability).")
+        lines.append("# TYPE brainstorm_completions_total counter")
+        for model, m in models:
+            for via, count in sorted(m['via'].items()):
+                lines.append(f'brainstorm_completions_total{{model="{model}",via="{via}"}} {count}')
+        
+        for name, help_text, prefix in (
+            ("brainstorm_turn_latency_seconds", "Time from sending a prompt to forwarding the reply.", 'turn'),
+            ("brainstorm_detect_latency_seconds", "Time from the last text change to completion detection.", 'detect'),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for model, m in models:
+                lines.append(f'{name}{{model="{model}",quantile="0.5"}} {m[prefix + "_p50"]}')
+                lines.append(f'{name}{{model="{model}",quantile="0.95"}} {m[prefix + "_p95"]}')
+                lines.append(f'{name}_count{{model="{model}"}} {m["window"]}')
+                
+        lines.append("# HELP brainstorm_selector_lookups_total Selector cache lookups in the pages (reset on reload).")
+        lines.append("# TYPE brainstorm_selector_lookups_total counter")
+        for (model, role, result), count in sorted(snapshot['selector_lookups'].items()):
+            lines.append(f'brainstorm_selector_lookups_total{{model="{model}",role="{role}",result="{result}"}} {count}')
+        for name, help_text, column in (
+            ("brainstorm_compacted_messages_total", "Forwarded responses shortened by compaction.", 0),
+            ("brainstorm_compaction_chars_before_total", "Characters of compacted responses before compaction.", 1),
+            ("brainstorm_compaction_chars_after_total", "Characters of compacted responses after compaction.", 2),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for model, counts in sorted(snapshot['compaction'].items()):
+                lines.append(f'{name}{{model="{model}"}} {counts[column]}')
+        lines.append("# HELP brainstorm_convergence_total Conversations found looping or converged, by action taken.")
+        lines.append("# TYPE brainstorm_convergence_total counter")
+        for (model, verdict, action), count in sorted(snapshot['convergence'].items()):
+            lines.append(f'brainstorm_convergence_total{{model="{model}",verdict="{verdict}",action="{action}"}} {count}')
+        for collector in self.collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+        
+    def add_collector(self, collector):
+        """Append another component's Prometheus lines to /metrics"""
+        self.collectors.append(collector)
+        
+    def serve(self, port):
+        """Expose /metrics on localhost from a daemon thread (port 0 disables it)"""
+        if not port or self.server:
+            return
+        try:
+            self.server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        except OSError as e:
+            print(f"✗ Metrics endpoint unavailable on port {port}: {e}")
+            return
+        self.server.metrics = self
+        threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True).start()
+        print(f"✓ Metrics at http://127.0.0.1:{port}/metrics")
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics for a TurnMetrics attached to the server"""
+    
+    def do_GET(self):
+        if urlparse(self.path).path != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format, *args):
+        pass
+
+
+class PanelState:
+    """Compact per-panel conversation state"""
+    __slots__ = (
+        'waiting', 'expecting_new_response', 'fetching_text', 'initial_prompt',
+        'last_signature', 'stable_count', 'last_change_time',
+        'last_response_count', 'last_response_text', 'last_response_signature', 'poller', 'polls',
+        'outbox', 'closing', 'pending', 'sent_count',
+    )
+    
+    def __init__(self, poller):
+        self.waiting = False  # Waiting for this panel to answer
+        self.expecting_new_response = False  # True after we send a message
+        self.fetching_text = False  # True while the full text of a settled turn is being read
+        self.initial_prompt = ""  # Sent along with the first message this panel receives
+        self.last_signature = None  # (length, hash) for stability check
+        self.stable_count = 0  # Count how many times text is stable
+        self.last_change_time = 0  # Monotonic time the tracked text last changed
+        self.last_response_count = 0
+        self.last_response_text = ""
+        self.last_response_signature = None  # (length, hash) of the last forwarded response
+        self.poller = poller
+        self.polls = 0  # Probes issued for the current turn
+        self.outbox = deque()  # Remaining parts of a multi-part message
+        self.closing = False  # Waiting for this panel's closing summary
+        self.pending = ""  # Message this panel is (about to be) answering, re-sent on resume
+        self.sent_count = None  # Responses in the thread when the message went out (None until probed)
+
+
+class RoundRobinTopology:
+    """Panels take turns in order: 1 → 2 → ... → N → 1"""
+    label = "Round-robin"
+    
+    def first_speakers(self, n):
+        return [0]
+    
+    def route(self, index, text, n):
+        """Return {target panel: [(source panel, text), ...]} for a completed response"""
+        return {(index + 1) % n: [(index, text)]}
+    
+    def next_speakers(self, index, n):
+        """Panels that route() will send to once panel `index` completes"""
+        return [(index + 1) % n]
+
+
+class BroadcastTopology:
+    """All panels answer every round; each then receives everyone else's answer"""
+    label = "All-to-all"
+    
+    def __init__(self):
+        self.round_responses = {}
+        
+    def first_speakers(self, n):
+        return list(range(n))
+    
+    def route(self, index, text, n):
+        self.round_responses[index] = text
+        if len(self.round_responses) < n:
+            return {}
+        responses, self.round_responses = self.round_responses, {}
+        return {
+            target: [(i, t) for i, t in sorted(responses.items()) if i != target]
+            for target in range(n)
+        }
+    
+    def next_speakers(self, index, n):
+        missing = set(range(n)) - set(self.round_responses) - {index}
+        return [] if missing else list(range(n))
+
+
+class HubSpokeTopology:
+    """Panel 1 moderates: it talks to every other panel, which only answer the moderator"""
+    label = "Moderator"
+    
+    def __init__(self):
+        self.spoke_responses = {}
+        
+    def first_speakers(self, n):
+        return [0]
+    
+    def route(self, index, text, n):
+        if index == 0:
+            self.spoke_responses = {}
+            return {spoke: [(0, text)] for spoke in range(1, n)}
+        self.spoke_responses[index] = text
+        if len(self.spoke_responses) < n - 1:
+            return {}
+        return {0: sorted(self.spoke_responses.items())}
+    
+    def next_speakers(self, index, n):
+        if index == 0:
+            return list(range(1, n))
+        missing = set(range(1, n)) - set(self.spoke_responses) - {index}
+        return [] if missing else [0]
+
+
+TOPOLOGIES = {
+    "round_robin": RoundRobinTopology,
+    "broadcast": BroadcastTopology,
+    "hub": HubSpokeTopology,
+}
+
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can could do does for from had has have he her his i if in into is it its
+just me more most my no not of on or our she so than that the their them then there these they this to
+too us was we were what when which who will with would you your
+""".split())
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+WORD = re.compile(r"[a-z0-9']+")
+
+
+class ContextCompactor:
+    """Local, offline shortening of forwarded responses
+    
+    Sentences the conversation has already carried (one model quoting the other)
+    and markdown block quotes are dropped first. If the text is still over the
+    budget, an extractive summary keeps the highest-scoring sentences (word
+    frequency, favouring paragraph openers) in their original order.
+    """
+    
+    def __init__(self, options=None):
+        self.options = options if options is not None else SETTINGS['compaction']
+        self.seen = deque(maxlen=self.options['history_sentences'])  # Normalised sentences, oldest first
+        self.seen_set = set()
+        self.ratios = []  # after / before for each compacted message
+        
+    def reset(self):
+        self.seen.clear()
+        self.seen_set.clear()
+        self.ratios = []
+        
+    @staticmethod
+    def normalise(sentence):
+        return " ".join(WORD.findall(sentence.lower()))
+    
+    def remember(self, text):
+        """Add a message's sentences to the history used to spot repetition"""
+        for paragraph in text.split("\n"):
+            for sentence in SENTENCE_SPLIT.split(paragraph):
+                key = self.normalise(sentence)
+                if len(key.split()) < self.options['min_repeat_words'] or key in self.seen_set:
+                    continue
+                if len(self.seen) == self.seen.maxlen:
+                    self.seen_set.discard(self.seen[0])
+                self.seen.append(key)
+                self.seen_set.add(key)
+                
+    def strip_repetition(self, text):
+        """Drop block quotes and sentences already seen earlier or in this message"""
+        paragraphs, local = [], set()
+        for paragraph in text.split("\n"):
+            if paragraph.lstrip().startswith(">"):
+                continue  # Block quote
+            kept = []
+            for sentence in SENTENCE_SPLIT.split(paragraph):
+                key = self.normalise(sentence)
+                if len(key.split()) >= self.options['min_repeat_words']:
+                    if key in self.seen_set or key in local:
+                        continue
+                    local.add(key)
+                kept.append(sentence)
+            if kept or not paragraph.strip():
+                paragraphs.append(" ".join(kept))
+        return re.sub(r'\n{3,}', "\n\n", "\n".join(paragraphs)).strip()
+    
+    def summarise(self, text, budget):
+        """Extractive summary of at most `budget` characters"""
+        sentences = []  # (paragraph index, position in paragraph, sentence)
+        for p, paragraph in enumerate(part for part in text.split("\n") if part.strip()):
+            for s, sentence in enumerate(SENTENCE_SPLIT.split(paragraph.strip())):
+                sentences.append((p, s, sentence))
+                
+        frequency = {}
+        for _, _, sentence in sentences:
+            for word in WORD.findall(sentence.lower()):
+                if word not in STOPWORDS:
+                    frequency[word] = frequency.get(word, 0) + 1
+                    
+        def score(item):
+            p, s, sentence = item
+            words = [w for w in WORD.findall(sentence.lower()) if w not in STOPWORDS]
+            if not words:
+                return 0
+            return sum(frequency[w] for w in words) / len(words) ** 0.5 * (1.5 if s == 0 else 1.0)
+        
+        ranked = sorted(range(len(sentences)), key=lambda i: score(sentences[i]), reverse=True)
+        chosen, used = set(), 0
+        for i in ranked:
+            length = len(sentences[i][2]) + 2  # Room for the " " or "\n\n" joining it
+            if used + length > budget:
+                continue
+            chosen.add(i)
+            used += length
+            
+        paragraphs = {}
+        for i in sorted(chosen):
+            paragraphs.setdefault(sentences[i][0], []).append(sentences[i][2])
+        return "\n\n".join(" ".join(parts) for _, parts in sorted(paragraphs.items()))
+    
+    def compact(self, text):
+        """Return (text to forward, ratio); the text is unchanged while under budget"""
+        budget = self.options['budget_chars']
+        if len(text) <= budget:
+            self.remember(text)
+            return text, 1.0
+        
+        # The footer counts against the budget too
+        budget -= len(COMPACTED_TEMPLATE.format(before=len(text), after=budget, message=""))
+        compacted = self.strip_repetition(text)
+        if len(compacted) > budget:
+            compacted = self.summarise(compacted, budget)
+        self.remember(text)
+        if not compacted or len(compacted) >= len(text):
+            return text, 1.0
+        ratio = len(compacted) / len(text)
+        self.ratios.append(ratio)
+        return COMPACTED_TEMPLATE.format(before=len(text), after=len(compacted), message=compacted), ratio
+
+
+COMPACTED_TEMPLATE = """{message}
+
+(Condensed locally from {before} to {after} characters.)"""
+
+
+class ConvergenceDetector:
+    """Near-duplicate detection over the last few completed responses
+    
+    Each response becomes a MinHash signature of its word shingles, so comparing
+    a new response with the window costs `num_hashes` per pair whatever the
+    lengths. observe() reports "loop" when a party repeats one of its own recent
+    responses and "converged" when consecutive responses from different parties
+    have stayed similar for `patience` turns.
+    """
+    PRIME = (1 << 61) - 1
+    
+    def __init__(self, options=None):
+        self.options = options if options is not None else SETTINGS['convergence']
+        rng = random.Random(0)  # Same permutations every run, so similarities are comparable
+        self.permutations = [
+            (rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME)) for _ in range(self.options['num_hashes'])
+        ]
+        self.history = deque(maxlen=self.options['window'])  # (panel_index, signature)
+        self.streak = 0
+        self.branches = 0
+        
+    def reset(self):
+        self.history.clear()
+        self.streak = 0
+        self.branches = 0
+        
+    def signature(self, text):
+        words = WORD.findall(text.lower())
+        size = self.options['shingle_words']
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'big') for s in shingles]
+        return [min((a * h + b) % self.PRIME for h in hashes) for a, b in self.permutations]
+    
+    @staticmethod
+    def similarity(first, second):
+        """Estimated Jaccard similarity of the two responses' shingle sets"""
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+    
+    def observe(self, panel_index, text):
+        """Add a completed response; returns (verdict, similarity), verdict being "loop", "converged" or None"""
+        signature = self.signature(text)
+        own = [self.similarity(signature, other) for index, other in self.history if index == panel_index]
+        previous = next((other for index, other in reversed(self.history) if index != panel_index), None)
+        self.history.append((panel_index, signature))
+        
+        if own and max(own) >= self.options['loop_threshold']:
+            return "loop", max(own)
+        if previous is None:
+            return None, 0.0
+        agreement = self.similarity(signature, previous)
+        self.streak = self.streak + 1 if agreement >= self.options['agree_threshold'] else 0
+        if self.streak >= self.options['patience']:
+            return "converged", agreement
+        return None, agreement
+    
+    def should_branch(self):
+        """Whether to steer the conversation instead of stopping it; counts the branch"""
+        if self.options['action'] != "branch" or self.branches >= self.options['max_branches']:
+            return False
+        self.branches += 1
+        self.streak = 0
+        return True
+
+
+class SessionBudget:
+    """Rounds, wall-clock time and characters a conversation may use
+    
+    The bridge records every message sent and response received and checks
+    exhausted() after each completed turn. A limit of 0 is unlimited.
+    """
+    
+    def __init__(self, options=None):
+        self.options = options if options is not None else SETTINGS['budget']
+        self.parties = 1
+        self.started = time.monotonic()
+        self.responses = 0
+        self.chars = 0
+        
+    def start(self, parties):
+        self.parties = max(parties, 1)
+        self.started = time.monotonic()
+        self.responses = 0
+        self.chars = 0
+        
+    @property
+    def limited(self):
+        return any(self.options[key] for key in ('max_rounds', 'max_seconds', 'max_chars'))
+    
+    @property
+    def rounds(self):
+        return self.responses // self.parties
+    
+    def elapsed(self):
+        return time.monotonic() - self.started
+    
+    def add_sent(self, chars):
+        self.chars += chars
+        
+    def add_received(self, chars, complete=True):
+        """Count a reply; acknowledgements of a message part are not complete responses"""
+        self.chars += chars
+        if complete:
+            self.responses += 1
+        
+    def exhausted(self):
+        """Name of the first limit reached ("rounds", "time", "characters"), or None"""
+        if self.options['max_rounds'] and self.rounds >= self.options['max_rounds']:
+            return "rounds"
+        if self.options['max_seconds'] and self.elapsed() >= self.options['max_seconds']:
+            return "time"
+        if self.options['max_chars'] and self.chars >= self.options['max_chars']:
+            return "characters"
+        return None
+    
+    def describe(self):
+        """Remaining budget for the control panel, empty when unlimited"""
+        parts = []
+        if self.options['max_rounds']:
+            parts.append(f"round {min(self.rounds + 1, self.options['max_rounds'])}/{self.options['max_rounds']}")
+        if self.options['max_seconds']:
+            left = max(int(self.options['max_seconds'] - self.elapsed()), 0)
+            parts.append(f"{left // 60}:{left % 60:02d} left")
+        if self.options['max_chars']:
+            left = max(self.options['max_chars'] - self.chars, 0)
+            parts.append(f"{left / 1000:.1f}k chars left")
+        return " · ".join(parts)
+
+
+class ChatBridge(QObject):
+    """Runs the G2G-style conversation between any number of chatbot panels"""
+    message_received = pyqtSignal(int, str)
+    turn_completed = pyqtSignal(int, str)  # panel_index, full response text
+    turn_event = pyqtSignal(int, str, dict)  # panel_index, event name, details (turn timeline)
+    status_update = pyqtSignal(str)
+    conversation_ended = pyqtSignal(str)  # Reason the bridge stopped on its own ("loop", "converged", "budget")
+    budget_update = pyqtSignal(str)  # Remaining session budget, empty when unlimited
+    session_finished = pyqtSignal(str)  # Journal of a conversation that has stopped
+    
+    def __init__(self):
+        super().__init__()
+        self.is_running = False
+        self.panels = []
+        self.connected_panels = []  # Panels whose observer signal is wired to us
+        self.states = []  # One PanelState per panel, rebuilt on start
+        self.topology = None
+        self.stability = StabilityModel()
+        self.get_chatbots = None  # Function to get current chatbot configs
+        self.journal = None  # Optional TurnJournal
+        self.journal_path = None  # Journal file of the current conversation
+        self.selector_empty = {}  # panel -> {role: empty lookups already reported}
+        self.lifecycle = None  # Optional PanelLifecycle
+        self.compactor = ContextCompactor() if SETTINGS['compaction']['enabled'] else None
+        self.convergence = ConvergenceDetector() if SETTINGS['convergence']['enabled'] else None
+        self.budget = SessionBudget()
+        self.winding_down = None  # Limit that ran out while the closing summaries are collected
+        self.paused = False  # Set by the SessionScheduler: no polling, new turns are held
+        self.held_turns = []  # (panel_index, message) sent while paused
+        self.checkpoints = None  # Optional CheckpointStore
+        self.session_id = None
+        self.initial_prompts = []
+        self.topology_name = None
+        self.budget_timer = QTimer(self)
+        self.budget_timer.timeout.connect(lambda: self.budget_update.emit(self.budget.describe()))
+        
+    def set_panels(self, panels):
+        self.panels = panels
+        self.connected_panels = [p for p in self.connected_panels if p in panels]
+        for panel in panels:
+            if panel not in self.connected_panels:
+                self.connected_panels.append(panel)
+                panel.notifier.response_settled.connect(
+                    lambda payload, p=panel: self.on_panel_settled(p, payload)
+                )
+    
+    def emit_event(self, panel_index, event, **details):
+        """Publish one turn timeline event (sent, first_change, check, complete, forwarded),
+        the page's selector cache counts (selectors) or a compaction/convergence notice"""
+        details['model'] = self.get_current_chatbots()[panel_index]['name']
+        if panel_index < len(self.states):
+            details['polls'] = self.states[panel_index].polls
+        self.turn_event.emit(panel_index, event, details)
+        
+    def set_lifecycle(self, lifecycle):
+        """Resume frozen/discarded panels before they are messaged"""
+        self.lifecycle = lifecycle
+        
+    def set_journal(self, journal):
+        """Record every sent and received turn in a TurnJournal"""
+        self.journal = journal
+        
+    def set_stability(self, stability):
+        """Learn the stability windows into this StabilityModel instead of the bridge's own"""
+        self.stability = stability
+        
+    def set_checkpoints(self, checkpoints):
+        """Save the conversation state to a CheckpointStore after every turn"""
+        self.checkpoints = checkpoints
+        
+    def record_turn(self, kind, panel_index, text):
+        if self.journal and self.journal_path:
+            self.journal.append(self.journal_path, {
+                'kind': kind,
+                'panel': panel_index,
+                'model': self.get_current_chatbots()[panel_index]['name'],
+                'text': text,
+            })
+    
+    def set_chatbot_getter(self, getter):
+        """Set the function to get current chatbot configurations"""
+        self.get_chatbots = getter
+    
+    def get_current_chatbots(self):
+        """Get the current chatbot configurations"""
+        if self.get_chatbots:
+            return self.get_chatbots()
+        return CHATBOTS
+    
+    def waiting_panels(self):
+        """Indices of the panels we are currently waiting on"""
+        return [i for i, state in enumerate(self.states) if state.waiting]
+    
+    def party_name(self, index):
+        """Display name of a panel, numbered when the same model appears twice"""
+        chatbots = self.get_current_chatbots()
+        name = chatbots[index]['name']
+        if sum(1 for c in chatbots if c['name'] == name) > 1:
+            return f"{name} ({index + 1})"
+        return name
+        
+    def start(self, initial_prompts, topology="round_robin", budget=None):
+        """Start the conversation - send to the topology's first speakers, wait for responses.
+        `budget` overrides the "budget" settings for this session"""
+        self.reset_states()
+        self.is_running = True
+        self.topology = TOPOLOGIES[topology]()
+        self.budget = SessionBudget(budget)
+        self.budget.start(len(self.panels))
+        self.winding_down = None
+        if self.budget.limited:
+            self.budget_timer.start(1000)
+        self.budget_update.emit(self.budget.describe())
+        if self.compactor:
+            self.compactor.reset()
+        if self.convergence:
+            self.convergence.reset()
+        if self.journal:
+            models = [config['name'] for config in self.get_current_chatbots()]
+            self.journal_path = self.journal.start_session(models, topology, initial_prompts)
+        self.session_id = (os.path.splitext(os.path.basename(self.journal_path))[0] if self.journal_path
+                           else datetime.now().strftime("session_%Y%m%d_%H%M%S_%f"))
+        self.initial_prompts = list(initial_prompts)
+        self.topology_name = topology
+        
+        n = len(self.panels)
+        self.create_states()
+        for i, state in enumerate(self.states):
+            # Prompts of later speakers are kept and sent with their first incoming message
+            state.initial_prompt = initial_prompts[i] if i < len(initial_prompts) else ""
+            
+        for i in self.topology.first_speakers(n):
+            prompt = self.states[i].initial_prompt
+            self.states[i].initial_prompt = ""
+            print(f"[Start] Sending initial prompt to {self.party_name(i)}...")
+            self.begin_turn(i, prompt)
+        self.save_checkpoint()
+            
+    def create_states(self):
+        self.states = []
+        for i in range(len(self.panels)):
+            poller = PollScheduler(self)
+            poller.tick.connect(lambda idx=i: self.check_for_responses(idx))
+            self.states.append(PanelState(poller))
+            
+    def save_checkpoint(self):
+        """Record where the conversation stands, so resume() can pick it up after a crash"""
+        if not self.checkpoints or not self.is_running:
+            return
+        self.checkpoints.save(self.session_id, {
+            'version': 1,
+            'session': self.session_id,
+            'saved': datetime.now().isoformat(timespec='seconds'),
+            'models': [config['name'] for config in self.get_current_chatbots()],
+            'topology': self.topology_name,
+            # Topologies keep their state in dicts keyed by panel index
+            'topology_state': {name: sorted(value.items()) for name, value in vars(self.topology).items()},
+            'prompts': self.initial_prompts,
+            'journal': self.journal_path,
+            'budget': {
+                'options': self.budget.options,
+                'elapsed': self.budget.elapsed(),
+                'responses': self.budget.responses,
+                'chars': self.budget.chars,
+            },
+            'winding_down': self.winding_down,
+            # Held turns are not saved: a held message is also its panel's pending one
+            'panels': [{
+                'url': panel.thread_url(),
+                'waiting': state.waiting,
+                'pending': state.pending,
+                'closing': state.closing,
+                'initial_prompt': state.initial_prompt,
+                'outbox': list(state.outbox),
+                'last_response_count': state.last_response_count,
+                'last_response_text': state.last_response_text,
+                'last_response_signature': state.last_response_signature,
+            } for panel, state in zip(self.panels, self.states)],
+        })
+        
+    def resume(self, checkpoint):
+        """Continue a checkpointed conversation; the panels already show its chat threads
+        
+        A panel that was answering is probed first: if its thread has a newer response
+        (finished while the app was down, or still streaming) it is simply awaited,
+        otherwise its message is sent again.
+        """
+        self.reset_states()
+        self.is_running = True
+        self.held_turns = []
+        self.session_id = checkpoint['session']
+        self.journal_path = checkpoint['journal']
+        self.initial_prompts = checkpoint['prompts']
+        self.topology_name = checkpoint['topology']
+        self.topology = TOPOLOGIES[self.topology_name]()
+        for name, items in checkpoint['topology_state'].items():
+            setattr(self.topology, name, {int(key): value for key, value in items})
+        self.budget = SessionBudget(checkpoint['budget']['options'])
+        self.budget.start(len(self.panels))
+        self.budget.started -= checkpoint['budget']['elapsed']
+        self.budget.responses = checkpoint['budget']['responses']
+        self.budget.chars = checkpoint['budget']['chars']
+        self.winding_down = checkpoint['winding_down']
+        if self.budget.limited:
+            self.budget_timer.start(1000)
+        self.budget_update.emit(self.budget.describe())
+        if self.compactor:
+            self.compactor.reset()
+        if self.convergence:
+            self.convergence.reset()
+            
+        self.create_states()
+        for state, saved in zip(self.states, checkpoint['panels']):
+            state.pending = saved['pending']
+            state.closing = saved['closing']
+            state.initial_prompt = saved['initial_prompt']
+            state.outbox = deque(saved['outbox'])
+            state.last_response_count = saved['last_response_count']
+            state.last_response_text = saved['last_response_text']
+            signature = saved['last_response_signature']
+            state.last_response_signature = tuple(signature) if signature else None
+            
+        print(f"[Resume] {self.session_id} from {checkpoint['saved']}")
+        for i, saved in enumerate(checkpoint['panels']):
+            if saved['waiting']:
+                self.resume_turn(i)
+            elif saved['pending']:
+                self.begin_turn(i, saved['pending'])  # Deferred or held when the checkpoint was taken
+        self.status_update.emit(f"⟲ Resumed from {checkpoint['saved']}")
+            
+    def resume_turn(self, index, attempts=10):
+        """Wait for the answer a panel was giving before the restart, or ask again"""
+        def on_probe(result):
+            if not self.is_running or index >= len(self.states):
+                return
+            state = self.states[index]
+            if not result:
+                if attempts > 1:  # The thread's page is still coming up
+                    QTimer.singleShot(1000, lambda: self.resume_turn(index, attempts - 1))
+                else:
+                    self.begin_turn(index, state.pending)
+                return
+            if json.loads(result).get('count', 0) > state.last_response_count:
+                print(f"[{self.party_name(index)}] Resuming: a newer response is in the thread, waiting for it")
+                self.send_part(index, "")
+            else:
+                print(f"[{self.party_name(index)}] Resuming: sending the last message again")
+                self.begin_turn(index, state.pending)
+        self.panels[index].run_isolated(PROBE_CALL_JS, on_probe)
+            
+    def reset_states(self):
+        for state in self.states:
+            state.poller.stop()
+            state.poller.deleteLater()
+        self.states = []
+        
+    def stop(self):
+        """Stop the conversation loop"""
+        if self.checkpoints and self.is_running:
+            self.checkpoints.remove(self.session_id)
+        if self.is_running and self.journal_path:
+            self.session_finished.emit(self.journal_path)
+        self.is_running = False
+        self.budget_timer.stop()
+        self.held_turns = []
+        self.reset_states()
+        for panel in self.panels:
+            panel.run_isolated(DISARM_CALL_JS)
+        self.status_update.emit("Stopped")
+        
+    def set_paused(self, paused):
+        """Stop polling and hold new turns while another session has the slot; resuming
+        re-checks the panels still answering and sends the held turns"""
+        if paused == self.paused:
+            return
+        self.paused = paused
+        if paused and self.is_running:
+            self.status_update.emit("⏸ Paused - other sessions are using the active slots")
+        for state in self.states:
+            if state.waiting:
+                if paused:
+                    state.poller.stop()
+                else:
+                    # The paused time is not a token gap: measure from here on
+                    state.last_change_time = time.monotonic()
+                    state.poller.start(0)  # 'settled' pushes were ignored meanwhile
+        if not paused and self.is_running:
+            held, self.held_turns = self.held_turns, []
+            for index, message in held:
+                self.begin_turn(index, message)
+        
+    def begin_turn(self, index, message):
+        """Send a message to a panel (if any) and start waiting for its answer"""
+        self.states[index].pending = message
+        if self.paused:
+            self.held_turns.append((index, message))
+            return
+        panel = self.panels[index]
+        if self.lifecycle and (panel.suspended or panel.resume_callbacks):
+            states = self.states
+            self.lifecycle.resume(
+                panel, lambda: self.is_running and self.states is states and self.begin_turn(index, message)
+            )
+            return
+        state = self.states[index]
+        
+        # Longer than the site accepts: send in parts, each acknowledged by a reply
+        parts = split_message(message, self.get_current_chatbots()[index].get('max_prompt_chars', 0))
+        state.outbox = deque(parts[1:])
+        self.send_part(index, parts[0])
+        
+    def send_part(self, index, message):
+        """Send (part of) a message and wait for the reply"""
+        state = self.states[index]
+        state.polls = 0
+        
+        # Arm the observer before sending so the new response is measured against the old page
+        self.arm_observer(index)
+        if message.strip():
+            # Probed before the send, so a finished reply already in the thread is never taken as the answer
+            state.sent_count = None
+            self.panels[index].run_isolated(
+                PROBE_CALL_JS, lambda result: self.record_sent_count(state, result)
+            )
+            self.send_message(index, message)
+            self.budget.add_sent(len(message))
+        else:
+            state.sent_count = state.last_response_count  # Resuming: an answer already in the thread counts
+            
+        state.waiting = True
+        state.expecting_new_response = True
+        state.stable_count = 0
+        state.last_signature = None
+        self.status_update.emit(f"⏳ Waiting for {self.party_name(index)} to respond...")
+        
+        # Start adaptive polling after a short delay.
+        # In observer mode this polling is only the fallback for a missed 'settled' push.
+        state.poller.start(SETTINGS['poll_start_delay_ms'])
+        
+    def record_sent_count(self, state, result):
+        state.sent_count = json.loads(result).get('count', 0) if result else 0
+        
+    def arm_observer(self, index):
+        """Arm the in-page observer so the panel pushes 'settled' for its next response"""
+        if SETTINGS['detection_mode'] != 'observer' or index >= len(self.panels):
+            return
+        
+        # Sites without a done marker pause mid-answer: wait at least the model's learned window
+        window_ms = self.stability.window_ms(self.get_current_chatbots()[index]['name'])
+        quiet_ms = int(max(SETTINGS['observer_quiet_ms'], window_ms))
+        self.panels[index].run_isolated(f"window.__argue && window.__argue.arm({quiet_ms})")
+        
+    def on_panel_settled(self, panel, payload):
+        """Observer push: the panel's last response stopped changing"""
+        if not self.is_running or panel not in self.panels:
+            return
+        panel_index = self.panels.index(panel)
+        if self.paused or panel_index >= len(self.states) or not self.states[panel_index].waiting:
+            return
+        
+        print(f"[{self.party_name(panel_index)}] Observer: response settled {payload}")
+        self.check_panel_response(panel_index, settled=True)
+        
+    def check_for_responses(self, index):
+        """Poll one panel we're waiting for"""
+        if not self.is_running or self.paused or index >= len(self.states) or not self.states[index].waiting:
+            return
+            
+        self.check_panel_response(index)
+        self.states[index].poller.schedule_next()
+            
+    def check_panel_response(self, index, settled=False):
+        """Check if a panel has a new complete response"""
+        if index >= len(self.panels):
+            return
+        if index < len(self.states):
+            self.states[index].polls += 1
+            
+        self.panels[index].run_isolated(
+            PROBE_CALL_JS, lambda result: self.handle_response_check(index, result, settled)
+        )
+        
+    def handle_response_check(self, panel_index, result, settled=False):
+        """Handle the result of checking for a response"""
+        if not self.is_running or not result or panel_index >= len(self.states):
+            return
+        state = self.states[panel_index]
+        if not state.waiting or state.fetching_text:
+            return  # Stale check from before the turn moved on
+            
+        try:
+            data = json.loads(result)
+            
+            # The probe only ships a length and rolling hash; the full text is
+            # fetched once, when the turn settles
+            count = data.get('count', 0)
+            length = data.get('length', 0)
+            # The site's own done marker only counts for a response newer than the message
+            site_done = data.get('done') is True and state.sent_count is not None and count > state.sent_count
+            signature = (length, data.get('hash', ''))
+            name = self.party_name(panel_index)
+            
+            # Simple text stability approach - ignore unreliable streaming detection
+            if count > 0 and length:
+                # When expecting a new response, wait for text to change from recorded
+                if state.expecting_new_response:
+                    text_changed = signature != state.last_response_signature
+                    if text_changed:
+                        print(f"[{name}] New response detected! Starting stability tracking...")
+                        self.emit_event(panel_index, 'first_change', chars=length)
+                        state.expecting_new_response = False
+                        state.stable_count = 0
+                        state.last_signature = signature
+                        state.last_change_time = time.monotonic()
+                        state.poller.note_activity()
+                    else:
+                        print(f"[{name}] Waiting for new response... (current len: {length})")
+                        self.status_update.emit(f"⏳ Waiting for {name} to start responding...")
+                        state.poller.note_idle()
+                        return
+                
+                # Track text stability (ignore streaming detection - too unreliable)
+                now = time.monotonic()
+                if signature == state.last_signature:
+                    state.stable_count += 1
+                    state.poller.note_idle()
+                else:
+                    # Text grew: the time since the previous growth is one token-gap sample
+                    self.stability.record_gap(self.get_current_chatbots()[panel_index]['name'],
+                                              (now - state.last_change_time) * 1000)
+                    state.stable_count = 0
+                    state.last_signature = signature
+                    state.last_change_time = now
+                    state.poller.note_activity()
+                
+                # Complete as soon as the site adapter's done signal fires, when the in-page
+                # observer reported it settled, or once the text has been unchanged for this
+                # model's learned stability window
+                window_ms = self.stability.window_ms(self.get_current_chatbots()[panel_index]['name'])
+                idle_ms = (now - state.last_change_time) * 1000
+                if site_done:
+                    via = 'site'
+                elif settled:
+                    via = 'observer'
+                elif state.stable_count > 0 and idle_ms >= window_ms:
+                    via = 'stability'
+                else:
+                    via = None
+                is_complete = via is not None
+                    
+                print(f"[{name}] Responses: {count}, Stable: {idle_ms / 1000:.1f}s/{window_ms / 1000:.1f}s, Len: {length}")
+                self.emit_event(panel_index, 'check', chars=length, stable=state.stable_count,
+                                idle_ms=round(idle_ms), window_ms=round(window_ms), settled=settled)
+                
+                # Update status
+                if state.stable_count > 0 and not is_complete:
+                    self.status_update.emit(f"⏳ {name} responding... verifying ({idle_ms / 1000:.1f}s/{window_ms / 1000:.1f}s)")
+                else:
+                    self.status_update.emit(f"⏳ {name} is generating... ({length} chars)")
+                
+                # Fetch the full text once and forward it
+                if is_complete:
+                    print(f"[{name}] ✓ RESPONSE COMPLETE ({via})! Fetching full text...")
+                    self.emit_event(panel_index, 'complete', chars=length, settled=settled,
+                                    idle_ms=round(idle_ms), via=via)
+                    if self.lifecycle:
+                        # Wake the next speakers while the full text is being fetched
+                        self.lifecycle.prepare([
+                            self.panels[i] for i in self.topology.next_speakers(panel_index, len(self.states))
+                        ])
+                    state.fetching_text = True
+                    self.panels[panel_index].run_isolated(
+                        TEXT_CALL_JS,
+                        lambda text: self.forward_response(panel_index, count, signature, text)
+                    )
+            else:
+                print(f"[{name}] No responses yet...")
+                    
+        except Exception as e:
+            print(f"Error parsing response: {e}")
+            self.status_update.emit(f"Error: {str(e)[:30]}")
+            
+    def forward_response(self, panel_index, count, signature, text):
+        """Route a completed response (full, untruncated text) according to the topology"""
+        if not self.is_running or panel_index >= len(self.states):
+            return
+        state = self.states[panel_index]
+        state.fetching_text = False
+        if not state.waiting:
+            return
+        if not text:
+            print("Could not read the full response text, retrying on next check")
+            return
+            
+        name = self.party_name(panel_index)
+        print(f"[{name}] Forwarding {len(text)} chars...")
+        
+        state.waiting = False
+        state.poller.stop()
+        state.last_response_count = count
+        state.last_response_text = text
+        state.last_response_signature = signature
+        state.stable_count = 0
+        state.last_signature = None
+        self.stability.save()
+        
+        self.budget.add_received(len(text), complete=not state.outbox)
+        self.budget_update.emit(self.budget.describe())
+        
+        # The reply to a non-final part only acknowledges it
+        if state.outbox:
+            print(f"[{name}] Part acknowledged, sending the next one ({len(state.outbox)} left)...")
+            self.emit_event(panel_index, 'ack', chars=len(text))
+            self.send_part(panel_index, state.outbox.popleft())
+            self.save_checkpoint()
+            return
+        state.pending = ""
+        
+        # Notify UI
+        self.message_received.emit(panel_index, text[:80] + "..." if len(text) > 80 else text)
+        self.turn_completed.emit(panel_index, text)
+        self.record_turn('received', panel_index, text)
+        
+        # Budget used up: collect every party's closing summary, then stop
+        if self.winding_down:
+            self.emit_event(panel_index, 'forwarded', chars=len(text), targets=[])
+            if not state.closing:
+                self.request_summary(panel_index, "")  # This answered an earlier message
+            else:
+                state.closing = False
+                if not any(s.waiting or s.closing for s in self.states):
+                    self.end_budget()
+            self.save_checkpoint()
+            return
+        
+        # Stop (or steer) a conversation that has stopped producing anything new
+        steer = None
+        if self.convergence:
+            verdict, similarity = self.convergence.observe(panel_index, text)
+            if verdict:
+                state_text = "going in circles" if verdict == "loop" else "settling into agreement"
+                print(f"[{name}] Conversation {state_text} (similarity {similarity:.2f})")
+                action = "branch" if self.convergence.should_branch() else "stop"
+                self.emit_event(panel_index, 'converged', verdict=verdict, action=action,
+                                similarity=round(similarity, 3), chars=len(text))
+                if action == "stop":
+                    self.stop()
+                    self.status_update.emit(f"■ Stopped: conversation {state_text}")
+                    self.conversation_ended.emit(verdict)
+                    return
+                steer = state_text
+                
+        reason = self.budget.exhausted()
+        if reason:
+            print(f"[Budget] {reason.capitalize()} limit reached")
+            if not self.budget.options['wind_down']:
+                self.emit_event(panel_index, 'forwarded', chars=len(text), targets=[])
+                self.end_budget(reason)
+                return
+            self.winding_down = reason
+            self.status_update.emit(f"⏳ {reason.capitalize()} budget used - asking for closing summaries...")
+        
+        forwarded = text
+        if self.compactor:
+            forwarded, ratio = self.compactor.compact(text)
+            if ratio < 1:
+                print(f"[{name}] Compacted {len(text)} → {len(forwarded)} chars ({ratio:.0%})")
+                self.emit_event(panel_index, 'compacted', chars=len(text), after=len(forwarded), ratio=round(ratio, 3))
+        
+        deliveries = self.topology.route(panel_index, forwarded, len(self.states))
+        if not deliveries:
+            self.status_update.emit(f"✓ {name} done - waiting for the others...")
+        for target, sources in deliveries.items():
+            print(f"[{name}] Sending to {self.party_name(target)}...")
+            message = self.compose_message(target, sources)
+            if steer:
+                message = BRANCH_TEMPLATE.format(message=message, state=steer)
+            if self.winding_down:
+                self.request_summary(target, message)
+            else:
+                self.begin_turn(target, message)
+        if self.winding_down:
+            # Parties that have spoken and are not answering anything yet summarise too
+            for i, other in enumerate(self.states):
+                if not (other.waiting or other.closing or other.initial_prompt):
+                    self.request_summary(i, "")
+        self.emit_event(panel_index, 'forwarded', chars=len(text), targets=list(deliveries))
+        self.save_checkpoint()
+        self.panels[panel_index].run_isolated(
+            SELECTOR_STATS_CALL_JS, lambda result: self.on_selector_stats(panel_index, result)
+        )
+        
+    def on_selector_stats(self, panel_index, result):
+        """Publish the page's selector cache counts; warn when a role matched nothing"""
+        if not result or panel_index >= len(self.panels):
+            return
+        stats = json.loads(result)
+        seen = self.selector_empty.setdefault(self.panels[panel_index], {})
+        for role, entry in stats.items():
+            if entry['empty'] > seen.get(role, 0):
+                print(f"[{self.party_name(panel_index)}] ⚠ No {role} selector matched "
+                      f"{entry['empty'] - seen.get(role, 0)} time(s) - AVAILABLE_CHATBOTS entry may be stale")
+            seen[role] = entry['empty']
+        self.emit_event(panel_index, 'selectors', stats=stats)
+            
+    def request_summary(self, index, message):
+        """Send a message (may be empty) with the closing "summarise your position" request"""
+        self.states[index].closing = True
+        self.begin_turn(index, WIND_DOWN_TEMPLATE.format(message=message).strip())
+        
+    def end_budget(self, reason=None):
+        reason = reason or self.winding_down
+        self.stop()
+        self.status_update.emit(f"■ Stopped: {reason} budget used")
+        self.conversation_ended.emit("budget")
+        
+    def compose_message(self, target, sources):
+        """Build the message a panel receives from one or more other panels' responses"""
+        state = self.states[target]
+        initial_prompt, state.initial_prompt = state.initial_prompt, ""
+        
+        # Two-party conversations keep the original wording
+        if len(self.states) == 2 and len(sources) == 1:
+            text = sources[0][1]
+            if initial_prompt:
+                return initial_prompt + "\n\nThe first round from the opposite party:\n\n" + text
+            return FORWARD_TEMPLATE.format(message=text)
+        
+        body = "\n\n".join(
+            PARTY_FORWARD_TEMPLATE.format(name=self.party_name(i), message=text) for i, text in sources
+        )
+        if initial_prompt:
+            return initial_prompt + "\n\nThe first round from the other parties:\n\n" + body
+        return body
+            
+    def send_message(self, panel_index, message):
+        """Send a message to a specific panel"""
+        if panel_index >= len(self.panels):
+            return
+            
+        panel = self.panels[panel_index]
+        name = self.party_name(panel_index)
+        
+        self.status_update.emit(f"📤 Sending to {name}...")
+        self.record_turn('sent', panel_index, message)
+        self.emit_event(panel_index, 'sent', chars=len(message))
+        
+        # json.dumps yields a valid JS string literal, so no hand escaping is needed.
+        # Big messages go over in pieces rather than as one huge script.
+        stage_chars = SETTINGS['stage_chunk_chars']
+        if len(message) <= stage_chars:
+            panel.run_isolated(
+                f"window.__argue ? window.__argue.send({json.dumps(message)}) : 'no library'",
+                lambda r: print(f"Send to {name}: {r}")
+            )
+            return
+        message_id = json.dumps(f"m{panel_index}_{time.monotonic_ns()}")
+        for start in range(0, len(message), stage_chars):
+            piece = json.dumps(message[start:start + stage_chars])
+            panel.run_isolated(f"window.__argue && window.__argue.stage({message_id}, {piece})")
+        panel.run_isolated(
+            f"window.__argue ? window.__argue.sendStaged({message_id}) : 'no library'",
+            lambda r: print(f"Send to {name} ({len(message)} chars staged): {r}")
+        )
+
+
+class ConversationExtractor(QObject):
+    """Reads a panel's whole conversation a batch at a time
+    
+    Each batch is a short script call that returns about `extract_batch_chars`
+    of text, so neither the page nor the Qt event loop stalls on a long chat,
+    and nothing is truncated.
+    """
+    progress = pyqtSignal(int, int)  # Messages read, total
+    finished = pyqtSignal(list)  # [{'role', 'text'}, ...]
+    
+    def __init__(self, panel, parent=None):
+        super().__init__(parent)
+        self.panel = panel
+        self.messages = []
+        
+    def start(self):
+        self.panel.resume(lambda: self.panel.run_isolated(EXTRACT_START_CALL_JS, self.on_started))
+        
+    def on_started(self, result):
+        if not result:
+            self.finished.emit([])  # No page library (page not loaded)
+            return
+        self.progress.emit(0, json.loads(result)['total'])
+        self.next_batch()
+        
+    def next_batch(self):
+        self.panel.run_isolated(
+            EXTRACT_NEXT_CALL_JS.format(max_chars=int(SETTINGS['extract_batch_chars'])), self.on_batch
+        )
+        
+    def on_batch(self, result):
+        if not result:
+            print("✗ The page went away during extraction, keeping what was read")
+            self.finished.emit(self.messages)
+            return
+        try:
+            data = json.loads(result)
+        except ValueError as e:
+            print(f"✗ Unreadable extraction batch ({e}), keeping what was read")
+            self.finished.emit(self.messages)
+            return
+        self.messages.extend(data['messages'])
+        self.progress.emit(data['next'], data['total'])
+        if data['done']:
+            self.finished.emit(self.messages)
+        else:
+            self.next_batch()
+
+
+class PdfExporter(QObject):
+    """Renders HTML files to PDF in an offscreen page, one at a time, without blocking the UI"""
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(list)  # Paths of the PDFs written
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.profile = QWebEngineProfile(self)  # Off-the-record, no chat site scripts
+        self.page = QWebEnginePage(self.profile, self)
+        self.page.loadFinished.connect(self.on_loaded)
+        self.page.pdfPrintingFinished.connect(self.on_printed)
+        self.jobs = deque()
+        self.current = None
+        self.done = []
+        self.total = 0
+        
+    def add(self, html_path, pdf_path, cleanup=False):
+        """Queue an HTML file; `cleanup` deletes it once its PDF is written"""
+        self.jobs.append((html_path, pdf_path, cleanup))
+        self.total += 1
+        if self.current is None:
+            self.next_job()
+            
+    def next_job(self):
+        if not self.jobs:
+            self.current = None
+            done, self.done, self.total = self.done, [], 0
+            self.finished.emit(done)
+            return
+        self.current = self.jobs.popleft()
+        self.progress.emit(f"📄 PDF {len(self.done) + 1}/{self.total}: {os.path.basename(self.current[1])}")
+        self.page.load(QUrl.fromLocalFile(self.current[0]))
+        
+    def on_loaded(self, ok):
+        if self.current is None:
+            return
+        if not ok:
+            print(f"✗ Could not load {self.current[0]} for PDF export")
+            self.finish_job(False)
+            return
+        layout = QPageLayout(
+            QPageSize(QPageSize.PageSizeId.A4), QPageLayout.Orientation.Portrait, QMarginsF(10, 10, 10, 10)
+        )
+        self.page.printToPdf(self.current[1], layout)
+        
+    def on_printed(self, path, success):
+        if self.current is None:
+            return
+        if success:
+            print(f"✓ Saved PDF to: {path}")
+        else:
+            print(f"✗ Error printing PDF: {path}")
+        self.finish_job(success)
+        
+    def finish_job(self, success):
+        html_path, pdf_path, cleanup = self.current
+        if success:
+            self.done.append(pdf_path)
+        if cleanup:
+            try:
+                os.remove(html_path)
+            except OSError:
+                pass
+        self.next_job()
+
+
+def process_rss_mb(pid):
+    """Resident memory of a process in MB (Linux /proc), or 0 when unknown"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+class SitePage:
+    """One chat site page with its own web channel, movable between panels' views"""
+    
+    def __init__(self, config, profile, parent):
+        self.config = config
+        self.page = QWebEnginePage(profile, parent)
+        self.notifier = PanelNotifier(self.page)  # Relayed to the panel showing this page
+        self.channel = QWebChannel(self.page)
+        self.channel.registerObject("argueNotifier", self.notifier)
+        self.page.setWebChannel(self.channel, QWebEngineScript.ScriptWorldId.ApplicationWorld)
+        self.open(config)
+        
+    def open(self, config):
+        """(Re)configure the page for a chatbot and load its site"""
+        self.config = config
+        self.install_site_config()
+        self.page.setUrl(QUrl(config['url']))
+        
+    def install_site_config(self):
+        """Hand the site config to the script library, also on every future load"""
+        scripts = self.page.scripts()
+        for old in scripts.find("argue_config"):
+            scripts.remove(old)
+        source = site_config_js(self.config)
+        scripts.insert(make_script("argue_config", source, QWebEngineScript.InjectionPoint.DocumentCreation))
+        # Also configure the already-loaded document, if any
+        self.page.runJavaScript(source, QWebEngineScript.ScriptWorldId.ApplicationWorld)
+        
+    def freeze(self):
+        """Freeze the page while it is out of sight (Qt refuses for visible pages)"""
+        if not self.page.isVisible() and self.page.lifecycleState() == QWebEnginePage.LifecycleState.Active:
+            self.page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+            
+    def activate(self):
+        """Undo freeze(); a discarded page reloads"""
+        if self.page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            self.page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        
+    def renderer_rss_mb(self):
+        pid = self.page.renderProcessPid()
+        return process_rss_mb(pid) if pid > 0 else 0
+        
+    def delete(self):
+        self.page.deleteLater()  # Takes its channel and notifier with it
+
+
+class PagePool(QObject):
+    """LRU pool of loaded chat pages that no panel is showing, at most one per chatbot
+    
+    Panels swap pages in and out instead of navigating, so switching back to a
+    chatbot is instant and keeps its conversation. The pool is trimmed to
+    `size` pages and to `memory_mb` of renderer memory, oldest first.
+    """
+    
+    def __init__(self, profile, size, memory_mb, parent=None):
+        super().__init__(parent)
+        self.profile = profile
+        self.size = size
+        self.memory_mb = memory_mb
+        self.idle = OrderedDict()  # name -> SitePage, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.preload_queue = []
+        self.preloading = None
+        
+    def take(self, config):
+        """A warm page for this chatbot if one is pooled, else a newly loading one"""
+        site_page = self.idle.pop(config['name'], None)
+        if site_page is not None and site_page.config['url'] == config['url']:
+            self.hits += 1
+            print(f"[Pool] Reusing warm {config['name']} page ({self.hits} hits, {self.misses} misses)")
+            site_page.activate()
+            return site_page
+        if site_page is not None:
+            self.drop(site_page)  # The chatbot's config changed since it was pooled
+        self.misses += 1
+        return SitePage(config, self.profile, self)
+        
+    def put(self, site_page):
+        """Keep a page that just left a panel"""
+        name = site_page.config['name']
+        older = self.idle.pop(name, None)
+        if older is not None:
+            self.drop(older)
+        self.idle[name] = site_page
+        site_page.freeze()
+        self.trim()
+        
+    def trim(self):
+        while len(self.idle) > self.size:
+            self.evict("pool size")
+        while self.idle and self.idle_rss_mb() > self.memory_mb:
+            self.evict("memory cap")
+            
+    def idle_rss_mb(self):
+        """Renderer memory of the pooled pages, counting each render process once"""
+        by_pid = {}
+        for site_page in self.idle.values():
+            by_pid[site_page.page.renderProcessPid()] = site_page
+        return sum(site_page.renderer_rss_mb() for pid, site_page in by_pid.items() if pid > 0)
+        
+    def evict(self, reason):
+        name, site_page = self.idle.popitem(last=False)
+        print(f"[Pool] Dropping {name} page ({reason})")
+        self.drop(site_page)
+        
+    def drop(self, site_page):
+        site_page.delete()
+        if site_page is self.preloading:
+            self.preloading = None  # Its loadFinished, if it still comes, is ignored
+            QTimer.singleShot(0, self.preload_next)
+        
+    def preload(self, names):
+        """Warm pages for chatbots no panel shows, one at a time"""
+        self.preload_queue = [name for name in names if name not in self.idle][:self.size]
+        self.preload_next()
+        
+    def preload_next(self):
+        if not self.preload_queue:
+            return
+        name = self.preload_queue.pop(0)
+        if name in self.idle or name not in AVAILABLE_CHATBOTS:
+            self.preload_next()
+            return
+        site_page = SitePage(AVAILABLE_CHATBOTS[name], self.profile, self)
+        site_page.page.loadFinished.connect(lambda ok, p=site_page: self.on_preloaded(p))
+        self.preloading = site_page
+        self.idle[name] = site_page
+        self.idle.move_to_end(name, last=False)  # Not used yet: first to go
+        print(f"[Pool] Preloading {name}")
+        
+    def on_preloaded(self, site_page):
+        if site_page is not self.preloading:
+            return  # Dropped while loading, or a later load of a page already handed out
+        if site_page in self.idle.values():
+            site_page.freeze()
+        self.preloading = None
+        self.trim()
+        self.preload_next()
+
+
+class SnapshotLabel(QLabel):
+    """A label that reports clicks"""
+    clicked = pyqtSignal()
+    
+    def mousePressEvent(self, event):
+        self.clicked.emit()
+        super().mousePressEvent(event)
+
+
+class BrowserPanel(QFrame):
+    """A panel containing a browser view
+    
+    Without a profile the panel only shows a placeholder until load(profile) is called.
+    Loaded with a PagePool, changing the chatbot swaps pages instead of navigating.
+    """
+    
+    def __init__(self, config, profile=None, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.profile = None
+        self.pool = None
+        self.browser = None
+        self.site_page = None
+        self.suspended = None  # None, "frozen" or "discarded"
+        self.resume_callbacks = []  # Waiting for a discarded page to reload
+        self.resuming_page = None
+        self.notifier = PanelNotifier(self)  # Stable relay for the bridge, whichever page is shown
+        self.setup_ui()
+        if profile is not None:
+            self.load(profile)
         
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -511,31 +3219,253 @@ class BrowserPanel(QFrame):
         
         layout.addWidget(header)
         
-        # Browser
+        # Stands in for the browser until the panel's turn to load comes
+        self.stack = QStackedWidget()
+        self.placeholder = QLabel(f"Loading {self.config['name']}...")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder.setStyleSheet("color: #555; font-size: 13px; background: #0f0f14;")
+        self.stack.addWidget(self.placeholder)
+        
+        # Last picture of the page while it is frozen or discarded; click to resume
+        self.snapshot = SnapshotLabel()
+        self.snapshot.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.snapshot.setStyleSheet("background: #0f0f14;")
+        self.snapshot.clicked.connect(self.resume)
+        self.stack.addWidget(self.snapshot)
+        layout.addWidget(self.stack, stretch=1)
+        
+    def load(self, profile, pool=None):
+        """Create the browser view and open the chat site"""
+        if self.browser is not None:
+            return
+        self.profile = profile
+        self.pool = pool
         self.browser = QWebEngineView()
-        page = QWebEnginePage(self.profile, self.browser)
-        self.browser.setPage(page)
-        self.browser.setUrl(QUrl(self.config['url']))
-        layout.addWidget(self.browser, stretch=1)
+        if self.pool is not None:
+            self.show_page(self.pool.take(self.config))
+        else:
+            self.show_page(SitePage(self.config, profile, self))
+        self.stack.addWidget(self.browser)
+        self.stack.setCurrentWidget(self.browser)
+        self.stack.removeWidget(self.placeholder)
+        self.placeholder.deleteLater()
+        self.placeholder = None
+        
+    def show_page(self, site_page):
+        """Put a page in the view and relay its 'settled' pushes; returns the page it replaced"""
+        previous = self.site_page
+        if previous is not None:
+            previous.notifier.response_settled.disconnect(self.notifier.response_settled)
+        self.site_page = site_page
+        site_page.notifier.response_settled.connect(self.notifier.response_settled)
+        self.browser.setPage(site_page.page)
+        return previous
+        
+    def release_page(self):
+        """Detach the shown page (e.g. the panel is being removed) and return it"""
+        site_page = self.site_page
+        if site_page is not None:
+            site_page.notifier.response_settled.disconnect(self.notifier.response_settled)
+            self.site_page = None
+        return site_page
+        
+    def run_isolated(self, js_code, callback=None):
+        """Run JavaScript in the isolated world where the script library lives"""
+        if self.browser is None:
+            if callback:
+                callback(None)  # Not loaded yet: same as a page without the library
+            return
+        self.browser.page().runJavaScript(
+            js_code, QWebEngineScript.ScriptWorldId.ApplicationWorld, callback or (lambda r: None)
+        )
         
     def refresh(self):
-        self.browser.reload()
+        if self.browser is not None:
+            self.browser.reload()
+            
+    def thread_url(self):
+        """URL of the conversation the panel shows (the site's start page until it has one)"""
+        if self.site_page is None:
+            return self.config['url']
+        return self.site_page.page.url().toString() or self.config['url']
+    
+    def open_thread(self, url, callback):
+        """Navigate to a saved conversation; `callback` runs once it has loaded"""
+        page = self.site_page.page
+        
+        def on_loaded(ok):
+            page.loadFinished.disconnect(on_loaded)
+            callback()
+        page.loadFinished.connect(on_loaded)
+        page.setUrl(QUrl(url))
+    
+    def suspend(self, discard=False):
+        """Freeze the page, or discard it (the renderer lets go of it), behind a snapshot
+        
+        Qt only changes the lifecycle state of pages that are not visible, so the view is
+        swapped for a picture of itself first.
+        """
+        if self.browser is None or self.resume_callbacks or self.suspended == "discarded":
+            return
+        if self.suspended == "frozen" and not discard:
+            return
+        if self.suspended is None:
+            self.snapshot.setPixmap(self.browser.grab())
+            self.stack.setCurrentWidget(self.snapshot)
+        page = self.browser.page()
+        if page.isVisible():
+            return
+        if discard:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+            self.suspended = "discarded"
+        else:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+            self.suspended = "frozen"
+            
+    def resume(self, callback=None):
+        """Bring a suspended page back; `callback` runs once it can take scripts again"""
+        if self.resume_callbacks:
+            if callback:
+                self.resume_callbacks.append(callback)
+            return
+        if self.suspended is None:
+            if callback:
+                callback()
+            return
+        was_discarded = self.suspended == "discarded"
+        self.suspended = None
+        page = self.browser.page()
+        self.stack.setCurrentWidget(self.browser)
+        self.snapshot.clear()
+        if was_discarded:
+            # A discarded page reloads when it becomes active again
+            self.resume_callbacks.append(callback or (lambda: None))
+            self.resuming_page = page
+            page.loadFinished.connect(self.on_resumed_load)
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        if not was_discarded and callback:
+            QTimer.singleShot(0, callback)
+            
+    def on_resumed_load(self, ok):
+        self.resuming_page.loadFinished.disconnect(self.on_resumed_load)
+        self.resuming_page = None
+        callbacks, self.resume_callbacks = self.resume_callbacks, []
+        for callback in callbacks:
+            callback()
+            
+    def renderer_rss_mb(self):
+        if self.browser is None or self.suspended == "discarded":
+            return 0
+        return self.site_page.renderer_rss_mb()
     
     def set_chatbot(self, config):
         """Change the chatbot for this panel"""
+        self.resume()
         self.config = config
         self.title.setText(f"{config['icon']} {config['name']}")
         self.title.setStyleSheet(f"color: {config['color']}; font-size: 12px; font-weight: bold;")
-        self.browser.setUrl(QUrl(config['url']))
+        if self.browser is None:
+            self.placeholder.setText(f"Loading {config['name']}...")
+            return
+        if self.pool is None:
+            self.site_page.open(config)
+            return
+        previous = self.show_page(self.pool.take(config))
+        self.pool.put(previous)
+
+
+class PanelLifecycle(QObject):
+    """Freezes panels that sit out the current turn, discards long-idle ones and keeps
+    renderer memory under a budget; the bridge resumes a panel before messaging it"""
+    
+    def __init__(self, bridge, pool=None, parent=None):
+        super().__init__(parent)
+        self.bridge = bridge
+        self.pool = pool
+        self.last_active = {}  # panel -> monotonic time it last took part in a turn
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(SETTINGS['lifecycle_check_ms'])
+        bridge.set_lifecycle(self)
+        
+    def touch(self, panel):
+        self.last_active[panel] = time.monotonic()
+        
+    def resume(self, panel, callback=None):
+        self.touch(panel)
+        panel.resume(callback)
+        
+    def prepare(self, panels):
+        """Start resuming panels that are about to be messaged, ahead of time"""
+        for panel in panels:
+            self.resume(panel)
+            
+    def check(self):
+        panels = self.bridge.panels
+        now = time.monotonic()
+        busy = {panels[i] for i in self.bridge.waiting_panels() if i < len(panels)}
+        self.last_active = {panel: self.last_active.get(panel, now) for panel in panels}
+        
+        idle = []
+        for panel in panels:
+            if panel in busy or panel.browser is None or panel.resume_callbacks or self.in_use(panel):
+                self.touch(panel)
+                continue
+            # Outside a conversation only panels nobody can see are discarded
+            if not self.bridge.is_running and panel.isVisible():
+                self.touch(panel)
+                continue
+            idle_s = now - self.last_active[panel]
+            idle.append((idle_s, panel))
+            if idle_s >= SETTINGS['lifecycle_discard_after_s']:
+                panel.suspend(discard=True)
+            elif self.bridge.is_running and idle_s >= SETTINGS['lifecycle_freeze_after_s']:
+                panel.suspend()
+                
+        # Over budget: discard the longest-idle panels first, then drop pooled pages
+        budget = SETTINGS['lifecycle_memory_mb']
+        if not budget:
+            return
+        total = self.renderer_rss_mb()
+        for idle_s, panel in sorted(idle, key=lambda item: item[0], reverse=True):
+            if total <= budget:
+                break
+            if panel.suspended != "discarded":
+                print(f"[Lifecycle] {total:.0f} MB > {budget} MB budget, discarding {panel.config['name']}")
+                panel.suspend(discard=True)
+                total = self.renderer_rss_mb()
+        while self.pool is not None and self.pool.idle and total > budget:
+            self.pool.evict("memory budget")
+            total = self.renderer_rss_mb()
+            
+    def in_use(self, panel):
+        """The user is pointing at or typing into the panel (reading it, logging in...)"""
+        if not panel.isVisible():
+            return False
+        focus = QApplication.focusWidget()
+        return panel.underMouse() or (focus is not None and panel.isAncestorOf(focus))
+            
+    def renderer_rss_mb(self):
+        """Renderer memory of all panels and pooled pages, counting each process once"""
+        pages = [panel.site_page for panel in self.bridge.panels
+                 if panel.site_page is not None and panel.suspended != "discarded"]
+        if self.pool is not None:
+            pages += list(self.pool.idle.values())
+        by_pid = {site_page.page.renderProcessPid(): site_page for site_page in pages}
+        return sum(site_page.renderer_rss_mb() for pid, site_page in by_pid.items() if pid > 0)
 
 
 class ControlPanel(QFrame):
-    """Control panel with initial prompts for both chatbots"""
+    """Control panel with an initial prompt per chatbot panel"""
     
     start_clicked = pyqtSignal(tuple)
     stop_clicked = pyqtSignal()
     llm_changed = pyqtSignal(int, str)  # panel_index, llm_name
+    panel_count_changed = pyqtSignal(int)
     save_pdf_clicked = pyqtSignal()
+    export_pdfs_clicked = pyqtSignal()
+    resume_clicked = pyqtSignal()
+    search_clicked = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -549,105 +3479,15 @@ class ControlPanel(QFrame):
         layout.setContentsMargins(12, 8, 12, 8)
         layout.setSpacing(8)
         
-        # Row 0: LLM Selection dropdowns
-        llm_selection_layout = QHBoxLayout()
-        
-        # Left LLM selector
-        left_llm_frame = QFrame()
-        left_llm_layout = QHBoxLayout(left_llm_frame)
-        left_llm_layout.setContentsMargins(0, 0, 0, 0)
-        left_llm_layout.setSpacing(8)
-        
-        left_llm_label = QLabel("Left Panel:")
-        left_llm_label.setStyleSheet("color: #888; font-size: 11px;")
-        left_llm_layout.addWidget(left_llm_label)
-        
-        self.left_llm_dropdown = QComboBox()
-        self.left_llm_dropdown.setFixedWidth(120)
-        for name in AVAILABLE_CHATBOTS.keys():
-            self.left_llm_dropdown.addItem(f"{AVAILABLE_CHATBOTS[name]['icon']} {name}", name)
-        self.left_llm_dropdown.setCurrentText(f"{AVAILABLE_CHATBOTS['ChatGPT']['icon']} ChatGPT")
-        self.left_llm_dropdown.setStyleSheet("""
-            QComboBox { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; padding: 4px 8px; font-size: 11px; }
-            QComboBox:hover { border-color: #6366f1; }
-            QComboBox::drop-down { border: none; }
-            QComboBox QAbstractItemView { background: #2a2a3a; color: white; selection-background-color: #6366f1; }
-        """)
-        self.left_llm_dropdown.currentIndexChanged.connect(lambda: self.on_llm_changed(0))
-        left_llm_layout.addWidget(self.left_llm_dropdown)
-        left_llm_layout.addStretch()
-        llm_selection_layout.addWidget(left_llm_frame)
-        
-        # Right LLM selector
-        right_llm_frame = QFrame()
-        right_llm_layout = QHBoxLayout(right_llm_frame)
-        right_llm_layout.setContentsMargins(0, 0, 0, 0)
-        right_llm_layout.setSpacing(8)
-        
-        right_llm_label = QLabel("Right Panel:")
-        right_llm_label.setStyleSheet("color: #888; font-size: 11px;")
-        right_llm_layout.addWidget(right_llm_label)
-        
-        self.right_llm_dropdown = QComboBox()
-        self.right_llm_dropdown.setFixedWidth(120)
-        for name in AVAILABLE_CHATBOTS.keys():
-            self.right_llm_dropdown.addItem(f"{AVAILABLE_CHATBOTS[name]['icon']} {name}", name)
-        self.right_llm_dropdown.setCurrentIndex(1)  # Default to DeepSeek
-        self.right_llm_dropdown.setStyleSheet("""
-            QComboBox { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; padding: 4px 8px; font-size: 11px; }
-            QComboBox:hover { border-color: #6366f1; }
-            QComboBox::drop-down { border: none; }
-            QComboBox QAbstractItemView { background: #2a2a3a; color: white; selection-background-color: #6366f1; }
-        """)
-        self.right_llm_dropdown.currentIndexChanged.connect(lambda: self.on_llm_changed(1))
-        right_llm_layout.addWidget(self.right_llm_dropdown)
-        right_llm_layout.addStretch()
-        llm_selection_layout.addWidget(right_llm_frame)
-        
-        layout.addLayout(llm_selection_layout)
-        
-        # Row 1: Prompt inputs
-        prompts_layout = QHBoxLayout()
-        
-        # Left panel prompt
-        self.left_prompt_frame = QFrame()
-        left_prompt_layout = QVBoxLayout(self.left_prompt_frame)
-        left_prompt_layout.setContentsMargins(0, 0, 0, 0)
-        left_prompt_layout.setSpacing(4)
-        
-        self.left_prompt_label = QLabel("◉ ChatGPT Initial Prompt:")
-        self.left_prompt_label.setStyleSheet("color: #10a37f; font-size: 11px; font-weight: bold;")
-        left_prompt_layout.addWidget(self.left_prompt_label)
-        
-        self.chatgpt_prompt = QTextEdit()
-        self.chatgpt_prompt.setMaximumHeight(60)
-        self.chatgpt_prompt.setPlaceholderText("Represent me, Alice, and create a dramatic improv scene with my friend, Bob...")
-        self.chatgpt_prompt.setStyleSheet("""
-            QTextEdit { background: #0f0f14; color: white; border: 1px solid #2a2a3a; border-radius: 4px; padding: 4px; font-size: 12px; }
-        """)
-        left_prompt_layout.addWidget(self.chatgpt_prompt)
-        prompts_layout.addWidget(self.left_prompt_frame)
-        
-        # Right panel prompt
-        self.right_prompt_frame = QFrame()
-        right_prompt_layout = QVBoxLayout(self.right_prompt_frame)
-        right_prompt_layout.setContentsMargins(0, 0, 0, 0)
-        right_prompt_layout.setSpacing(4)
-        
-        self.right_prompt_label = QLabel("◆ DeepSeek Initial Prompt:")
-        self.right_prompt_label.setStyleSheet("color: #3b82f6; font-size: 11px; font-weight: bold;")
-        right_prompt_layout.addWidget(self.right_prompt_label)
-        
-        self.deepseek_prompt = QTextEdit()
-        self.deepseek_prompt.setMaximumHeight(60)
-        self.deepseek_prompt.setPlaceholderText("Represent me, Bob, and create a dramatic improv scene with my friend, Alice...")
-        self.deepseek_prompt.setStyleSheet("""
-            QTextEdit { background: #0f0f14; color: white; border: 1px solid #2a2a3a; border-radius: 4px; padding: 4px; font-size: 12px; }
-        """)
-        right_prompt_layout.addWidget(self.deepseek_prompt)
-        prompts_layout.addWidget(self.right_prompt_frame)
-        
-        layout.addLayout(prompts_layout)
+        # Row 0: One slot per panel - LLM selection dropdown + initial prompt
+        self.slots_layout = QHBoxLayout()
+        self.slot_frames = []
+        self.llm_dropdowns = []
+        self.prompt_labels = []
+        self.prompt_edits = []
+        for llm_name in self.selected_llms:
+            self.add_slot(llm_name)
+        layout.addLayout(self.slots_layout)
         
         # Row 2: Buttons and status
         controls_layout = QHBoxLayout()
@@ -676,6 +3516,38 @@ class ControlPanel(QFrame):
         self.example_dropdown.currentIndexChanged.connect(self.on_example_selected)
         controls_layout.addWidget(self.example_dropdown)
         
+        # Turn topology + panel count
+        self.topology_dropdown = QComboBox()
+        self.topology_dropdown.setFixedWidth(120)
+        for key, topology in TOPOLOGIES.items():
+            self.topology_dropdown.addItem(topology.label, key)
+        self.topology_dropdown.setStyleSheet("""
+            QComboBox { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; padding: 6px; font-size: 12px; }
+            QComboBox:hover { border-color: #6366f1; }
+            QComboBox::drop-down { border: none; }
+            QComboBox QAbstractItemView { background: #2a2a3a; color: white; selection-background-color: #6366f1; }
+        """)
+        controls_layout.addWidget(self.topology_dropdown)
+        
+        panel_btn_style = """
+            QPushButton { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; font-size: 14px; }
+            QPushButton:hover { border-color: #6366f1; }
+            QPushButton:disabled { color: #555; }
+        """
+        self.add_panel_btn = QPushButton("＋")
+        self.add_panel_btn.setFixedSize(28, 28)
+        self.add_panel_btn.setToolTip("Add a panel")
+        self.add_panel_btn.setStyleSheet(panel_btn_style)
+        self.add_panel_btn.clicked.connect(self.on_add_panel)
+        controls_layout.addWidget(self.add_panel_btn)
+        
+        self.remove_panel_btn = QPushButton("－")
+        self.remove_panel_btn.setFixedSize(28, 28)
+        self.remove_panel_btn.setToolTip("Remove the last panel")
+        self.remove_panel_btn.setStyleSheet(panel_btn_style)
+        self.remove_panel_btn.clicked.connect(self.on_remove_panel)
+        controls_layout.addWidget(self.remove_panel_btn)
+        
         controls_layout.addStretch()
         
         # Status
@@ -683,6 +3555,12 @@ class ControlPanel(QFrame):
         self.status_label.setStyleSheet("color: #888; font-size: 12px;")
         controls_layout.addWidget(self.status_label)
         
+        # Remaining session budget, hidden while unlimited
+        self.budget_label = QLabel()
+        self.budget_label.setStyleSheet("color: #f0b429; font-size: 12px; padding-left: 12px;")
+        self.budget_label.hide()
+        controls_layout.addWidget(self.budget_label)
+        
         controls_layout.addStretch()
         
         # Start button
@@ -717,7 +3595,143 @@ class ControlPanel(QFrame):
         self.save_pdf_btn.clicked.connect(self.save_pdf_clicked.emit)
         controls_layout.addWidget(self.save_pdf_btn)
         
+        # Batch PDF export of saved sessions
+        self.export_pdfs_btn = QPushButton("🗂 PDFs")
+        self.export_pdfs_btn.setFixedSize(80, 32)
+        self.export_pdfs_btn.setToolTip("Export saved conversations or journal sessions to PDF")
+        self.export_pdfs_btn.setStyleSheet("""
+            QPushButton { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; font-weight: bold; font-size: 12px; }
+            QPushButton:hover { border-color: #6366f1; }
+        """)
+        self.export_pdfs_btn.clicked.connect(self.export_pdfs_clicked.emit)
+        controls_layout.addWidget(self.export_pdfs_btn)
+        
+        # Continue a conversation interrupted by a crash or restart
+        self.resume_btn = QPushButton("⟲ Resume")
+        self.resume_btn.setFixedSize(90, 32)
+        self.resume_btn.setToolTip("Continue an interrupted conversation from its last completed turn")
+        self.resume_btn.setStyleSheet("""
+            QPushButton { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; font-weight: bold; font-size: 12px; }
+            QPushButton:hover { border-color: #6366f1; }
+            QPushButton:disabled { color: #555; }
+        """)
+        self.resume_btn.clicked.connect(self.resume_clicked.emit)
+        controls_layout.addWidget(self.resume_btn)
+        
+        self.search_btn = QPushButton("🔍 Search")
+        self.search_btn.setFixedSize(90, 32)
+        self.search_btn.setToolTip("Search all finished debates")
+        self.search_btn.setStyleSheet("""
+            QPushButton { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; font-weight: bold; font-size: 12px; }
+            QPushButton:hover { border-color: #6366f1; }
+        """)
+        self.search_btn.clicked.connect(self.search_clicked.emit)
+        controls_layout.addWidget(self.search_btn)
+        
         layout.addLayout(controls_layout)
+        self.update_panel_buttons()
+        
+    def add_slot(self, llm_name):
+        """Add the selection dropdown and prompt box for one more panel"""
+        panel_index = len(self.slot_frames)
+        config = AVAILABLE_CHATBOTS[llm_name]
+        
+        slot_frame = QFrame()
+        slot_layout = QVBoxLayout(slot_frame)
+        slot_layout.setContentsMargins(0, 0, 0, 0)
+        slot_layout.setSpacing(4)
+        
+        # LLM selector
+        llm_layout = QHBoxLayout()
+        llm_layout.setSpacing(8)
+        llm_label = QLabel(f"Panel {panel_index + 1}:")
+        llm_label.setStyleSheet("color: #888; font-size: 11px;")
+        llm_layout.addWidget(llm_label)
+        
+        dropdown = QComboBox()
+        dropdown.setFixedWidth(120)
+        for name in AVAILABLE_CHATBOTS.keys():
+            dropdown.addItem(f"{AVAILABLE_CHATBOTS[name]['icon']} {name}", name)
+        dropdown.setCurrentIndex(list(AVAILABLE_CHATBOTS.keys()).index(llm_name))
+        dropdown.setStyleSheet("""
+            QComboBox { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; padding: 4px 8px; font-size: 11px; }
+            QComboBox:hover { border-color: #6366f1; }
+            QComboBox::drop-down { border: none; }
+            QComboBox QAbstractItemView { background: #2a2a3a; color: white; selection-background-color: #6366f1; }
+        """)
+        dropdown.currentIndexChanged.connect(lambda _, idx=panel_index: self.on_llm_changed(idx))
+        llm_layout.addWidget(dropdown)
+        llm_layout.addStretch()
+        slot_layout.addLayout(llm_layout)
+        
+        # Initial prompt
+        prompt_label = QLabel(f"{config['icon']} {llm_name} Initial Prompt:")
+        prompt_label.setStyleSheet(f"color: {config['color']}; font-size: 11px; font-weight: bold;")
+        slot_layout.addWidget(prompt_label)
+        
+        prompt_edit = QTextEdit()
+        prompt_edit.setMaximumHeight(60)
+        placeholders = [
+            "Represent me, Alice, and create a dramatic improv scene with my friend, Bob...",
+            "Represent me, Bob, and create a dramatic improv scene with my friend, Alice...",
+        ]
+        prompt_edit.setPlaceholderText(
+            placeholders[panel_index] if panel_index < len(placeholders) else "Initial prompt for this panel..."
+        )
+        prompt_edit.setStyleSheet("""
+            QTextEdit { background: #0f0f14; color: white; border: 1px solid #2a2a3a; border-radius: 4px; padding: 4px; font-size: 12px; }
+        """)
+        slot_layout.addWidget(prompt_edit)
+        
+        self.slots_layout.addWidget(slot_frame)
+        self.slot_frames.append(slot_frame)
+        self.llm_dropdowns.append(dropdown)
+        self.prompt_labels.append(prompt_label)
+        self.prompt_edits.append(prompt_edit)
+        
+    def on_add_panel(self):
+        if len(self.slot_frames) >= MAX_PANELS:
+            return
+        llm_names = list(AVAILABLE_CHATBOTS.keys())
+        llm_name = llm_names[len(self.slot_frames) % len(llm_names)]
+        self.selected_llms.append(llm_name)
+        self.add_slot(llm_name)
+        self.update_panel_buttons()
+        self.panel_count_changed.emit(len(self.slot_frames))
+        
+    def on_remove_panel(self):
+        if len(self.slot_frames) <= MIN_PANELS:
+            return
+        self.slot_frames.pop().deleteLater()
+        self.llm_dropdowns.pop()
+        self.prompt_labels.pop()
+        self.prompt_edits.pop()
+        self.selected_llms.pop()
+        self.update_panel_buttons()
+        self.panel_count_changed.emit(len(self.slot_frames))
+        
+    def update_panel_buttons(self):
+        """Enable add/remove only within the panel limits and while stopped"""
+        idle = self.start_btn.isEnabled()
+        self.add_panel_btn.setEnabled(idle and len(self.slot_frames) < MAX_PANELS)
+        self.remove_panel_btn.setEnabled(idle and len(self.slot_frames) > MIN_PANELS)
+        self.topology_dropdown.setEnabled(idle)
+        self.resume_btn.setEnabled(idle)
+        
+    def selected_topology(self):
+        return self.topology_dropdown.currentData()
+    
+    def apply_session(self, models, topology, prompts):
+        """Set up the slots, topology and prompts of an existing conversation"""
+        while len(self.slot_frames) < len(models):
+            self.on_add_panel()
+        while len(self.slot_frames) > len(models):
+            self.on_remove_panel()
+        for dropdown, name in zip(self.llm_dropdowns, models):
+            dropdown.setCurrentIndex(dropdown.findData(name))
+        self.topology_dropdown.setCurrentIndex(self.topology_dropdown.findData(topology))
+        for prompt_edit, prompt in zip(self.prompt_edits, prompts):
+            prompt_edit.setText(prompt)
         
     def load_examples_from_file(self):
         """Load examples from the JSON file"""
@@ -749,8 +3763,9 @@ class ControlPanel(QFrame):
         example_idx = index - 1
         if example_idx < len(self.examples):
             ex = self.examples[example_idx]
-            self.chatgpt_prompt.setText(ex.get('chatgpt', ''))
-            self.deepseek_prompt.setText(ex.get('deepseek', ''))
+            prompts = example_prompts(ex)
+            for i, prompt_edit in enumerate(self.prompt_edits):
+                prompt_edit.setText(prompts[i] if i < len(prompts) else '')
             self.status_label.setText(f"Loaded: {ex.get('name')}")
             
     def load_example(self):
@@ -759,123 +3774,365 @@ class ControlPanel(QFrame):
     
     def on_llm_changed(self, panel_index):
         """Handle LLM selection change"""
-        if panel_index == 0:
-            llm_name = self.left_llm_dropdown.currentData()
-            config = AVAILABLE_CHATBOTS[llm_name]
-            self.left_prompt_label.setText(f"{config['icon']} {llm_name} Initial Prompt:")
-            self.left_prompt_label.setStyleSheet(f"color: {config['color']}; font-size: 11px; font-weight: bold;")
-        else:
-            llm_name = self.right_llm_dropdown.currentData()
-            config = AVAILABLE_CHATBOTS[llm_name]
-            self.right_prompt_label.setText(f"{config['icon']} {llm_name} Initial Prompt:")
-            self.right_prompt_label.setStyleSheet(f"color: {config['color']}; font-size: 11px; font-weight: bold;")
+        llm_name = self.llm_dropdowns[panel_index].currentData()
+        config = AVAILABLE_CHATBOTS[llm_name]
+        self.prompt_labels[panel_index].setText(f"{config['icon']} {llm_name} Initial Prompt:")
+        self.prompt_labels[panel_index].setStyleSheet(f"color: {config['color']}; font-size: 11px; font-weight: bold;")
         
         self.selected_llms[panel_index] = llm_name
         self.llm_changed.emit(panel_index, llm_name)
         
     def get_selected_chatbots(self):
         """Return the current chatbot configurations"""
-        return [
-            AVAILABLE_CHATBOTS[self.selected_llms[0]],
-            AVAILABLE_CHATBOTS[self.selected_llms[1]],
-        ]
+        return [AVAILABLE_CHATBOTS[name] for name in self.selected_llms]
         
     def on_start(self):
-        self.start_btn.setEnabled(False)
-        self.stop_btn.setEnabled(True)
-        self.status_label.setText("� Starting...")
-        self.status_label.setStyleSheet("color: #10a37f; font-size: 12px;")
+        self.show_running("� Starting...")
         
-        prompts = (
-            self.chatgpt_prompt.toPlainText(),
-            self.deepseek_prompt.toPlainText()
-        )
+        prompts = tuple(prompt_edit.toPlainText() for prompt_edit in self.prompt_edits)
         self.start_clicked.emit(prompts)
         
     def on_stop(self):
+        self.show_stopped("Stopped")
+        self.stop_clicked.emit()
+        
+    def show_running(self, message):
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.status_label.setText(message)
+        self.status_label.setStyleSheet("color: #10a37f; font-size: 12px;")
+        self.update_panel_buttons()
+        
+    def show_stopped(self, message):
+        """Return the buttons to their idle state, also when the bridge stops on its own"""
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        self.status_label.setText("Stopped")
+        self.update_panel_buttons()
+        self.status_label.setText(message)
         self.status_label.setStyleSheet("color: #888; font-size: 12px;")
-        self.stop_clicked.emit()
         
     def update_status(self, message):
         self.status_label.setText(message)
+        
+    def update_budget(self, remaining):
+        self.budget_label.setText(f"⏱ {remaining}")
+        self.budget_label.setVisible(bool(remaining))
 
 
-class MainWindow(QMainWindow):
-    """Main application window"""
+class SearchDialog(QDialog):
+    """Search over every finished debate (SessionIndex); results update while typing"""
+    open_session = pyqtSignal(str)  # Journal path of a clicked result
     
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("AI Brainstorm - LLM ↔ LLM")
-        self.setMinimumSize(1300, 900)
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.setWindowTitle("Search Debates")
+        self.resize(860, 640)
+        self.setStyleSheet("""
+            QDialog { background: #0f0f14; }
+            QLineEdit, QComboBox { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; padding: 6px; font-size: 13px; }
+            QLineEdit:focus { border-color: #6366f1; }
+            QTextBrowser { background: #16161d; color: #ddd; border: none; font-size: 13px; }
+            QLabel { color: #888; font-size: 12px; }
+        """)
         
-        self.setup_persistent_profile()
-        self.setup_ui()
-        self.setup_bridge()
+        layout = QVBoxLayout(self)
+        query_layout = QHBoxLayout()
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Search all finished debates...")
+        self.query_edit.textChanged.connect(lambda _: self.search_timer.start())
+        query_layout.addWidget(self.query_edit, stretch=1)
+        self.model_dropdown = QComboBox()
+        self.model_dropdown.setFixedWidth(150)
+        self.model_dropdown.currentIndexChanged.connect(lambda _: self.run_search())
+        query_layout.addWidget(self.model_dropdown)
+        layout.addLayout(query_layout)
         
-    def setup_persistent_profile(self):
-        os.makedirs(STORAGE_DIR, exist_ok=True)
-        self.profile = QWebEngineProfile("brainstorm_profile", self)
-        self.profile.setPersistentStoragePath(STORAGE_DIR)
-        self.profile.setCachePath(os.path.join(STORAGE_DIR, "cache"))
-        self.profile.setPersistentCookiesPolicy(
-            QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
-        )
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.results = QTextBrowser()
+        self.results.setOpenLinks(False)
+        self.results.anchorClicked.connect(lambda url: self.open_session.emit(url.toLocalFile()))
+        layout.addWidget(self.results, stretch=1)
+        
+        # Search once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        
+    def refresh_models(self):
+        selected = self.model_dropdown.currentData()
+        self.model_dropdown.blockSignals(True)
+        self.model_dropdown.clear()
+        self.model_dropdown.addItem("All models", None)
+        for name in self.index.models():
+            self.model_dropdown.addItem(name, name)
+        self.model_dropdown.setCurrentIndex(max(self.model_dropdown.findData(selected), 0))
+        self.model_dropdown.blockSignals(False)
+        
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_models()
+        self.query_edit.setFocus()
+        self.run_search()
         
+    def run_search(self):
+        text = self.query_edit.text()
+        started = time.perf_counter()
+        try:
+            hits = self.index.search(text, self.model_dropdown.currentData())
+        except sqlite3.Error as e:
+            self.summary_label.setText(f"Search failed: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        blocks = []
+        for hit in hits:
+            snippet = html.escape(hit['snippet']).replace("\x02", "<b style='color: white;'>").replace("\x03", "</b>")
+            link = QUrl.fromLocalFile(hit['journal']).toString()
+            blocks.append(
+                f"<p><a href='{link}' style='color: #8b8cf8;'>{html.escape(hit['prompt'][:90] or hit['session'])}</a><br>"
+                f"<span style='color: #888;'>{html.escape(hit['model'])} · round {hit['round']} · {hit['time']}"
+                f" · {html.escape(hit['models'])}</span><br>{snippet}</p>"
+            )
+        self.results.setHtml("".join(blocks))
+        if text.strip():
+            self.summary_label.setText(f"{len(hits)} results in {elapsed_ms:.0f} ms across {self.index.count()} debates")
+        else:
+            self.summary_label.setText(f"{self.index.count()} debates indexed")
+
+
+class SessionScheduler(QObject):
+    """Lets at most `limit` tab sessions poll and send at once (0 = no limit)
+    
+    The visible tab goes first, then the sessions that started earliest. The
+    others are paused (see ChatBridge.set_paused) until a slot frees up; their
+    hidden pages don't render, and the lifecycle freezes the idle ones.
+    """
+    
+    def __init__(self, tabs, limit, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.limit = limit
+    
+    def sessions(self):
+        return [self.tabs.widget(i) for i in range(self.tabs.count())]
+    
+    def update(self):
+        current = self.tabs.currentWidget()
+        running = sorted(
+            (session for session in self.sessions() if session.started_at is not None),
+            key=lambda session: (session is not current, session.started_at)
+        )
+        for rank, session in enumerate(running):
+            session.bridge.set_paused(bool(self.limit) and rank >= self.limit)
+        for session in self.sessions():
+            self.tabs.setTabText(self.tabs.indexOf(session), session.title())
+
+
+class SessionTab(QWidget):
+    """One debate in its own tab: panels, control panel and bridge. The window's
+    profile, page pool, journal and metrics are shared by all tabs"""
+    session_changed = pyqtSignal()  # Started or stopped
+    
+    def __init__(self, main_window, number):
+        super().__init__()
+        self.main_window = main_window
+        self.number = number
+        self.started_at = None  # Monotonic start of the running conversation
+        self.lifecycle = None  # Created with the shared profile
+        self.load_queue = []
+        self.loading_panel = None  # Panel whose load holds back the rest of the queue
+        self.ready_panels = set()
+        self.load_timer = QTimer(self)
+        self.load_timer.setSingleShot(True)
+        self.load_timer.timeout.connect(self.load_next_panel)
+        self.setup_ui()
+        self.setup_bridge()
+    
+    def title(self):
+        if self.started_at is None:
+            return f"Session {self.number}"
+        return f"{'⏸' if self.bridge.paused else '●'} Session {self.number}"
+    
     def setup_ui(self):
-        central = QWidget()
-        self.setCentralWidget(central)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
         
-        main_layout = QVBoxLayout(central)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(0)
+        # Control panel (its slots decide which chatbots the panels show)
+        self.control_panel = ControlPanel()
         
         # Browser panels
-        splitter = QSplitter(Qt.Orientation.Horizontal)
-        splitter.setStyleSheet("""
+        self.splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.splitter.setStyleSheet("""
             QSplitter { background: #0f0f14; }
             QSplitter::handle { background: #2a2a3a; width: 2px; }
         """)
         
         self.panels = []
-        for config in CHATBOTS:
-            panel = BrowserPanel(config, self.profile)
-            self.panels.append(panel)
-            splitter.addWidget(panel)
-        
-        splitter.setSizes([650, 650])
-        main_layout.addWidget(splitter, stretch=1)
-        
-        # Control panel
-        self.control_panel = ControlPanel()
-        main_layout.addWidget(self.control_panel)
-        
-        self.statusBar().hide()
-        self.setStyleSheet("QMainWindow { background: #0f0f14; }")
+        for config in self.control_panel.get_selected_chatbots():
+            self.add_panel(config)
         
+        layout.addWidget(self.splitter, stretch=1)
+        layout.addWidget(self.control_panel)
+    
     def setup_bridge(self):
+        main = self.main_window
         self.bridge = ChatBridge()
+        self.bridge.set_journal(main.journal)
+        self.bridge.set_stability(main.stability)
+        self.bridge.set_checkpoints(main.checkpoints)
+        self.bridge.turn_event.connect(
+            lambda panel_index, event, details: main.metrics.observe(panel_index, event, details, session=self.number)
+        )
         self.bridge.set_panels(self.panels)
         self.bridge.set_chatbot_getter(self.control_panel.get_selected_chatbots)
         self.bridge.status_update.connect(self.control_panel.update_status)
+        self.bridge.budget_update.connect(self.control_panel.update_budget)
+        self.bridge.conversation_ended.connect(self.on_conversation_ended)
+        self.bridge.session_finished.connect(lambda path: main.session_index.add(path, main.journal))
         self.bridge.message_received.connect(
             lambda idx, msg: self.control_panel.update_status(f"✓ {self.control_panel.get_selected_chatbots()[idx]['name']}: {msg[:50]}...")
         )
         
-        self.control_panel.start_clicked.connect(self.bridge.start)
-        self.control_panel.stop_clicked.connect(self.bridge.stop)
+        self.control_panel.start_clicked.connect(self.on_start_clicked)
+        self.control_panel.stop_clicked.connect(self.on_stop_clicked)
         self.control_panel.llm_changed.connect(self.on_llm_changed)
+        self.control_panel.panel_count_changed.connect(self.on_panel_count_changed)
         self.control_panel.save_pdf_clicked.connect(self.save_conversations_to_pdf)
+        self.control_panel.export_pdfs_clicked.connect(main.export_saved_sessions_to_pdf)
+        self.control_panel.resume_clicked.connect(main.resume_session)
+        self.control_panel.search_clicked.connect(main.show_search)
+    
+    def load_panels(self):
+        """Once the shared profile exists: load the panels one at a time, first speakers first"""
+        self.lifecycle = PanelLifecycle(self.bridge, self.main_window.page_pool, self)
+        n = len(self.panels)
+        first = TOPOLOGIES[self.control_panel.selected_topology()]().first_speakers(n)
+        order = list(first) + [i for i in range(n) if i not in first]
+        self.load_queue = [self.panels[i] for i in order]
+        self.load_next_panel()
+    
+    def load_panel(self, panel):
+        """Open a panel's chat site and report when it has finished loading"""
+        if panel.browser is not None:
+            return
+        panel.load(self.main_window.profile, self.main_window.page_pool)
+        self.main_window.startup_mark(f"{panel.config['name']} loading")
+        panel.browser.loadFinished.connect(lambda ok, p=panel: self.on_panel_ready(p, ok))
+    
+    def load_next_panel(self):
+        """Start the next queued panel; the one after it waits for this load or a stagger timeout"""
+        while self.load_queue:
+            panel = self.load_queue.pop(0)
+            if panel in self.panels and panel.browser is None:
+                self.load_panel(panel)
+                self.loading_panel = panel
+                self.load_timer.start(SETTINGS['panel_load_stagger_ms'])
+                return
+    
+    def load_all_panels(self):
+        """Load whatever is still queued right away (e.g. the conversation is starting)"""
+        self.load_timer.stop()
+        for panel in self.panels:
+            self.load_panel(panel)
+        self.load_queue = []
+    
+    def on_panel_ready(self, panel, ok):
+        if panel in self.ready_panels:
+            return
+        self.ready_panels.add(panel)
+        self.main_window.startup_mark(f"{panel.config['name']} ready{'' if ok else ' (load failed)'}")
+        if len(self.ready_panels) == len(self.panels):
+            self.main_window.startup_mark("all panels ready")
+            if SETTINGS['page_pool_preload']:
+                shown = {p.config['name'] for tab in self.main_window.sessions() for p in tab.panels}
+                self.main_window.page_pool.preload([name for name in AVAILABLE_CHATBOTS if name not in shown])
+        if panel is self.loading_panel and self.load_timer.isActive():
+            self.load_timer.stop()
+            self.load_next_panel()
+    
+    def on_start_clicked(self, prompts):
+        self.main_window.setup_persistent_profile()
+        self.load_all_panels()
+        self.started_at = time.monotonic()
+        self.session_changed.emit()  # The scheduler may hold this session until a slot frees up
+        self.bridge.start(prompts, self.control_panel.selected_topology())
+    
+    def resume_checkpoint(self, checkpoint):
+        """Re-open a checkpointed conversation's chat threads and continue it"""
+        self.control_panel.apply_session(checkpoint['models'], checkpoint['topology'], checkpoint['prompts'])
+        self.control_panel.show_running("⟲ Re-opening the conversation threads...")
+        self.main_window.setup_persistent_profile()
+        self.load_all_panels()
+        self.started_at = time.monotonic()
+        self.session_changed.emit()
+        
+        loading = set(range(len(self.panels)))
+        
+        def on_thread_loaded(index):
+            loading.discard(index)
+            if not loading:
+                # Let the chat apps finish booting; the user may have pressed Stop meanwhile
+                QTimer.singleShot(2000, lambda: self.started_at is not None and self.bridge.resume(checkpoint))
+        for i, (panel, saved) in enumerate(zip(self.panels, checkpoint['panels'])):
+            panel.open_thread(saved['url'], lambda idx=i: on_thread_loaded(idx))
+        
+    def on_stop_clicked(self):
+        self.bridge.stop()
+        self.started_at = None
+        self.session_changed.emit()
+    
+    def on_conversation_ended(self, reason):
+        self.control_panel.show_stopped("■ Stopped: " + {
+            "loop": "going in circles", "converged": "converged", "budget": "budget used",
+        }[reason])
+        self.started_at = None
+        self.session_changed.emit()
+    
+    def add_panel(self, config):
+        panel = BrowserPanel(config)
+        if self.main_window.profile is not None:
+            self.load_panel(panel)
+        self.panels.append(panel)
+        self.splitter.addWidget(panel)
+        self.splitter.setSizes([1000] * len(self.panels))  # Equal widths
+    
+    def release_panel(self, panel):
+        panel.setParent(None)
+        site_page = panel.release_page()
+        if site_page is not None:
+            self.main_window.page_pool.put(site_page)  # Keep it warm in case the panel comes back
+        panel.deleteLater()
+    
+    def on_panel_count_changed(self, count):
+        """Add or remove browser panels to match the control panel's slots"""
+        chatbots = self.control_panel.get_selected_chatbots()
+        while len(self.panels) < count:
+            self.add_panel(chatbots[len(self.panels)])
+        while len(self.panels) > count:
+            self.release_panel(self.panels.pop())
+        self.splitter.setSizes([1000] * len(self.panels))
+        self.bridge.set_panels(self.panels)
     
     def on_llm_changed(self, panel_index, llm_name):
         """Handle LLM selection change"""
         config = AVAILABLE_CHATBOTS[llm_name]
         self.panels[panel_index].set_chatbot(config)
     
+    def close_session(self):
+        """Stop the conversation and hand the pages to the shared pool"""
+        self.bridge.stop()
+        self.started_at = None
+        for panel in self.panels:
+            self.release_panel(panel)
+        self.panels = []
+        self.bridge.set_panels([])
+    
     def save_conversations_to_pdf(self):
-        """Save both conversations - extract text and save as HTML+PDF"""
+        """Save all panels' conversations - export files plus a PDF rendered in the background"""
         # Ask user for save directory
         save_dir = QFileDialog.getExistingDirectory(
             self,
@@ -892,274 +4149,1003 @@ class MainWindow(QMainWindow):
         self.conversations_extracted = []
         self.chatbots_for_save = self.control_panel.get_selected_chatbots()
         
+        # Prefer the turn journal of the last conversation over re-scraping the pages
+        if self.bridge.journal_path:
+            self.main_window.journal.flush()
+            if os.path.exists(self.bridge.journal_path):
+                self.conversations_extracted = journal_conversations(self.bridge.journal_path)
+                print(f"✓ Exporting from journal {self.bridge.journal_path}")
+                self.save_combined_conversation()
+                return
+        
         self.control_panel.update_status("📄 Extracting conversations...")
+        self.extract_progress = {}  # panel_index -> (messages read, total)
         
         # Extract text from each panel
         for i, panel in enumerate(self.panels):
-            self.extract_conversation_text(i, panel)
-    
-    def extract_conversation_text(self, panel_index, panel):
-        """Extract conversation text using JavaScript"""
-        config = self.chatbots_for_save[panel_index]
-        
-        # JavaScript to extract all messages (generic approach that works across sites)
-        js_code = """
-        (function() {
-            let messages = [];
-            
-            // Try various selectors for different chat interfaces
-            const messageSelectors = [
-                // ChatGPT
-                '[data-message-author-role]',
-                // Claude
-                '.font-claude-message, .font-user-message, [class*="message"]',
-                // Gemini
-                '.model-response-text, .user-query-text, message-content',
-                // DeepSeek
-                '.ds-markdown, .user-message, [class*="message"]',
-                // Generic
-                '[class*="chat"] [class*="message"]',
-                '[role="article"]',
-                '.message, .chat-message'
-            ];
-            
-            let foundElements = [];
-            for (const sel of messageSelectors) {
-                try {
-                    const elements = document.querySelectorAll(sel);
-                    if (elements.length > 0) {
-                        foundElements = Array.from(elements);
-                        break;
-                    }
-                } catch(e) {}
-            }
-            
-            // If no structured messages found, try to get main content
-            if (foundElements.length === 0) {
-                const mainContent = document.querySelector('main, [role="main"], .chat-container, #chat');
-                if (mainContent) {
-                    return JSON.stringify({
-                        messages: [{role: 'content', text: mainContent.innerText}],
-                        raw: mainContent.innerText.substring(0, 50000)
-                    });
-                }
-            }
-            
-            // Extract text from found elements
-            foundElements.forEach((el, idx) => {
-                const text = (el.innerText || el.textContent || '').trim();
-                if (text.length > 10) {
-                    // Try to determine if user or assistant
-                    let role = 'message';
-                    const roleAttr = el.getAttribute('data-message-author-role');
-                    if (roleAttr) {
-                        role = roleAttr;
-                    } else if (el.className.includes('user') || el.className.includes('human')) {
-                        role = 'user';
-                    } else if (el.className.includes('assistant') || el.className.includes('model') || el.className.includes('claude')) {
-                        role = 'assistant';
-                    }
-                    messages.push({role: role, text: text.substring(0, 10000)});
-                }
-            });
-            
-            return JSON.stringify({messages: messages, count: messages.length});
-        })();
-        """
+            self.extract_conversation_text(i, panel)
+    
+    def extract_conversation_text(self, panel_index, panel):
+        """Extract conversation text in batches using the page library (generic approach that works across sites)"""
+        extractor = ConversationExtractor(panel, self)
+        extractor.progress.connect(lambda done, total: self.on_extract_progress(panel_index, done, total))
+        extractor.finished.connect(lambda messages: self.on_conversation_extracted(panel_index, messages))
+        extractor.finished.connect(extractor.deleteLater)
+        extractor.start()
         
-        panel.browser.page().runJavaScript(
-            js_code,
-            lambda result, idx=panel_index: self.on_conversation_extracted(idx, result)
-        )
+    def on_extract_progress(self, panel_index, done, total):
+        self.extract_progress[panel_index] = (done, total)
+        done = sum(count for count, _ in self.extract_progress.values())
+        total = sum(count for _, count in self.extract_progress.values())
+        self.control_panel.update_status(f"📄 Extracting conversations... {done}/{total} messages")
     
-    def on_conversation_extracted(self, panel_index, result):
+    def on_conversation_extracted(self, panel_index, messages):
         """Handle extracted conversation text"""
         config = self.chatbots_for_save[panel_index]
         llm_name = config['name']
-        
-        try:
-            data = json.loads(result) if result else {'messages': [], 'raw': ''}
-            messages = data.get('messages', [])
-            raw_text = data.get('raw', '')
-            
-            # Store the extracted data
-            self.conversations_extracted.append({
-                'index': panel_index,
-                'name': llm_name,
-                'color': config['color'],
-                'messages': messages,
-                'raw': raw_text
-            })
-            
-            print(f"✓ Extracted {len(messages)} messages from {llm_name}")
-            
-        except Exception as e:
-            print(f"✗ Error extracting from {llm_name}: {e}")
-            self.conversations_extracted.append({
-                'index': panel_index,
-                'name': llm_name,
-                'color': config['color'],
-                'messages': [],
-                'raw': ''
-            })
+        self.conversations_extracted.append({
+            'index': panel_index,
+            'name': llm_name,
+            'color': config['color'],
+            'messages': messages,
+            'raw': ''
+        })
+        print(f"✓ Extracted {len(messages)} messages from {llm_name}")
         
         # When all panels are extracted, save the file
         if len(self.conversations_extracted) >= len(self.panels):
             self.save_combined_conversation()
     
     def save_combined_conversation(self):
-        """Save all conversations to a combined HTML file"""
+        """Stream all conversations into one file per configured export format"""
         # Sort by panel index
         self.conversations_extracted.sort(key=lambda x: x['index'])
         
-        # Generate HTML
-        html_content = self.generate_conversation_html()
-        
-        # Save HTML file
-        html_filename = os.path.join(self.save_dir, f"conversation_{self.save_timestamp}.html")
-        
         try:
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"✓ Saved conversation to: {html_filename}")
+            saved = []
+            for fmt in SETTINGS['export_formats']:
+                extension = EXPORT_FORMATS[fmt][0]
+                filename = os.path.join(self.save_dir, f"conversation_{self.save_timestamp}{extension}")
+                export_conversations(self.conversations_extracted, filename, fmt, self.save_timestamp)
+                print(f"✓ Saved conversation to: {filename}")
+                saved.append(filename)
+            
+            if SETTINGS['export_pdf']:
+                # Render the HTML export (or a temporary one) in the background
+                html_filename = os.path.join(self.save_dir, f"conversation_{self.save_timestamp}.html")
+                cleanup = html_filename not in saved
+                if cleanup:
+                    html_filename = self.main_window.write_temp_html(self.conversations_extracted, self.save_timestamp)
+                pdf_filename = os.path.join(self.save_dir, f"conversation_{self.save_timestamp}.pdf")
+                self.main_window.get_pdf_exporter().add(html_filename, pdf_filename, cleanup)
+                return
             
             QMessageBox.information(
                 self,
                 "Conversation Saved",
-                f"Conversation saved to:\n{html_filename}\n\nOpen in browser and print to PDF if needed."
+                "Conversation saved to:\n" + "\n".join(saved)
             )
-            self.control_panel.update_status("✓ Conversation saved as HTML")
+            self.control_panel.update_status(f"✓ Conversation saved as {', '.join(SETTINGS['export_formats']).upper()}")
             
         except Exception as e:
             print(f"✗ Error saving: {e}")
             QMessageBox.warning(self, "Error", f"Failed to save: {e}")
+
+
+class MainWindow(QMainWindow):
+    """Main application window: one tab per debate session"""
+    
+    def __init__(self, profile_startup=False):
+        super().__init__()
+        self.setWindowTitle("AI Brainstorm - LLM ↔ LLM")
+        self.setMinimumSize(1300, 900)
+        
+        # The control panel comes up first; WebEngine and the chat sites load
+        # once the window is showing, one panel at a time
+        self.profile = None
+        self.page_pool = None
+        self.request_filter = None
+        self.pdf_exporter = None  # Created on the first PDF export
+        self.shown = False
+        self.profile_startup = profile_startup
+        self.sessions_created = 0
+        self.journal = TurnJournal()
+        self.stability = StabilityModel()  # Shared, so the tabs don't overwrite each other's learning
+        self.checkpoints = CheckpointStore()
+        self.session_index = SessionIndex()
+        self.search_dialog = None  # Created when first opened
+        self.metrics = TurnMetrics()
+        self.metrics.serve(SETTINGS['metrics_port'])
+        self.setup_ui()
+    
+    def startup_mark(self, label):
+        if self.profile_startup:
+            print(f"[Startup] {time.perf_counter() - STARTUP_T0:6.2f}s  {label}")
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.shown:
+            self.shown = True
+            self.startup_mark("window shown")
+            QTimer.singleShot(SETTINGS['webengine_start_delay_ms'], self.setup_persistent_profile)
+    
+    def setup_persistent_profile(self):
+        if self.profile is not None:
+            return
+        import_webengine()
+        if SETTINGS['request_filter']['enabled']:
+            self.request_filter = RequestFilter()
+            self.metrics.add_collector(self.request_filter.metrics_lines)
+        self.startup_mark("QtWebEngine imported")
+        self.profile = make_profile("brainstorm_profile", STORAGE_DIR, self, self.request_filter)
+        self.page_pool = PagePool(self.profile, SETTINGS['page_pool_size'], SETTINGS['page_pool_memory_mb'], self)
+        self.startup_mark("profile ready")
+        for session in self.sessions():
+            session.load_panels()
+    
+    def setup_ui(self):
+        self.tabs = QTabWidget()
+        self.tabs.setDocumentMode(True)
+        self.tabs.setTabsClosable(True)
+        self.tabs.setStyleSheet("""
+            QTabBar::tab { background: #1a1a24; color: #888; padding: 6px 14px; border: none; font-size: 12px; }
+            QTabBar::tab:selected { background: #2a2a3a; color: white; }
+            QTabBar::tab:hover { color: white; }
+        """)
+        self.tabs.tabCloseRequested.connect(self.close_session)
+        
+        new_session_btn = QPushButton("＋ Session")
+        new_session_btn.setToolTip("Open another debate in a new tab")
+        new_session_btn.setStyleSheet("""
+            QPushButton { background: #2a2a3a; color: white; border: 1px solid #3a3a4a; border-radius: 4px; padding: 4px 10px; font-size: 12px; }
+            QPushButton:hover { border-color: #6366f1; }
+        """)
+        new_session_btn.clicked.connect(self.add_session)
+        self.tabs.setCornerWidget(new_session_btn, Qt.Corner.TopRightCorner)
+        self.setCentralWidget(self.tabs)
+        
+        self.scheduler = SessionScheduler(self.tabs, SETTINGS['max_active_sessions'], self)
+        self.add_session()
+        self.tabs.currentChanged.connect(lambda index: self.scheduler.update())
+        
+        self.statusBar().hide()
+        self.setStyleSheet("QMainWindow { background: #0f0f14; }")
+    
+    def sessions(self):
+        return self.scheduler.sessions()
+    
+    def current_session(self):
+        return self.tabs.currentWidget()
+    
+    def add_session(self):
+        self.sessions_created += 1
+        session = SessionTab(self, self.sessions_created)
+        session.session_changed.connect(self.scheduler.update)
+        self.tabs.setCurrentIndex(self.tabs.addTab(session, session.title()))
+        if self.profile is not None:
+            session.load_panels()
+        return session
+    
+    def resume_session(self):
+        """Pick an interrupted conversation and continue it, in a new tab if this one is busy"""
+        running = {session.bridge.session_id for session in self.sessions() if session.started_at is not None}
+        checkpoints = [checkpoint for checkpoint in self.checkpoints.load_all() if checkpoint['session'] not in running]
+        if not checkpoints:
+            QMessageBox.information(self, "Resume Session", "There is no interrupted conversation to resume.")
+            return
+        labels = [
+            f"{checkpoint['saved']}  {' ↔ '.join(checkpoint['models'])}: {next(iter(checkpoint['prompts']), '')[:60]}"
+            for checkpoint in checkpoints
+        ]
+        label, ok = QInputDialog.getItem(self, "Resume Session", "Interrupted conversations:", labels, 0, False)
+        if not ok:
+            return
+        checkpoint = checkpoints[labels.index(label)]
+        unknown = [name for name in checkpoint['models'] if name not in AVAILABLE_CHATBOTS]
+        if unknown:
+            QMessageBox.warning(self, "Resume Session", f"Unknown chatbots in this conversation: {', '.join(unknown)}")
+            return
+        
+        session = self.current_session()
+        if session.started_at is not None:
+            session = self.add_session()
+        session.resume_checkpoint(checkpoint)
+        
+    def show_search(self):
+        if self.search_dialog is None:
+            running = {session.bridge.journal_path for session in self.sessions() if session.started_at is not None}
+            self.session_index.backfill(skip=running)  # Journals from before the index existed
+            self.search_dialog = SearchDialog(self.session_index, self)
+            self.search_dialog.open_session.connect(self.open_indexed_session)
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.activateWindow()
+        
+    def open_indexed_session(self, journal_path):
+        """Show a search result's whole debate, rendered like an HTML export"""
+        if not os.path.exists(journal_path):
+            QMessageBox.warning(self, "Search", f"The journal no longer exists:\n{journal_path}")
+            return
+        title = os.path.splitext(os.path.basename(journal_path))[0]
+        QDesktopServices.openUrl(QUrl.fromLocalFile(self.write_temp_html(journal_conversations(journal_path), title)))
+        
+    def close_session(self, index):
+        if self.tabs.count() == 1:
+            return  # Keep one session open
+        session = self.tabs.widget(index)
+        session.close_session()
+        self.tabs.removeTab(index)
+        session.deleteLater()
+        self.scheduler.update()
+    
+    def get_pdf_exporter(self):
+        if self.pdf_exporter is None:
+            self.setup_persistent_profile()
+            self.pdf_exporter = PdfExporter(self)
+            self.pdf_exporter.progress.connect(lambda message: self.current_session().control_panel.update_status(message))
+            self.pdf_exporter.finished.connect(self.on_pdfs_exported)
+        return self.pdf_exporter
+    
+    def closeEvent(self, event):
+        self.journal.flush()  # Don't lose the last batch of journal records
+        for line in self.metrics.summary_lines():
+            print(line)
+        if self.request_filter:
+            print(self.request_filter.summary())
+        super().closeEvent(event)
+    
+    def write_temp_html(self, conversations, title):
+        """Render conversations to a temporary HTML file (PDF source)"""
+        fd, path = tempfile.mkstemp(prefix="brainstorm_", suffix=".html")
+        os.close(fd)
+        return export_conversations(conversations, path, "html", title)
+        
+    def export_saved_sessions_to_pdf(self):
+        """Batch-convert saved HTML conversations and journal sessions to PDF"""
+        start_dir = JOURNAL_DIR if os.path.isdir(JOURNAL_DIR) else os.path.expanduser("~")
+        files, _ = QFileDialog.getOpenFileNames(
+            self, "Select Conversations to Export", start_dir, "Conversations (*.html *.jsonl)"
+        )
+        if not files:
+            return
+        out_dir = QFileDialog.getExistingDirectory(
+            self, "Select Directory for the PDFs", os.path.expanduser("~"), QFileDialog.Option.ShowDirsOnly
+        )
+        if not out_dir:
+            return
+        
+        for path in files:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            pdf_path = os.path.join(out_dir, f"{stem}.pdf")
+            if path.endswith(".html"):
+                self.get_pdf_exporter().add(path, pdf_path)
+                continue
+            try:
+                conversations = journal_conversations(path)
+                if conversations:
+                    self.get_pdf_exporter().add(self.write_temp_html(conversations, stem), pdf_path, cleanup=True)
+                else:
+                    print(f"✗ Not a journal session: {path}")
+            except Exception as e:
+                print(f"✗ Error reading {path}: {e}")
+                
+    def on_pdfs_exported(self, pdf_paths):
+        if not pdf_paths:
+            self.current_session().control_panel.update_status("✗ PDF export failed")
+            QMessageBox.warning(self, "Error", "No PDF could be written - see the console for details.")
+            return
+        self.current_session().control_panel.update_status(f"✓ Saved {len(pdf_paths)} PDF(s)")
+        listed = "\n".join(pdf_paths[:10]) + (f"\n... and {len(pdf_paths) - 10} more" if len(pdf_paths) > 10 else "")
+        QMessageBox.information(self, "PDF Saved", "PDF saved to:\n" + listed)
+
+
+BATCH_WIND_DOWN_GRACE_S = 300  # Time for the closing summaries after a debate's budget runs out
+
+
+def batch_profile(slot, parent=None, request_filter=None):
+    """The persistent profile of a concurrent batch slot (see `batch --login`)"""
+    storage = os.path.join(STORAGE_DIR, "batch", f"slot_{slot}")
+    return make_profile(f"brainstorm_batch_{slot}", storage, parent, request_filter)
+
+
+class BatchSession(QObject):
+    """One unattended debate with its own profile, panels and bridge"""
+    finished = pyqtSignal(object)  # the session
+    
+    def __init__(self, job, slot, profile, options, journal, metrics, stability, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.slot = slot
+        self.options = options
+        self.turns = []
+        self.status = "running"
+        self.started = False
+        self.start_time = time.time()
+        self.chatbots = [AVAILABLE_CHATBOTS[name] for name in job['models']]
+        
+        # Offscreen "window" so the pages render and their timers are not throttled
+        self.container = QWidget()
+        layout = QHBoxLayout(self.container)
+        self.panels = [BrowserPanel(config, profile) for config in self.chatbots]
+        for panel in self.panels:
+            layout.addWidget(panel)
+        self.container.resize(650 * len(self.panels), 900)
+        self.container.show()
+        
+        self.bridge = ChatBridge()
+        self.bridge.set_panels(self.panels)
+        self.bridge.set_chatbot_getter(lambda: self.chatbots)
+        self.bridge.set_journal(journal)
+        self.bridge.set_stability(stability)
+        self.bridge.turn_event.connect(
+            lambda panel_index, event, details: metrics.observe(panel_index, event, details, session=job['id'])
+        )
+        self.bridge.turn_completed.connect(self.on_turn_completed)
+        # The budget ends a debate after its closing summaries; the deadline is only the hard stop
+        self.bridge.conversation_ended.connect(
+            lambda reason: self.finish("completed" if reason == "budget" else reason)
+        )
+        self.lifecycle = PanelLifecycle(self.bridge, parent=self)
+        
+        self.loaded = 0
+        for panel in self.panels:
+            panel.browser.loadFinished.connect(self.on_panel_loaded)
+        QTimer.singleShot(30000, self.start)  # Start anyway if a page never finishes loading
+        
+        self.deadline = QTimer(self)
+        self.deadline.setSingleShot(True)
+        self.deadline.timeout.connect(lambda: self.finish("timeout"))
+        self.deadline.start(int((options.timeout + BATCH_WIND_DOWN_GRACE_S) * 1000))
+        
+    def on_panel_loaded(self, ok):
+        self.loaded += 1
+        if self.loaded == len(self.panels):
+            QTimer.singleShot(2000, self.start)  # Let the chat apps finish booting
+            
+    def start(self):
+        if self.started or self.status != "running":
+            return
+        self.started = True
+        print(f"[Batch {self.job['id']}] Starting '{self.job['name']}' on slot {self.slot}")
+        budget = dict(SETTINGS['budget'], max_rounds=self.options.max_rounds,
+                      max_seconds=self.options.timeout, max_chars=self.options.max_chars)
+        self.bridge.start(self.job['prompts'], self.options.topology, budget)
+        
+    def on_turn_completed(self, panel_index, text):
+        self.turns.append({
+            'panel': panel_index,
+            'model': self.chatbots[panel_index]['name'],
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'text': text,
+        })
+            
+    def finish(self, status):
+        if self.status != "running":
+            return
+        self.status = status
+        self.deadline.stop()
+        self.bridge.stop()
+        self.write_transcript()
+        self.container.deleteLater()
+        print(f"[Batch {self.job['id']}] {status} after {len(self.turns)} turns")
+        self.finished.emit(self)
+        
+    def write_transcript(self):
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', self.job['name']).strip('_').lower() or "job"
+        path = os.path.join(self.options.output, f"{self.job['id']:03d}_{slug}.json")
+        transcript = {
+            'example': self.job['name'],
+            'models': self.job['models'],
+            'topology': self.options.topology,
+            'status': self.status,
+            'started': datetime.fromtimestamp(self.start_time).isoformat(timespec='seconds'),
+            'elapsed_s': round(time.time() - self.start_time, 1),
+            'journal': self.bridge.journal_path,
+            'turns': self.turns,
+        }
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(transcript, f, ensure_ascii=False, indent=2)
+            print(f"✓ Transcript saved to: {path}")
+        except Exception as e:
+            print(f"✗ Error saving transcript: {e}")
+
+
+class BatchRunner(QObject):
+    """Runs a queue of example debates headless, at most `concurrency` at a time"""
+    
+    def __init__(self, options, parent=None):
+        super().__init__(parent)
+        self.options = options
+        self.jobs = deque(self.load_jobs())
+        self.total = len(self.jobs)
+        self.free_slots = list(range(options.concurrency))
+        self.profiles = {}  # slot -> profile; one logged-in profile per concurrent session
+        self.running = []
+        self.results = []
+        self.journal = TurnJournal()
+        self.stability = StabilityModel()  # Shared by the concurrent debates
+        self.session_index = SessionIndex()
+        self.metrics = TurnMetrics()
+        self.metrics.serve(SETTINGS['metrics_port'])
+        self.request_filter = RequestFilter() if SETTINGS['request_filter']['enabled'] else None
+        if self.request_filter:
+            self.metrics.add_collector(self.request_filter.metrics_lines)
+        os.makedirs(options.output, exist_ok=True)
+        
+    def load_jobs(self):
+        with open(self.options.examples, 'r') as f:
+            examples = json.load(f).get('examples', [])
+        models = self.options.models.split(',') if self.options.models else None
+        jobs = []
+        for i, ex in enumerate(examples):
+            prompts = example_prompts(ex)
+            requested = models or ex.get('models')
+            job_models = (requested or [config['name'] for config in CHATBOTS])[:max(len(prompts), MIN_PANELS)]
+            if requested and len(requested) > len(job_models):
+                print(f"[Batch] '{ex.get('name')}' has {len(prompts)} prompt(s): "
+                      f"leaving out {', '.join(requested[len(job_models):])}")
+            unknown = [name for name in job_models if name not in AVAILABLE_CHATBOTS]
+            if unknown:
+                print(f"[Batch] Skipping '{ex.get('name')}': unknown chatbots {unknown}")
+                continue
+            if len(job_models) < MIN_PANELS:
+                print(f"[Batch] Skipping '{ex.get('name')}': a debate needs at least {MIN_PANELS} chatbots")
+                continue
+            jobs.append({
+                'id': i + 1,
+                'name': ex.get('name', f"Example {i + 1}"),
+                'prompts': prompts,
+                'models': job_models,
+            })
+        return jobs
     
-    def generate_conversation_html(self):
-        """Generate a nicely formatted HTML document"""
-        chatbots = self.chatbots_for_save
+    def profile_for(self, slot):
+        if slot not in self.profiles:
+            self.profiles[slot] = batch_profile(slot, self, self.request_filter)
+        return self.profiles[slot]
         
-        html = f"""<!DOCTYPE html>
+    def start(self):
+        print(f"[Batch] {self.total} jobs, concurrency {self.options.concurrency}, output: {self.options.output}")
+        self.fill_slots()
+        
+    def fill_slots(self):
+        while self.free_slots and self.jobs:
+            slot = self.free_slots.pop(0)
+            job = self.jobs.popleft()
+            session = BatchSession(job, slot, self.profile_for(slot), self.options, self.journal,
+                                   self.metrics, self.stability, self)
+            session.finished.connect(self.on_session_finished)
+            session.bridge.session_finished.connect(lambda path: self.session_index.add(path, self.journal))
+            self.running.append(session)
+            
+        if not self.running and not self.jobs:
+            # A debate that converged or looped has finished, just earlier than max_rounds
+            completed = sum(1 for status in self.results if status in ("completed", "converged", "loop"))
+            print(f"[Batch] Done: {completed}/{self.total} completed, transcripts in {self.options.output}")
+            self.journal.flush()
+            self.session_index.queue.join()  # Finish indexing before the process exits
+            for line in self.metrics.summary_lines():
+                print(line)
+            if self.request_filter:
+                print(self.request_filter.summary())
+            QApplication.instance().quit()
+            
+    def on_session_finished(self, session):
+        self.running.remove(session)
+        self.results.append(session.status)
+        self.free_slots.append(session.slot)
+        session.deleteLater()
+        self.fill_slots()
+
+
+# Local stand-ins for the chat sites, reproducing each site's selectors from
+# AVAILABLE_CHATBOTS. Query parameters control the simulated streaming:
+# tps (tokens/s), tokens (per reply), think_ms, stall_ms + stall_every, marker (0/1)
+MOCK_SITE_PATHS = {
+    "ChatGPT": "chatgpt",
+    "DeepSeek": "deepseek",
+    "Gemini": "gemini",
+    "Claude": "claude",
+}
+
+MOCK_PAGE_HTML = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>AI Brainstorm Conversation - {self.save_timestamp}</title>
+    <title>Mock chat</title>
     <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #1a1a2e;
-            color: #eee;
-        }}
-        h1 {{
-            text-align: center;
-            color: #fff;
-            border-bottom: 2px solid #333;
-            padding-bottom: 20px;
-        }}
-        .panels {{
-            display: flex;
-            gap: 20px;
-        }}
-        .panel {{
-            flex: 1;
-            background: #16213e;
-            border-radius: 10px;
-            padding: 20px;
-        }}
-        .panel-header {{
-            font-size: 18px;
-            font-weight: bold;
-            margin-bottom: 15px;
-            padding-bottom: 10px;
-            border-bottom: 2px solid;
-        }}
-        .message {{
-            margin: 10px 0;
-            padding: 12px;
-            border-radius: 8px;
-            background: #1a1a2e;
-        }}
-        .message.user {{
-            background: #2d4a7c;
-            border-left: 3px solid #5b8dee;
-        }}
-        .message.assistant {{
-            background: #1e3a3a;
-            border-left: 3px solid #4ecdc4;
-        }}
-        .role {{
-            font-size: 11px;
-            text-transform: uppercase;
-            color: #888;
-            margin-bottom: 5px;
-        }}
-        .text {{
-            white-space: pre-wrap;
-            line-height: 1.5;
-        }}
-        .timestamp {{
-            text-align: center;
-            color: #666;
-            margin-top: 30px;
-            font-size: 12px;
-        }}
+        body { font-family: sans-serif; background: #202123; color: #eee; margin: 0; padding: 16px; }
+        #thread { min-height: 60vh; }
+        .turn { margin: 8px 0 16px; }
+        .user-message, [data-message-author-role='user'] { color: #9cf; margin: 8px 0; }
+        .reply { white-space: pre-wrap; }
+        #composer { position: sticky; bottom: 0; background: #202123; padding: 8px 0; display: flex; gap: 8px; }
+        textarea, [contenteditable] { flex: 1; min-height: 40px; background: #40414f; color: #eee; border: 1px solid #555; padding: 6px; }
     </style>
 </head>
 <body>
-    <h1>🧠 AI Brainstorm Conversation</h1>
-    <div class="panels">
+    <div id="thread"></div>
+    <div id="composer"></div>
+<script>
+const MOCK = __MOCK_CONFIG__;
+
+const SITES = {
+    chatgpt: {
+        composer: '<textarea id="prompt-textarea"></textarea>' +
+                  '<button data-testid="send-button" aria-label="Send prompt">Send</button>',
+        user: el => el.setAttribute('data-message-author-role', 'user'),
+        reply: el => el.setAttribute('data-message-author-role', 'assistant'),
+        done: (el, turn) => {
+            const copy = document.createElement('button');
+            copy.setAttribute('data-testid', 'copy-turn-action-button');
+            copy.setAttribute('aria-label', 'Copy');
+            copy.textContent = 'Copy';
+            turn.appendChild(copy);
+        }
+    },
+    deepseek: {
+        composer: '<textarea placeholder="Message DeepSeek"></textarea><div role="button">Send</div>',
+        user: el => el.className = 'user-message',
+        reply: el => el.className = 'ds-markdown',
+        done: (el, turn) => {}
+    },
+    gemini: {
+        composer: '<rich-textarea><div class="ql-editor" contenteditable="true"></div></rich-textarea>' +
+                  '<button aria-label="Send message" class="send-button">Send</button>',
+        user: el => el.className = 'user-query-text',
+        reply: el => el.className = 'model-response-text',
+        done: (el, turn) => {}
+    },
+    claude: {
+        composer: '<fieldset><div contenteditable="true" class="ProseMirror"></div></fieldset>' +
+                  '<button aria-label="Send Message" type="submit">Send</button>',
+        user: el => el.className = 'font-user-message',
+        reply: el => { el.className = 'font-claude-message'; el.setAttribute('data-is-streaming', 'true'); },
+        done: (el, turn) => el.setAttribute('data-is-streaming', 'false')
+    }
+};
+
+const WORDS = ('the argument rests on a premise that deserves scrutiny because evidence from ' +
+               'history suggests otherwise and yet my counterpart raises a fair point about ' +
+               'incentives costs risks and the long run consequences of each choice').split(' ');
+
+const site = SITES[MOCK.site];
+const thread = document.getElementById('thread');
+const composer = document.getElementById('composer');
+composer.innerHTML = site.composer;
+const input = composer.querySelector('textarea, [contenteditable]');
+const sendButton = composer.querySelector('button, [role="button"]');
+
+// Per-turn timeline (epoch ms), read back by the benchmark
+window.__mock = {turns: []};
+let busy = false;
+
+function readInput() {
+    return (input.value !== undefined ? input.value : input.innerText).trim();
+}
+
+function clearInput() {
+    if (input.value !== undefined) input.value = '';
+    else input.innerHTML = '';
+}
+
+function submit() {
+    const text = readInput();
+    if (!text || busy) return;
+    const record = {sentAt: Date.now(), firstTokenAt: 0, lastTokenAt: 0, tokens: 0, chars: 0};
+    window.__mock.turns.push(record);
+    clearInput();
+
+    const turn = document.createElement('article');
+    turn.className = 'turn';
+    turn.setAttribute('data-testid', 'conversation-turn-' + window.__mock.turns.length);
+    const userEl = document.createElement('div');
+    site.user(userEl);
+    userEl.textContent = text;
+    turn.appendChild(userEl);
+    thread.appendChild(turn);
+    streamReply(turn, record);
+}
+
+function streamReply(turn, record) {
+    busy = true;
+    let stop = null;
+    if (MOCK.marker) {
+        stop = document.createElement('button');
+        stop.setAttribute('aria-label', 'Stop generating');
+        stop.setAttribute('data-testid', 'stop-button');
+        stop.textContent = 'Stop';
+        composer.appendChild(stop);
+    }
+
+    const reply = document.createElement('div');
+    reply.classList.add('reply');
+    site.reply(reply);
+    reply.classList.add('reply');
+    const textNode = document.createTextNode('');
+    reply.appendChild(textNode);
+    turn.appendChild(reply);
+
+    // Deterministic words per turn
+    let seed = window.__mock.turns.length * 7919;
+    let emitted = 0;
+    function step() {
+        seed = (seed * 1103515245 + 12345) % 2147483648;
+        const word = WORDS[seed % WORDS.length];
+        textNode.appendData((emitted ? ' ' : '') + word);
+        emitted++;
+        const now = Date.now();
+        if (emitted === 1) record.firstTokenAt = now;
+        if (emitted >= MOCK.tokens) {
+            record.lastTokenAt = now;
+            record.tokens = emitted;
+            record.chars = textNode.length;
+            if (MOCK.marker) {
+                site.done(reply, turn);
+                stop.remove();
+            }
+            busy = false;
+            return;
+        }
+        let delay = 1000 / MOCK.tps;
+        if (MOCK.stall_every && emitted % MOCK.stall_every === 0) delay += MOCK.stall_ms;
+        setTimeout(step, delay);
+    }
+    setTimeout(step, MOCK.think_ms);
+}
+
+sendButton.addEventListener('click', submit);
+input.addEventListener('keydown', e => {
+    if (e.key === 'Enter' && !e.shiftKey) {
+        e.preventDefault();
+        submit();
+    }
+});
+</script>
+</body>
+</html>
 """
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    """Serves MOCK_PAGE_HTML for /chatgpt, /deepseek, /gemini and /claude"""
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        site = url.path.strip('/')
+        if site not in MOCK_SITE_PATHS.values():
+            self.send_error(404)
+            return
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        config = {
+            'site': site,
+            'tps': float(params.get('tps', 40)),
+            'tokens': int(params.get('tokens', 150)),
+            'think_ms': int(params.get('think_ms', 300)),
+            'stall_ms': int(params.get('stall_ms', 0)),
+            'stall_every': int(params.get('stall_every', 0)),
+            'marker': params.get('marker', '1') != '0',
+        }
+        body = MOCK_PAGE_HTML.replace('__MOCK_CONFIG__', json.dumps(config)).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
         
-        for conv in self.conversations_extracted:
-            html += f"""
-        <div class="panel">
-            <div class="panel-header" style="border-color: {conv['color']}; color: {conv['color']};">
-                {conv['name']}
-            </div>
-"""
+    def log_message(self, format, *args):
+        pass  # Keep the console for the bridge's own output
+
+
+def start_mock_server(port=0):
+    """Serve the mock chat sites on localhost from a daemon thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockChatHandler)
+    threading.Thread(target=server.serve_forever, name="mock-chat-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def mock_chatbot_config(name, base_url, query):
+    """A copy of a chatbot config pointing at its local mock site"""
+    return dict(AVAILABLE_CHATBOTS[name], url=f"{base_url}/{MOCK_SITE_PATHS[name]}?{query}")
+
+
+def process_cpu_ms(pid):
+    """User+system CPU time of a process in ms (Linux /proc), or None"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) * 1000 / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class TurnBenchmark(QObject):
+    """Measures turn detection and forwarding latency against the local mock sites"""
+    
+    def __init__(self, options, base_url, parent=None):
+        super().__init__(parent)
+        self.options = options
+        self.events = []  # (panel, event, epoch ms)
+        self.completed = 0
+        self.started = False
+        self.finished = False
+        self.timelines = {}
+        
+        query = urlencode({
+            'tps': options.tps, 'tokens': options.tokens, 'think_ms': options.think_ms,
+            'stall_ms': options.stall_ms, 'stall_every': options.stall_every,
+            'marker': 0 if options.no_marker else 1,
+        })
+        self.chatbots = [mock_chatbot_config(name, base_url, query) for name in options.models.split(',')]
+        
+        self.profile = QWebEngineProfile(self)  # Off-the-record
+        install_argue_library(self.profile)
+        self.container = QWidget()
+        layout = QHBoxLayout(self.container)
+        self.panels = [BrowserPanel(config, self.profile) for config in self.chatbots]
+        for panel in self.panels:
+            layout.addWidget(panel)
+        self.container.resize(650 * len(self.panels), 900)
+        self.container.show()
+        
+        self.bridge = ChatBridge()
+        self.bridge.set_panels(self.panels)
+        self.bridge.set_chatbot_getter(lambda: self.chatbots)
+        self.bridge.convergence = None  # Mock replies repeat by design; the benchmark sets the length
+        self.bridge.set_stability(StabilityModel(path=None))  # Mock timings must not train the real models
+        self.bridge.turn_event.connect(self.on_turn_event)
+        self.bridge.turn_completed.connect(self.on_turn_completed)
+        
+        self.loaded = 0
+        for panel in self.panels:
+            panel.browser.loadFinished.connect(self.on_panel_loaded)
             
-            if conv['messages']:
-                for msg in conv['messages']:
-                    role_class = msg['role'] if msg['role'] in ['user', 'assistant'] else 'message'
-                    role_display = msg['role'].upper()
-                    text = msg['text'].replace('<', '&lt;').replace('>', '&gt;')
-                    html += f"""
-            <div class="message {role_class}">
-                <div class="role">{role_display}</div>
-                <div class="text">{text}</div>
-            </div>
-"""
-            elif conv['raw']:
-                text = conv['raw'].replace('<', '&lt;').replace('>', '&gt;')
-                html += f"""
-            <div class="message">
-                <div class="text">{text}</div>
-            </div>
-"""
-            else:
-                html += """
-            <div class="message">
-                <div class="text">(No conversation content extracted)</div>
-            </div>
-"""
+    def on_panel_loaded(self, ok):
+        self.loaded += 1
+        if self.loaded == len(self.panels) and not self.started:
+            self.started = True
+            QTimer.singleShot(500, self.start)
             
-            html += """
-        </div>
-"""
+    def start(self):
+        print(f"[Bench] {self.options.turns} turns, {', '.join(c['name'] for c in self.chatbots)}, "
+              f"mode={SETTINGS['detection_mode']}, {self.options.tps} tok/s x {self.options.tokens}")
+        self.cpu_start = self.cpu_snapshot()
+        self.wall_start = time.time()
+        prompts = ["Benchmark: open the debate."] + ["Benchmark: answer."] * (len(self.panels) - 1)
+        self.bridge.start(prompts)
         
-        html += f"""
-    </div>
-    <div class="timestamp">Saved: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</div>
-</body>
-</html>
-"""
-        return html
+    def cpu_snapshot(self):
+        """(python CPU ms, renderer CPU ms or None)"""
+        renderer = 0
+        for pid in {panel.browser.page().renderProcessPid() for panel in self.panels}:
+            cpu = process_cpu_ms(pid) if pid > 0 else None
+            if cpu is None:
+                renderer = None
+                break
+            renderer += cpu
+        return time.process_time() * 1000, renderer
+        
+    def on_turn_event(self, panel_index, event, details):
+        self.events.append((panel_index, event, time.time() * 1000))
+        
+    def on_turn_completed(self, panel_index, text):
+        self.completed += 1
+        if self.completed >= self.options.turns and not self.finished:
+            self.finished = True
+            QTimer.singleShot(0, self.finish)  # After the bridge has forwarded this turn
+            
+    def finish(self):
+        self.cpu_end = self.cpu_snapshot()
+        self.wall_end = time.time()
+        self.bridge.stop()
+        for i, panel in enumerate(self.panels):
+            # The mock's timeline lives in the main world
+            panel.browser.page().runJavaScript(
+                "JSON.stringify(window.__mock ? window.__mock.turns : [])",
+                lambda result, idx=i: self.on_timeline(idx, result)
+            )
+            
+    def on_timeline(self, panel_index, result):
+        self.timelines[panel_index] = json.loads(result) if result else []
+        if len(self.timelines) == len(self.panels):
+            self.report()
+            QApplication.instance().quit()
+            
+    def collect_turns(self):
+        """Join the bridge's events with the pages' token timestamps, turn by turn"""
+        turns = []
+        for panel_index in range(len(self.panels)):
+            events = [(event, ts) for p, event, ts in self.events if p == panel_index]
+            sent = [ts for event, ts in events if event == 'sent']
+            detected_forwarded = []
+            last_complete = None
+            for event, ts in events:
+                if event == 'complete':
+                    last_complete = ts
+                elif event == 'forwarded' and last_complete is not None:
+                    detected_forwarded.append((last_complete, ts))
+            for k, page_turn in enumerate(self.timelines.get(panel_index, [])):
+                if k >= len(sent) or k >= len(detected_forwarded) or not page_turn['lastTokenAt']:
+                    continue
+                detected, forwarded = detected_forwarded[k]
+                turns.append({
+                    'panel': panel_index,
+                    'model': self.chatbots[panel_index]['name'],
+                    'chars': page_turn['chars'],
+                    'send_to_first_token_ms': page_turn['firstTokenAt'] - sent[k],
+                    'last_token_to_detected_ms': detected - page_turn['lastTokenAt'],
+                    'detected_to_forwarded_ms': forwarded - detected,
+                })
+        return turns
+        
+    def report(self):
+        turns = self.collect_turns()
+        n = max(1, len(turns))
+        python_cpu = (self.cpu_end[0] - self.cpu_start[0]) / n
+        renderer_cpu = None
+        if self.cpu_start[1] is not None and self.cpu_end[1] is not None:
+            renderer_cpu = (self.cpu_end[1] - self.cpu_start[1]) / n
+            
+        print(f"\n[Bench] {len(turns)} measured turns in {self.wall_end - self.wall_start:.1f}s "
+              f"(mode={SETTINGS['detection_mode']})")
+        print(f"{'metric':<28}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}")
+        summary = {}
+        for key, label in (
+            ('send_to_first_token_ms', 'send → first token'),
+            ('last_token_to_detected_ms', 'last token → detected'),
+            ('detected_to_forwarded_ms', 'detected → forwarded'),
+        ):
+            values = [turn[key] for turn in turns]
+            stats = {
+                'mean': sum(values) / len(values) if values else 0,
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'max': max(values) if values else 0,
+            }
+            summary[key] = stats
+            print(f"{label + ' (ms)':<28}" + "".join(f"{stats[s]:>10.0f}" for s in ('mean', 'p50', 'p95', 'max')))
+        print(f"CPU per turn: python {python_cpu:.0f} ms, renderer "
+              + (f"{renderer_cpu:.0f} ms" if renderer_cpu is not None else "n/a"))
+        
+        if self.options.output:
+            with open(self.options.output, 'w') as f:
+                json.dump({
+                    'options': vars(self.options),
+                    'detection_mode': SETTINGS['detection_mode'],
+                    'summary': summary,
+                    'cpu_per_turn_ms': {'python': python_cpu, 'renderer': renderer_cpu},
+                    'turns': turns,
+                }, f, indent=2)
+            print(f"✓ Benchmark results saved to: {self.options.output}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="AI Brainstorm Panel - LLM ↔ LLM auto-conversation")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print time-to-window and time-to-ready of each panel")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    batch = subparsers.add_parser("batch", help="Run debates from an examples file headless and unattended")
+    batch.add_argument("--examples", default=EXAMPLES_FILE, help="Examples JSON file (default: examples.json)")
+    batch.add_argument("--concurrency", type=int, default=2, help="Debates running at the same time")
+    batch.add_argument("--max-rounds", type=int, default=10, help="Rounds per debate (each panel answers once per round)")
+    batch.add_argument("--timeout", type=float, default=1800,
+                       help="Wall-clock budget per debate in seconds (closing summaries may take a few minutes more)")
+    batch.add_argument("--max-chars", type=int, default=0, help="Characters sent plus received per debate, 0 = unlimited")
+    batch.add_argument("--models", default="", help="Comma-separated chatbots, overrides the examples (e.g. ChatGPT,Claude)")
+    batch.add_argument("--topology", default="round_robin", choices=list(TOPOLOGIES.keys()))
+    batch.add_argument("--output", default=os.path.join(STORAGE_DIR, "batch", datetime.now().strftime("%Y%m%d_%H%M%S")),
+                       help="Directory for the per-debate transcripts")
+    batch.add_argument("--login", action="store_true",
+                       help="Open each slot's browser profile in a window to log in to the chat sites, then exit")
+    
+    bench = subparsers.add_parser("bench", help="Measure turn detection latency against local mock chat sites")
+    bench.add_argument("--models", default="ChatGPT,DeepSeek", help="Comma-separated chatbots to imitate")
+    bench.add_argument("--turns", type=int, default=10, help="Completed responses to measure")
+    bench.add_argument("--mode", choices=["observer", "poll"], default=SETTINGS['detection_mode'],
+                       help="Completion detection strategy")
+    bench.add_argument("--tps", type=float, default=40, help="Mock streaming speed in tokens per second")
+    bench.add_argument("--tokens", type=int, default=150, help="Tokens per mock reply")
+    bench.add_argument("--think-ms", type=int, default=300, help="Mock delay before the first token")
+    bench.add_argument("--stall-ms", type=int, default=0, help="Length of simulated mid-reply stalls")
+    bench.add_argument("--stall-every", type=int, default=0, help="Stall after every N tokens (0 = never)")
+    bench.add_argument("--no-marker", action="store_true", help="Mock sites show no streaming/completion markers")
+    bench.add_argument("--output", default="", help="Also write the results as JSON")
+    
+    mock = subparsers.add_parser("mock", help="Serve the mock chat sites for manual testing")
+    mock.add_argument("--port", type=int, default=8765)
+    
+    # Unknown arguments are left for Qt
+    options, qt_args = parser.parse_known_args(argv)
+    if options.command == "bench":
+        unknown = [name for name in options.models.split(',') if name not in MOCK_SITE_PATHS]
+        if unknown:
+            parser.error(f"no mock site for: {', '.join(unknown)}")
+    if options.command == "batch":
+        if options.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        models = [name for name in options.models.split(',') if name]
+        unknown = [name for name in models if name not in AVAILABLE_CHATBOTS]
+        if unknown:
+            parser.error(f"unknown chatbots: {', '.join(unknown)} (choose from {', '.join(AVAILABLE_CHATBOTS)})")
+        if models and len(models) < MIN_PANELS and not options.login:
+            parser.error(f"--models needs at least {MIN_PANELS} chatbots for a debate")
+    return options, qt_args
+
+
+def run_batch(options, qt_args):
+    if options.login:
+        return run_batch_login(options, qt_args)
+    # Headless: no window system needed
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import_webengine()
+    app = QApplication([sys.argv[0]] + qt_args)
+    
+    runner = BatchRunner(options)
+    if not runner.total:
+        print(f"No examples found in {options.examples}")
+        return 1
+    QTimer.singleShot(0, runner.start)
+    return app.exec()
+
+
+def run_batch_login(options, qt_args):
+    """One tab per batch slot showing the chat sites in that slot's profile; logins are
+    kept when the window is closed"""
+    import_webengine()
+    app = QApplication([sys.argv[0]] + qt_args)
+    names = options.models.split(',') if options.models else list(AVAILABLE_CHATBOTS)
+    tabs = QTabWidget()
+    tabs.setWindowTitle("AI Brainstorm - log in to each batch slot, then close this window")
+    for slot in range(options.concurrency):
+        profile = batch_profile(slot, app)  # Outlives the pages shown in it
+        page = QWidget()
+        layout = QHBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        for name in names:
+            layout.addWidget(BrowserPanel(AVAILABLE_CHATBOTS[name], profile))
+        tabs.addTab(page, f"Slot {slot}")
+    tabs.resize(min(650 * len(names), 1900), 900)
+    tabs.show()
+    return app.exec()
+
+
+def run_bench(options, qt_args):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    SETTINGS['detection_mode'] = options.mode
+    import_webengine()
+    app = QApplication([sys.argv[0]] + qt_args)
+    server, base_url = start_mock_server()
+    TurnBenchmark(options, base_url, app)  # Owned by the app until it quits
+    code = app.exec()
+    server.shutdown()
+    return code
+
+
+def run_mock_server(options):
+    server, base_url = start_mock_server(options.port)
+    for name, path in MOCK_SITE_PATHS.items():
+        print(f"{name:<10} {base_url}/{path}?tps=40&tokens=150")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
 
 
 def main():
-    app = QApplication(sys.argv)
+    options, qt_args = parse_args(sys.argv[1:])
+    if options.command == "batch":
+        sys.exit(run_batch(options, qt_args))
+    if options.command == "bench":
+        sys.exit(run_bench(options, qt_args))
+    if options.command == "mock":
+        sys.exit(run_mock_server(options))
+    
+    # Lets QtWebEngine be imported after the QApplication exists
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication([sys.argv[0]] + qt_args)
     app.setStyle('Fusion')
     
     palette = QPalette()
@@ -1169,7 +5155,7 @@ def main():
     palette.setColor(QPalette.ColorRole.Text, QColor(255, 255, 255))
     app.setPalette(palette)
     
-    window = MainWindow()
+    window = MainWindow(profile_startup=options.profile_startup)
     window.show()
     
     sys.exit(app.exec())
@@ -0,0 +1,19 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# brainstorm_app reads settings, adapters and learned state from ~/.brainstorm_panel
+# when it is imported: give the tests an empty home of their own
+HOME = tempfile.mkdtemp(prefix="brainstorm-tests-")
+os.environ["HOME"] = HOME
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+atexit.register(shutil.rmtree, HOME, ignore_errors=True)
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+
+@pytest.fixture(scope="session")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
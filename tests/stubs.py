@@ -0,0 +1,54 @@
+"""Stand-ins for the browser panels and checkpoint store, so a ChatBridge runs without pages,
+and generated debate text"""
+import random
+
+import brainstorm_app
+from brainstorm_app import ChatBridge, PanelNotifier, StabilityModel
+
+
+class StubPanel:
+    suspended = None
+    resume_callbacks = ()
+
+    def __init__(self):
+        self.notifier = PanelNotifier()
+
+    def run_isolated(self, js_code, callback=None):
+        if callback:
+            callback(None)
+
+    def thread_url(self):
+        return ""
+
+
+class StubCheckpoints:
+    def __init__(self):
+        self.saved = {}
+
+    def save(self, session_id, checkpoint):
+        self.saved[session_id] = checkpoint
+
+    def remove(self, session_id):
+        self.saved.pop(session_id, None)
+
+
+def make_bridge(panels, sent, checkpoints=None):
+    """A bridge over stub panels that records (panel index, message) for every send"""
+    bridge = ChatBridge()
+    bridge.set_stability(StabilityModel(path=None))
+    bridge.set_panels(panels)
+    bridge.set_chatbot_getter(lambda: [brainstorm_app.CHATBOTS[0]] * len(panels))
+    if checkpoints is not None:
+        bridge.set_checkpoints(checkpoints)
+    bridge.send_message = lambda index, message: sent.append((index, message))
+    return bridge
+
+
+WORDS = "argument evidence premise claim counterpoint model market policy risk cost benefit data".split()
+
+
+def essay(seed, paragraphs=8):
+    """Reproducible paragraphs of 8-16 word sentences"""
+    rng = random.Random(seed)
+    sentence = lambda: " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + "."
+    return "\n\n".join(" ".join(sentence() for _ in range(rng.randint(2, 5))) for _ in range(paragraphs))
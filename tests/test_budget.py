@@ -0,0 +1,76 @@
+from brainstorm_app import SETTINGS, WIND_DOWN_TEMPLATE, SessionBudget
+
+from stubs import StubPanel, make_bridge
+
+
+def budget(**limits):
+    b = SessionBudget(dict(SETTINGS['budget'], **limits))
+    b.start(2)
+    return b
+
+
+def test_unlimited_budget_never_runs_out():
+    b = budget(max_rounds=0, max_seconds=0, max_chars=0)
+    b.add_sent(10 ** 6)
+    for _ in range(100):
+        b.add_received(10 ** 4)
+    assert not b.limited
+    assert b.exhausted() is None
+    assert b.describe() == ""
+
+
+def test_rounds_count_one_answer_from_every_party():
+    b = budget(max_rounds=2)
+    for _ in range(3):
+        b.add_received(100)
+    assert b.exhausted() is None
+    b.add_received(100, complete=False)  # Acknowledging a message part is not an answer
+    assert b.exhausted() is None
+    b.add_received(100)
+    assert b.exhausted() == "rounds"
+
+
+def test_time_limit():
+    b = budget(max_seconds=60)
+    assert b.exhausted() is None
+    b.started -= 61
+    assert b.exhausted() == "time"
+
+
+def test_characters_count_sent_and_received():
+    b = budget(max_chars=1000)
+    b.add_sent(600)
+    assert b.exhausted() is None
+    b.add_received(400, complete=False)
+    assert b.exhausted() == "characters"
+
+
+def run_two_rounds_with(limits):
+    sent, ended = [], []
+    bridge = make_bridge([StubPanel(), StubPanel()], sent)
+    bridge.convergence = None
+    bridge.conversation_ended.connect(ended.append)
+    bridge.start(["open", "reply"], budget=dict(SETTINGS['budget'], **limits))
+    for turn, panel in enumerate([0, 1]):
+        bridge.forward_response(panel, turn + 1, (10, str(turn)), f"Answer {turn} from panel {panel}.")
+    return bridge, sent, ended
+
+
+def test_wind_down_asks_every_party_for_a_summary_then_stops(app):
+    closing = WIND_DOWN_TEMPLATE.format(message="").strip()
+    bridge, sent, ended = run_two_rounds_with({'max_rounds': 1, 'wind_down': True})
+    assert bridge.winding_down == "rounds"
+    summaries = [(index, message) for index, message in sent if message.endswith(closing)]
+    assert sorted(index for index, _ in summaries) == [0, 1]
+    assert ended == []
+    bridge.forward_response(0, 2, (20, "a"), "My final position.")
+    assert ended == []
+    bridge.forward_response(1, 2, (20, "b"), "My final position too.")
+    assert ended == ["budget"]
+    assert not bridge.is_running
+
+
+def test_without_wind_down_the_conversation_stops_at_once(app):
+    bridge, sent, ended = run_two_rounds_with({'max_rounds': 1, 'wind_down': False})
+    assert ended == ["budget"]
+    assert [index for index, _ in sent] == [0, 1]  # Nothing after the round that used it up
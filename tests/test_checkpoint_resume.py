@@ -0,0 +1,19 @@
+from stubs import StubCheckpoints, StubPanel, make_bridge
+
+
+def test_turn_held_while_paused_is_sent_once_after_resume(app):
+    panels = [StubPanel(), StubPanel()]
+    checkpoints = StubCheckpoints()
+    sent = []
+    bridge = make_bridge(panels, sent, checkpoints)
+    bridge.set_paused(True)
+    bridge.start(["hello", "world"])
+    assert sent == []
+    checkpoint = checkpoints.saved[bridge.session_id]
+
+    resumed_sent = []
+    resumed = make_bridge(panels, resumed_sent, StubCheckpoints())
+    resumed.resume(checkpoint)
+    assert resumed_sent == [(0, "hello")]
+    resumed.stop()
+    bridge.stop()
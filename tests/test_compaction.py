@@ -0,0 +1,35 @@
+import pytest
+
+from brainstorm_app import SETTINGS, ContextCompactor
+
+from stubs import essay
+
+
+def compactor(budget):
+    return ContextCompactor(dict(SETTINGS['compaction'], budget_chars=budget))
+
+
+@pytest.mark.parametrize("budget", [200, 500, 1500])
+@pytest.mark.parametrize("seed", range(10))
+def test_compacted_message_stays_within_budget(budget, seed):
+    text = essay(seed)
+    assert len(text) > budget
+    forwarded, ratio = compactor(budget).compact(text)
+    assert ratio < 1
+    assert len(forwarded) <= budget
+
+
+def test_message_under_budget_is_forwarded_unchanged():
+    text = essay(0, paragraphs=1)
+    assert compactor(len(text)).compact(text) == (text, 1.0)
+
+
+def test_sentences_already_carried_are_dropped_first():
+    earlier = essay(1, paragraphs=2)
+    new = essay(2, paragraphs=2)
+    c = compactor(len(new) + 300)
+    c.compact(earlier)
+    forwarded, ratio = c.compact("> quoted reply\n" + earlier + "\n\n" + new)
+    assert ratio < 1
+    assert new in forwarded
+    assert "quoted reply" not in forwarded
@@ -0,0 +1,44 @@
+from brainstorm_app import SETTINGS, ConvergenceDetector
+
+from stubs import essay
+
+
+def detector(**options):
+    return ConvergenceDetector(dict(SETTINGS['convergence'], **options))
+
+
+def test_party_repeating_itself_is_a_loop():
+    d = detector()
+    answer = essay(1)
+    assert d.observe(0, answer)[0] is None
+    assert d.observe(1, essay(2))[0] is None
+    verdict, similarity = d.observe(0, answer.replace("risk", "danger", 1) + " Indeed.")
+    assert verdict == "loop"
+    assert similarity >= SETTINGS['convergence']['loop_threshold']
+
+
+def test_parties_echoing_each_other_converge_after_patience_turns():
+    # Each answer keeps three quarters of the other party's last one: close to it, but
+    # not to the same party's own earlier answer
+    d = detector(patience=3)
+    sentences = essay(3, paragraphs=6).split(". ")[:12]
+    verdicts = []
+    for turn in range(4):
+        sentences = sentences[3:] + essay(200 + turn, paragraphs=3).split(". ")[:3]
+        verdicts.append(d.observe(turn % 2, ". ".join(sentences))[0])
+    assert verdicts == [None, None, None, "converged"]
+
+
+def test_distinct_answers_never_fire():
+    d = detector()
+    for turn in range(12):
+        verdict, similarity = d.observe(turn % 2, essay(100 + turn))
+        assert verdict is None
+        assert similarity < SETTINGS['convergence']['agree_threshold']
+
+
+def test_branch_is_offered_max_branches_times():
+    d = detector(action="branch", max_branches=1)
+    assert d.should_branch()
+    assert not d.should_branch()
+    assert not detector(action="stop").should_branch()
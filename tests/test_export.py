@@ -0,0 +1,55 @@
+import html
+import json
+
+import pytest
+
+from brainstorm_app import EXPORT_FORMATS, export_conversations
+
+TRICKY = 'Use a < b && b > "c" - not <script>alert("x")</script> & co.'
+CONVERSATIONS = [
+    {'index': 0, 'name': 'R&D "bot" <1>', 'color': '#10a37f', 'raw': '',
+     'messages': [{'role': 'user', 'text': TRICKY}, {'role': 'assistant', 'text': "Fish & chips"}]},
+    {'index': 1, 'name': 'Empty', 'color': '#3b82f6', 'raw': TRICKY, 'messages': []},
+]
+
+
+def export(tmp_path, fmt):
+    path = tmp_path / f"out{EXPORT_FORMATS[fmt][0]}"
+    export_conversations(CONVERSATIONS, str(path), fmt, 'Q&A <"debate">')
+    return path.read_text(encoding='utf-8')
+
+
+def test_html_escapes_ampersands_brackets_and_quotes(tmp_path):
+    out = export(tmp_path, "html")
+    assert html.escape(TRICKY) in out
+    assert "&amp;" in out and "&lt;" in out and "&quot;" in out
+    assert "<script>" not in out
+    assert "&amp;amp;" not in out  # Escaped once
+    assert html.escape('R&D "bot" <1>') in out
+    assert html.escape('Q&A <"debate">') in out
+    assert html.escape("Fish & chips") in out
+
+
+def test_markdown_keeps_the_text_verbatim(tmp_path):
+    out = export(tmp_path, "md")
+    assert out.count(TRICKY) == 2  # The message and the raw page content
+    assert "Fish & chips" in out
+    assert "&amp;" not in out and "&lt;" not in out
+    assert 'Q&A <"debate">' in out
+
+
+def test_jsonl_round_trips_every_message(tmp_path):
+    lines = [json.loads(line) for line in export(tmp_path, "jsonl").splitlines()]
+    assert [(line['panel'], line['model'], line['role'], line['text']) for line in lines] == [
+        (0, 'R&D "bot" <1>', 'user', TRICKY),
+        (0, 'R&D "bot" <1>', 'assistant', "Fish & chips"),
+        (1, 'Empty', 'content', TRICKY),
+    ]
+
+
+@pytest.mark.parametrize("fmt", sorted(EXPORT_FORMATS))
+def test_export_is_written_as_utf8(tmp_path, fmt):
+    conversations = [dict(CONVERSATIONS[0], messages=[{'role': 'user', 'text': "naïve — 🧠"}])]
+    path = tmp_path / f"out{EXPORT_FORMATS[fmt][0]}"
+    export_conversations(conversations, str(path), fmt, "t")
+    assert "naïve — 🧠" in path.read_text(encoding='utf-8')
@@ -0,0 +1,47 @@
+import pytest
+
+from brainstorm_app import BroadcastTopology, HubSpokeTopology, RoundRobinTopology
+
+
+def respond(topology, index, n):
+    """next_speakers() is asked before the response is routed, as the bridge does"""
+    expected = topology.next_speakers(index, n)
+    routed = topology.route(index, f"answer {index}", n)
+    assert sorted(routed) == sorted(expected)
+    return routed
+
+
+@pytest.mark.parametrize("n", [3, 4])
+def test_round_robin_passes_each_answer_to_the_next_panel(n):
+    topology = RoundRobinTopology()
+    assert topology.first_speakers(n) == [0]
+    for index in list(range(n)) + [0]:
+        routed = respond(topology, index, n)
+        assert routed == {(index + 1) % n: [(index, f"answer {index}")]}
+
+
+@pytest.mark.parametrize("n", [3, 4])
+def test_broadcast_sends_everyone_the_others_answers_once_the_round_is_in(n):
+    topology = BroadcastTopology()
+    assert topology.first_speakers(n) == list(range(n))
+    for round_number in range(2):
+        for index in reversed(range(n - 1)):
+            assert respond(topology, index, n) == {}
+        routed = respond(topology, n - 1, n)
+        assert routed == {
+            target: [(i, f"answer {i}") for i in range(n) if i != target]
+            for target in range(n)
+        }
+
+
+@pytest.mark.parametrize("n", [3, 4])
+def test_hub_collects_every_spoke_before_the_moderator_speaks(n):
+    topology = HubSpokeTopology()
+    assert topology.first_speakers(n) == [0]
+    for round_number in range(2):
+        routed = respond(topology, 0, n)
+        assert routed == {spoke: [(0, "answer 0")] for spoke in range(1, n)}
+        for spoke in range(1, n - 1):
+            assert respond(topology, spoke, n) == {}
+        routed = respond(topology, n - 1, n)
+        assert routed == {0: [(spoke, f"answer {spoke}") for spoke in range(1, n)]}